@@ -4,6 +4,7 @@ import { exec } from 'child_process';
 import { promisify } from 'util';
 import path from 'path';
 import fs from 'fs';
+import { renderDocument } from '@/lib/documents/render-client';
 
 const execAsync = promisify(exec);
 
@@ -79,18 +80,27 @@ const POST_HANDLER = withAuth(async (req: NextRequest, ctx) => {
       );
     }
 
-    // Modify the script's output path dynamically via env var
-    const env = {
-      ...process.env,
-      ASSET_OUTPUT_PATH: outputPath,
-    };
-
-    // Run the Python generator
-    const { stdout, stderr } = await execAsync(`python3 "${scriptPath}" --output "${outputPath}"`, {
-      cwd: scriptsDir,
-      env,
-      timeout: 30000,
-    });
+    // Render on the warm render server when configured; otherwise (or if it
+    // is down) run the Python generator in a fresh process
+    let stdout = '';
+    let stderr = '';
+    const rendered = await renderDocument(assetId);
+    if (rendered) {
+      fs.writeFileSync(outputPath, rendered.data);
+      stdout = `Rendered by render server (cache ${rendered.cache})`;
+    } else {
+      // Modify the script's output path dynamically via env var
+      const env = {
+        ...process.env,
+        ASSET_OUTPUT_PATH: outputPath,
+      };
+
+      ({ stdout, stderr } = await execAsync(`python3 "${scriptPath}" --output "${outputPath}"`, {
+        cwd: scriptsDir,
+        env,
+        timeout: 30000,
+      }));
+    }
 
     // Check if file was created
     if (!fs.existsSync(outputPath)) {
@@ -261,10 +261,26 @@ export async function GET(request: NextRequest) {
   }
 
   // Look up the code in campaign_outreach table
-  const outreach = await supabaseGet(
+  let outreach = await supabaseGet(
     'campaign_outreach',
     `report_code=eq.${encodeURIComponent(code)}&limit=1`,
   );
+
+  // Codes of rows collapsed by the unique-npi migration resolve to the
+  // surviving row, so links already emailed keep working
+  if (!outreach || outreach.length === 0) {
+    const collapsed = await supabaseGet(
+      'campaign_outreach_duplicates',
+      `report_code=eq.${encodeURIComponent(code)}&limit=1&select=survivor_id`,
+    );
+    const survivorId = collapsed?.[0]?.survivor_id as string | undefined;
+    if (survivorId) {
+      outreach = await supabaseGet(
+        'campaign_outreach',
+        `id=eq.${encodeURIComponent(survivorId)}&limit=1`,
+      );
+    }
+  }
   if (!outreach || outreach.length === 0) {
     return NextResponse.json({ error: 'Report not found' }, { status: 404 });
   }
@@ -273,7 +289,7 @@ export async function GET(request: NextRequest) {
 
   // Track landing page visit (non-blocking, fire-and-forget)
   if (!outreach[0].first_viewed_at) {
-    supabasePatch('campaign_outreach', `report_code=eq.${encodeURIComponent(code)}`, {
+    supabasePatch('campaign_outreach', `id=eq.${encodeURIComponent(outreach[0].id as string)}`, {
       first_viewed_at: new Date().toISOString(),
       opened: true,
     });
@@ -12,6 +12,10 @@
  *   corrections: Array<{ field, currentValue, correctedValue, source }>
  *
  * Returns: PDF file as application/pdf
+ *
+ * Rendered on the warm render server when RENDER_SERVER_URL/SOCKET is set
+ * (lib/documents/render-client.ts); otherwise, or if the server is down,
+ * generate-nppes-form.py is spawned for the request.
  */
 
 import { NextRequest, NextResponse } from 'next/server';
@@ -19,6 +23,7 @@ import { exec } from 'child_process';
 import { promisify } from 'util';
 import path from 'path';
 import fs from 'fs';
+import { renderDocument } from '@/lib/documents/render-client';
 
 const execAsync = promisify(exec);
 
@@ -49,6 +54,26 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    const formData = {
+      workflow_id: body.workflowId,
+      practice_name: body.practiceName,
+      provider_name: body.providerName,
+      npi: body.npi,
+      corrections: body.corrections.map((c) => ({
+        field: c.field,
+        current_value: c.currentValue,
+        corrected_value: c.correctedValue,
+        source: c.source,
+      })),
+    };
+    const filename = `NPPES_Update_${body.npi}_${body.workflowId}.pdf`;
+
+    // Warm render server first; falls through to the spawn below if unavailable
+    const rendered = await renderDocument('nppes-form', formData);
+    if (rendered) {
+      return pdfResponse(rendered.data, filename);
+    }
+
     // Write form data as JSON for the Python script to read
     const tmpDir = path.join(process.cwd(), 'tmp');
     if (!fs.existsSync(tmpDir)) fs.mkdirSync(tmpDir, { recursive: true });
@@ -56,21 +81,7 @@ export async function POST(request: NextRequest) {
     const inputPath = path.join(tmpDir, `nppes-form-${body.workflowId}.json`);
     const outputPath = path.join(tmpDir, `nppes-form-${body.workflowId}.pdf`);
 
-    fs.writeFileSync(
-      inputPath,
-      JSON.stringify({
-        workflow_id: body.workflowId,
-        practice_name: body.practiceName,
-        provider_name: body.providerName,
-        npi: body.npi,
-        corrections: body.corrections.map((c) => ({
-          field: c.field,
-          current_value: c.currentValue,
-          corrected_value: c.correctedValue,
-          source: c.source,
-        })),
-      }),
-    );
+    fs.writeFileSync(inputPath, JSON.stringify(formData));
 
     // Run the Python PDF generator
     const scriptPath = path.join(process.cwd(), 'scripts', 'generate-nppes-form.py');
@@ -100,18 +111,20 @@ export async function POST(request: NextRequest) {
       // Non-critical cleanup failure
     }
 
-    // Return PDF
-    const filename = `NPPES_Update_${body.npi}_${body.workflowId}.pdf`;
-    return new NextResponse(pdfBuffer, {
-      status: 200,
-      headers: {
-        'Content-Type': 'application/pdf',
-        'Content-Disposition': `attachment; filename="${filename}"`,
-        'Content-Length': pdfBuffer.length.toString(),
-      },
-    });
+    return pdfResponse(pdfBuffer, filename);
   } catch (error) {
     console.error('NPPES form generation error:', error);
     return NextResponse.json({ error: 'Failed to generate NPPES form' }, { status: 500 });
   }
 }
+
+function pdfResponse(pdfBuffer: Buffer, filename: string) {
+  return new NextResponse(pdfBuffer, {
+    status: 200,
+    headers: {
+      'Content-Type': 'application/pdf',
+      'Content-Disposition': `attachment; filename="${filename}"`,
+      'Content-Length': pdfBuffer.length.toString(),
+    },
+  });
+}
@@ -0,0 +1,93 @@
+/**
+ * render-client.ts
+ *
+ * Client for the local render server (scripts/render_server.py), which keeps
+ * the document generators imported in warm worker processes and answers
+ * repeat renders from its on-disk cache.
+ *
+ * CONFIG:
+ *   RENDER_SERVER_URL     e.g. http://127.0.0.1:8765
+ *   RENDER_SERVER_SOCKET  e.g. /tmp/kairologic-render.sock (takes precedence)
+ *
+ * renderDocument() returns null when neither is set, the server is not
+ * reachable, or it answers with an error. Callers then fall back to spawning
+ * the generator script, so the server is an accelerator, never a dependency.
+ */
+
+import http from 'http';
+
+const RENDER_TIMEOUT_MS = 30000;
+
+export interface RenderedDocument {
+  data: Buffer;
+  contentType: string;
+  /** 'hit' | 'miss' | 'off' — from the server's X-Cache header */
+  cache: string;
+}
+
+function serverTarget(): { socketPath?: string; host?: string; port?: number } | null {
+  const socketPath = process.env.RENDER_SERVER_SOCKET;
+  if (socketPath) return { socketPath };
+  const url = process.env.RENDER_SERVER_URL;
+  if (!url) return null;
+  try {
+    const parsed = new URL(url);
+    return { host: parsed.hostname, port: Number(parsed.port) || 80 };
+  } catch {
+    console.warn(`[render-client] Ignoring invalid RENDER_SERVER_URL: ${url}`);
+    return null;
+  }
+}
+
+/**
+ * Render a document on the render server.
+ *
+ * docType is a render_server document type (e.g. 'nppes-form',
+ * 'compliance-roadmap'); params is the JSON body ({} for Safe Harbor docs).
+ */
+export async function renderDocument(
+  docType: string,
+  params: Record<string, unknown> = {},
+): Promise<RenderedDocument | null> {
+  const target = serverTarget();
+  if (!target) return null;
+
+  const body = Buffer.from(JSON.stringify(params));
+  return new Promise((resolve) => {
+    const req = http.request(
+      {
+        ...target,
+        method: 'POST',
+        path: `/render/${encodeURIComponent(docType)}`,
+        headers: { 'Content-Type': 'application/json', 'Content-Length': body.length },
+        timeout: RENDER_TIMEOUT_MS,
+      },
+      (res) => {
+        const chunks: Buffer[] = [];
+        res.on('data', (chunk: Buffer) => chunks.push(chunk));
+        res.on('end', () => {
+          const data = Buffer.concat(chunks);
+          if (res.statusCode !== 200) {
+            console.warn(
+              `[render-client] ${docType}: server returned ${res.statusCode} ${data.toString('utf-8').slice(0, 200)}`,
+            );
+            resolve(null);
+            return;
+          }
+          resolve({
+            data,
+            contentType: String(res.headers['content-type'] || 'application/octet-stream'),
+            cache: String(res.headers['x-cache'] || 'off'),
+          });
+        });
+        res.on('error', () => resolve(null));
+      },
+    );
+    req.on('timeout', () => req.destroy(new Error(`timed out after ${RENDER_TIMEOUT_MS}ms`)));
+    req.on('error', (err) => {
+      console.warn(`[render-client] ${docType}: render server unavailable (${err.message}); spawning generator`);
+      resolve(null);
+    });
+    req.end(body);
+  });
+}
@@ -0,0 +1,96 @@
+-- ════════════════════════════════════════════════════════════════
+-- KairoLogic: campaign_outreach — one row per NPI per campaign
+-- Run in Supabase SQL Editor (idempotent — safe to re-run)
+-- ════════════════════════════════════════════════════════════════
+--
+-- find-providers-v2.py upserts new outreach rows directly with
+-- on_conflict=npi,campaign_name (resolution=ignore-duplicates), which
+-- needs a unique index on that pair.
+--
+-- Duplicate rows may already have been emailed with their own
+-- report_code, so collapsing them must not lose anything:
+--   1. every duplicate is copied to campaign_outreach_duplicates first;
+--      /api/report-lookup resolves a report_code found only there to the
+--      surviving row, so links already sent keep working
+--   2. the survivor is the most engaged row (sent, then purchased /
+--      replied / opened, then earliest), and takes the others'
+--      engagement: flags are OR-ed, sent_at / first_viewed_at are the
+--      earliest seen
+
+BEGIN;
+
+-- ── 1. Back up every row of a duplicated (npi, campaign_name) ───
+
+CREATE TABLE IF NOT EXISTS campaign_outreach_duplicates (
+  LIKE campaign_outreach INCLUDING DEFAULTS,
+  survivor_id UUID,
+  backed_up_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_campaign_outreach_duplicates_code
+  ON campaign_outreach_duplicates (report_code);
+
+ALTER TABLE campaign_outreach_duplicates ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow anon read by report_code" ON campaign_outreach_duplicates;
+CREATE POLICY "Allow anon read by report_code"
+  ON campaign_outreach_duplicates
+  FOR SELECT
+  USING (true);
+
+CREATE TEMP TABLE campaign_outreach_ranked ON COMMIT DROP AS
+SELECT o.id,
+       first_value(o.id) OVER w AS survivor_id,
+       count(*) OVER (PARTITION BY o.npi, o.campaign_name) AS copies
+FROM campaign_outreach o
+WINDOW w AS (
+  PARTITION BY o.npi, o.campaign_name
+  ORDER BY (o.sent_at IS NULL),
+           (NOT coalesce(o.purchased, false)),
+           (NOT coalesce(o.replied, false)),
+           (NOT coalesce(o.opened, false)),
+           o.created_at, o.id
+);
+
+DELETE FROM campaign_outreach_ranked WHERE copies = 1;
+
+INSERT INTO campaign_outreach_duplicates
+SELECT o.*, r.survivor_id, now()
+FROM campaign_outreach o
+JOIN campaign_outreach_ranked r ON r.id = o.id
+WHERE NOT EXISTS (SELECT 1 FROM campaign_outreach_duplicates d WHERE d.id = o.id);
+
+-- ── 2. Fold the duplicates' engagement into the survivor ────────
+
+UPDATE campaign_outreach s
+SET sent_at         = agg.sent_at,
+    first_viewed_at = agg.first_viewed_at,
+    opened          = agg.opened,
+    replied         = agg.replied,
+    purchased       = agg.purchased
+FROM (
+  SELECT r.survivor_id,
+         min(o.sent_at)                         AS sent_at,
+         min(o.first_viewed_at)                 AS first_viewed_at,
+         bool_or(coalesce(o.opened, false))     AS opened,
+         bool_or(coalesce(o.replied, false))    AS replied,
+         bool_or(coalesce(o.purchased, false))  AS purchased
+  FROM campaign_outreach o
+  JOIN campaign_outreach_ranked r ON r.id = o.id
+  GROUP BY r.survivor_id
+) agg
+WHERE s.id = agg.survivor_id;
+
+-- ── 3. Remove the non-surviving duplicates ──────────────────────
+
+DELETE FROM campaign_outreach o
+USING campaign_outreach_ranked r
+WHERE o.id = r.id
+  AND r.id <> r.survivor_id;
+
+-- ── 4. Unique key for conflict-aware writes ─────────────────────
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_campaign_outreach_npi_campaign
+  ON campaign_outreach (npi, campaign_name);
+
+COMMIT;
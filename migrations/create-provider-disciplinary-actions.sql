@@ -0,0 +1,81 @@
+-- ════════════════════════════════════════════════════════════════
+-- KairoLogic: provider_disciplinary_actions — per-license board action history
+-- Run in Supabase SQL Editor (idempotent — safe to re-run)
+-- ════════════════════════════════════════════════════════════════
+--
+-- load-tmb-data.py (--bad) used to collapse the TMB Board Action file to one
+-- row per license and squeeze every action into disciplinary_details text.
+-- It now bulk-loads every action here and writes a compact summary onto the
+-- provider_licenses row, both from the same grouping pass.
+--
+-- One row = one board action (license + action type + action date).
+-- Re-loading the same file overwrites via the UNIQUE constraint.
+
+-- ── 1. History table ─────────────────────────────────────────────
+
+CREATE TABLE IF NOT EXISTS provider_disciplinary_actions (
+  id                   UUID          PRIMARY KEY DEFAULT gen_random_uuid(),
+
+  -- License linkage (provider_licenses natural key)
+  license_number       TEXT          NOT NULL,
+  state                TEXT          NOT NULL DEFAULT 'TX',
+
+  -- Action
+  action_type          TEXT          NOT NULL DEFAULT '',  -- ORDER_DISP ('' if blank)
+  action_date          DATE,                               -- null when the file has no date
+  violation            TEXT,                               -- MPA_PRIMARY (distinct values joined by '; ')
+  registration_status  TEXT,                               -- REGSTAT code at time of action
+
+  -- Pipeline metadata
+  source               TEXT          NOT NULL DEFAULT 'tmb_board_action',
+  source_file          TEXT,
+  last_synced_at       TIMESTAMPTZ,
+
+  created_at           TIMESTAMPTZ   NOT NULL DEFAULT now(),
+
+  -- Natural key: one row per action per license
+  UNIQUE NULLS NOT DISTINCT (license_number, state, action_type, action_date)
+);
+
+-- ── 2. Indexes ───────────────────────────────────────────────────
+
+CREATE INDEX IF NOT EXISTS idx_disciplinary_actions_license
+  ON provider_disciplinary_actions (license_number, state);
+
+CREATE INDEX IF NOT EXISTS idx_disciplinary_actions_date
+  ON provider_disciplinary_actions (action_date DESC);
+
+CREATE INDEX IF NOT EXISTS idx_disciplinary_actions_type
+  ON provider_disciplinary_actions (action_type);
+
+-- ── 3. Summary columns on provider_licenses ──────────────────────
+
+ALTER TABLE provider_licenses
+  ADD COLUMN IF NOT EXISTS disciplinary_action_count INTEGER DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS board_action_date         DATE,   -- most recent action
+  ADD COLUMN IF NOT EXISTS latest_board_action       TEXT;   -- its action type
+
+CREATE INDEX IF NOT EXISTS idx_provider_licenses_board_action_date
+  ON provider_licenses (board_action_date DESC)
+  WHERE board_action_date IS NOT NULL;
+
+-- ── 4. RLS ───────────────────────────────────────────────────────
+
+ALTER TABLE provider_disciplinary_actions ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access to provider_disciplinary_actions"
+  ON provider_disciplinary_actions;
+CREATE POLICY "Service role full access to provider_disciplinary_actions"
+  ON provider_disciplinary_actions
+  USING (auth.role() = 'service_role');
+
+DROP POLICY IF EXISTS "Authenticated read provider_disciplinary_actions"
+  ON provider_disciplinary_actions;
+CREATE POLICY "Authenticated read provider_disciplinary_actions"
+  ON provider_disciplinary_actions FOR SELECT
+  USING (auth.role() IN ('authenticated', 'service_role'));
+
+-- ── Done ─────────────────────────────────────────────────────────
+-- Verify:
+--   SELECT license_number, count(*), max(action_date)
+--   FROM provider_disciplinary_actions GROUP BY 1 ORDER BY 2 DESC LIMIT 10;
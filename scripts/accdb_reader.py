@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+accdb_reader.py — Streaming reader for Microsoft Access (.accdb/.mdb) files
+
+load-ca-medical-board.py used pyodbc with the Microsoft Access ODBC driver,
+which only exists on Windows. This module gives it two interchangeable
+backends behind one interface:
+
+  - mdbtools (Linux/macOS, CI runners): each table is streamed as CSV from an
+    `mdb-export` subprocess and parsed row by row.
+      apt-get install mdbtools    |    brew install mdbtools
+  - ODBC (Windows): pyodbc + "Microsoft Access Driver (*.mdb, *.accdb)",
+    streamed with fetchmany.
+
+Both return rows as tuples in the requested column order. Every read_table()
+call uses its own subprocess or connection, so tables can be read in parallel.
+Values come back as the backend gives them: mdbtools yields strings (dates as
+YYYY-MM-DD[ HH:MM:SS], empty → None); ODBC yields native Python types.
+
+Usage as a module:
+    from accdb_reader import open_access_db
+    db = open_access_db('MBC.accdb')
+    cols, rows = db.read_table('License', ['LicenseID', 'LastName'], limit=10)
+    for license_id, last_name in rows:
+        ...
+
+Usage standalone (list tables / peek at one):
+    python scripts/accdb_reader.py MBC.accdb [--table License] [--limit 5]
+"""
+
+import argparse
+import csv
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+
+FETCH_SIZE = 5000
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Some Access text columns exceed csv's 128KB default field limit
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+class AccessReadError(Exception):
+    pass
+
+
+def _project(header, columns):
+    """Indices of the requested columns in header (None where missing)."""
+    positions = {name: i for i, name in enumerate(header)}
+    return [positions.get(c) for c in columns]
+
+
+# ── mdbtools backend ─────────────────────────────────────
+
+class MdbToolsReader:
+    """Streams tables through mdb-export."""
+
+    backend = 'mdbtools'
+
+    def __init__(self, path):
+        self.path = path
+        self.export_bin = shutil.which('mdb-export')
+        self.tables_bin = shutil.which('mdb-tables')
+        if not self.export_bin:
+            raise AccessReadError('mdb-export not found (install mdbtools)')
+        self._date_args = self._probe_date_args()
+
+    def _probe_date_args(self):
+        """mdbtools >= 0.9 formats DateTime columns with -T; older builds only know -D."""
+        try:
+            out = subprocess.run([self.export_bin, '--help'], capture_output=True, text=True, timeout=10)
+            help_text = out.stdout + out.stderr
+        except (OSError, subprocess.SubprocessError):
+            help_text = ''
+        if '--datetime-format' in help_text or '-T' in help_text:
+            return ['-D', DATE_FORMAT, '-T', DATETIME_FORMAT]
+        return ['-D', DATETIME_FORMAT]
+
+    def tables(self):
+        if not self.tables_bin:
+            raise AccessReadError('mdb-tables not found (install mdbtools)')
+        out = subprocess.run([self.tables_bin, '-1', self.path], capture_output=True, text=True)
+        if out.returncode != 0:
+            raise AccessReadError(f'mdb-tables: {out.stderr.strip()}')
+        return [t for t in out.stdout.splitlines() if t.strip()]
+
+    def read_table(self, table, columns=None, limit=0):
+        """Start streaming a table. Returns (columns, row generator)."""
+        cmd = [self.export_bin, '-b', 'strip', *self._date_args, self.path, table]
+        errors = tempfile.TemporaryFile()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=errors)
+        # newline='' so quoted multi-line memo fields survive csv parsing
+        stdout = io.TextIOWrapper(proc.stdout, encoding='utf-8', errors='replace', newline='')
+        reader = csv.reader(stdout)
+        header = next(reader, None)
+        if header is None:
+            proc.wait()
+            errors.seek(0)
+            msg = errors.read().decode('utf-8', errors='replace').strip()
+            errors.close()
+            raise AccessReadError(f'mdb-export {table}: {msg or "no output"}')
+
+        cols = list(columns) if columns else header
+        idx = _project(header, cols)
+
+        def rows():
+            try:
+                for n, rec in enumerate(reader, 1):
+                    yield tuple(rec[i] or None if i is not None and i < len(rec) else None
+                                for i in idx)
+                    if limit and n >= limit:
+                        break
+            finally:
+                stdout.close()
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+                errors.close()
+
+        return cols, rows()
+
+
+# ── ODBC backend ─────────────────────────────────────────
+
+class OdbcReader:
+    """Streams tables through pyodbc and the Access ODBC driver."""
+
+    backend = 'odbc'
+
+    def __init__(self, path):
+        try:
+            import pyodbc
+        except ImportError:
+            raise AccessReadError('pyodbc not installed')
+        self._pyodbc = pyodbc
+        self.conn_str = f'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={path};'
+        # Fail now, not on the first read
+        try:
+            pyodbc.connect(self.conn_str).close()
+        except Exception as e:
+            raise AccessReadError(f'Cannot open database via ODBC: {e}')
+
+    def tables(self):
+        conn = self._pyodbc.connect(self.conn_str)
+        try:
+            return [t.table_name for t in conn.cursor().tables(tableType='TABLE')]
+        finally:
+            conn.close()
+
+    def read_table(self, table, columns=None, limit=0):
+        """Start streaming a table. Returns (columns, row generator)."""
+        conn = self._pyodbc.connect(self.conn_str)
+        cursor = conn.cursor()
+        select = '*'
+        if columns:
+            present = {c.column_name for c in cursor.columns(table=table)}
+            wanted = [c for c in columns if c in present]
+            if not wanted:
+                conn.close()
+                return list(columns), iter(())
+            select = ', '.join(f'[{c}]' for c in wanted)
+        top = f'TOP {int(limit)} ' if limit else ''
+        try:
+            cursor.execute(f'SELECT {top}{select} FROM [{table}]')
+        except Exception as e:
+            conn.close()
+            raise AccessReadError(f'{table}: {e}')
+        header = [d[0] for d in cursor.description]
+        cols = list(columns) if columns else header
+        idx = _project(header, cols)
+
+        def rows():
+            try:
+                while True:
+                    chunk = cursor.fetchmany(FETCH_SIZE)
+                    if not chunk:
+                        break
+                    for rec in chunk:
+                        yield tuple(rec[i] if i is not None else None for i in idx)
+            finally:
+                conn.close()
+
+        return cols, rows()
+
+
+BACKENDS = {'mdbtools': MdbToolsReader, 'odbc': OdbcReader}
+
+
+def open_access_db(path, backend='auto'):
+    """Open an Access database with the given backend ('auto' tries mdbtools, then ODBC)."""
+    if backend != 'auto':
+        return BACKENDS[backend](path)
+    errors = []
+    for name in ('mdbtools', 'odbc'):
+        try:
+            return BACKENDS[name](path)
+        except AccessReadError as e:
+            errors.append(f'{name}: {e}')
+    raise AccessReadError('No Access backend available — ' + '; '.join(errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List or peek at tables in an Access database')
+    parser.add_argument('path')
+    parser.add_argument('--table', help='Print rows from this table')
+    parser.add_argument('--limit', type=int, default=5)
+    parser.add_argument('--backend', choices=['auto', *BACKENDS], default='auto')
+    args = parser.parse_args()
+
+    try:
+        db = open_access_db(args.path, args.backend)
+        print(f'Backend: {db.backend}')
+        if not args.table:
+            for t in db.tables():
+                print(f'  {t}')
+            return
+        cols, rows = db.read_table(args.table, limit=args.limit)
+        print(' | '.join(cols))
+        for row in rows:
+            print(' | '.join('' if v is None else str(v) for v in row))
+    except AccessReadError as e:
+        print(f'[FATAL] {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+bench_documents.py — Latency, memory and size benchmarks for document generators
+
+Renders every generator against synthetic inputs of growing size and
+records, per case:
+
+    cold_ms     first render in a fresh process (imports and style setup excluded)
+    wall_ms     median of --repeat further renders
+    peak_mb     peak memory allocated by one warm render (tracemalloc), i.e.
+                what the render itself needs, not the interpreter and its
+                imports, so it grows with the input size
+    bytes       output size
+
+Each case runs in its own spawned process so module caches and allocator
+state from earlier cases don't leak into it. Results are compared with a
+stored baseline
+(bench_documents_baseline.json next to this script); a case that is slower,
+larger in memory or larger on disk than the baseline by more than the
+tolerance is reported as a regression and the run exits 1.
+
+Cases (document type[size]):
+
+    nppes-form[N]             NPPES update form with N corrected fields
+    evidence-ledger[N]        Evidence Ledger with N vendors prefilled from DR-04
+    findings-appendix[N]      Kit findings appendix with N open scan findings
+    <kit pdf>[practice]       Safe Harbor PDF personalized for one practice
+
+Timings are machine-relative: regenerate the baseline with --update-baseline
+on the machine (or CI runner class) the comparison runs on.
+
+Usage:
+    python scripts/bench_documents.py                       # run all, compare
+    python scripts/bench_documents.py --cases nppes-form,evidence-ledger
+    python scripts/bench_documents.py --update-baseline
+    python scripts/bench_documents.py --json results.json
+
+Requires:
+  pip install reportlab openpyxl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPTS_DIR, 'bench_documents_baseline.json')
+DEFAULT_REPEAT = 5
+
+# Allowed growth over the baseline before a metric counts as a regression
+DEFAULT_TOLERANCE = {'wall_ms': 0.25, 'peak_mb': 0.15, 'bytes': 0.10}
+
+KIT_PDFS = ('sb1188-policy-pack', 'implementation-guide', 'ai-disclosure-kit',
+            'staff-training-guide', 'compliance-roadmap')
+
+# document type → input sizes benchmarked
+SUITES = {
+    'nppes-form': (1, 10, 50, 200),
+    'evidence-ledger': (0, 50, 500),
+    'findings-appendix': (10, 100),
+    **{doc_type: ('practice',) for doc_type in KIT_PDFS},
+}
+
+NPPES_FIELDS = ('practice_location_address', 'mailing_address', 'phone_number', 'fax_number',
+                'taxonomy_code', 'authorized_official', 'license_number', 'provider_name')
+SEVERITIES = ('critical', 'high', 'medium', 'low')
+
+
+# ── Synthetic fixtures ───────────────────────────────────
+# Deterministic, so output sizes are comparable run to run.
+
+def practice_fixture(findings=0, vendors=0):
+    """Practice dict as read by the kit generators and practice_kits.py."""
+    practice = {
+        'name': 'Hill Country Family Medicine & Pediatrics, PLLC',
+        'npi': '1234567893',
+        'composite_score': 64,
+        'risk_level': 'Drift',
+        'scanned_at': '2026-03-01',
+        'findings': [],
+    }
+    for i in range(findings):
+        practice['findings'].append({
+            'id': f'BM-{i:03d}',
+            'name': f'Synthetic check {i}: third-party script loaded without a data processing agreement',
+            'status': ('fail', 'warn', 'inconclusive')[i % 3],
+            'severity': SEVERITIES[i % len(SEVERITIES)],
+            'category': ('data-residency', 'ai-transparency', 'clinical-integrity')[i % 3],
+            'detail': 'Endpoint resolved outside the United States during the scan. ' * (1 + i % 3),
+            'clause': 'Tex. Health & Safety Code § 183.002(a)',
+            'recommended_fix': 'Move the service to a US region or replace the vendor.',
+        })
+    if vendors:
+        evidence = {'foreignPHI': [], 'foreignStatic': [], 'checked': []}
+        for i in range(vendors):
+            domain = f'vendor{i:04d}.example-cdn.com'
+            if i % 20 == 0:
+                evidence['foreignPHI'].append({'domain': domain, 'country': 'Germany'})
+            elif i % 5 == 0:
+                evidence['foreignStatic'].append({'domain': domain, 'country': 'France'})
+            else:
+                evidence['checked'].append(domain)
+        practice['findings'].append({'id': 'DR-04', 'name': 'Data residency', 'status': 'fail',
+                                     'severity': 'critical', 'category': 'data-residency',
+                                     'evidence': evidence})
+    return practice
+
+
+def nppes_fixture(changes):
+    """API payload for generate-nppes-form.py with N corrected fields."""
+    return {
+        'practice_name': 'Hill Country Family Medicine & Pediatrics, PLLC',
+        'npi': '1234567893',
+        'provider_name': 'Dr. Jordan Alvarez, MD',
+        'workflow_id': f'bench-{changes}',
+        'corrections': [
+            {
+                'field': f'{NPPES_FIELDS[i % len(NPPES_FIELDS)]}_{i}',
+                'current_value': f'{100 + i} Old Mill Rd, Suite {i}, Austin, TX 78701',
+                'corrected_value': f'{200 + i} Congress Ave, Floor {i % 30}, Austin, TX 78701',
+                'source': 'KairoLogic Sentry Scan',
+            }
+            for i in range(changes)
+        ],
+    }
+
+
+# ── Case runner (child process) ──────────────────────────
+
+def _render_peak_mb(render):
+    """Peak Python memory allocated during one render, in MB.
+
+    Run after the timed renders (tracemalloc slows allocation) and after a
+    warm-up, so one-time caches such as font metrics are not counted.
+    """
+    tracemalloc.start()
+    try:
+        render()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def _renderer(doc_type, size):
+    """Import what the case needs and return a zero-argument render -> bytes."""
+    sys.path.insert(0, SCRIPTS_DIR)
+    from document_renderers import DOCUMENTS, load_generator
+
+    if doc_type == 'nppes-form':
+        module = load_generator(DOCUMENTS[doc_type]['script'])
+        data = module.form_data_from_api(nppes_fixture(size))
+        return lambda: module.generate_nppes_form(data)
+
+    if doc_type == 'findings-appendix':
+        sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'safe-harbor'))
+        import practice_kits
+        module = load_generator(DOCUMENTS['sb1188-policy-pack']['script'])
+        practice = practice_fixture(findings=size)
+        return lambda: practice_kits.render_piece(module, practice_kits.build_findings_appendix(practice), 0)
+
+    module = load_generator(DOCUMENTS[doc_type]['script'])
+    practice = practice_fixture(vendors=size) if doc_type == 'evidence-ledger' else practice_fixture()
+
+    def render():
+        buf = BytesIO()
+        module.render(buf, practice)
+        return buf.getvalue()
+    return render
+
+
+def run_case(doc_type, size, repeat):
+    """Benchmark one case. Runs in a fresh process; returns its metrics."""
+    render = _renderer(doc_type, size)
+
+    start = time.perf_counter()
+    data = render()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = render()
+        times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'cold_ms': round(cold_ms, 1),
+        'wall_ms': round(statistics.median(times), 1) if times else round(cold_ms, 1),
+        'peak_mb': round(_render_peak_mb(render), 2),
+        'bytes': len(data),
+    }
+
+
+# ── Baseline comparison ──────────────────────────────────
+
+def case_name(doc_type, size):
+    return f'{doc_type}[{size}]'
+
+
+def compare(result, baseline, tolerance):
+    """Metrics of one case that grew past tolerance: [(metric, old, new)]."""
+    regressions = []
+    for metric, allowed in tolerance.items():
+        old, new = baseline.get(metric), result.get(metric)
+        if old and new is not None and new > old * (1 + allowed):
+            regressions.append((metric, old, new))
+    return regressions
+
+
+def _delta(old, new):
+    if not old:
+        return ''
+    return f' ({(new - old) / old * 100:+.0f}%)'
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('cases', {})
+
+
+def write_baseline(path, results):
+    payload = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'cases': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark document generators against a stored baseline')
+    parser.add_argument('--cases', default=','.join(SUITES),
+                        help=f"Comma-separated document types: {', '.join(SUITES)}")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed renders per case after the cold one')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help='Write these results as the new baseline')
+    parser.add_argument('--json', help='Also write results to this file')
+    parser.add_argument('--time-tolerance', type=float, default=DEFAULT_TOLERANCE['wall_ms'])
+    parser.add_argument('--mem-tolerance', type=float, default=DEFAULT_TOLERANCE['peak_mb'])
+    parser.add_argument('--size-tolerance', type=float, default=DEFAULT_TOLERANCE['bytes'])
+    args = parser.parse_args()
+
+    doc_types = [d.strip() for d in args.cases.split(',') if d.strip()]
+    unknown = [d for d in doc_types if d not in SUITES]
+    if unknown:
+        print(f"[FATAL] Unknown cases: {', '.join(unknown)}. Valid: {', '.join(SUITES)}")
+        sys.exit(1)
+    tolerance = {'wall_ms': args.time_tolerance, 'peak_mb': args.mem_tolerance, 'bytes': args.size_tolerance}
+    baseline = {} if args.update_baseline else load_baseline(args.baseline)
+
+    print(f"{'case':<34} {'cold':>8} {'wall':>8} {'peak':>8} {'size':>9}")
+    results = {}
+    regressed = failed = 0
+    ctx = multiprocessing.get_context('spawn')
+    for doc_type in doc_types:
+        for size in SUITES[doc_type]:
+            name = case_name(doc_type, size)
+            # One process per case so caches from earlier cases don't carry over
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                try:
+                    r = pool.submit(run_case, doc_type, size, args.repeat).result()
+                except Exception as e:
+                    failed += 1
+                    print(f'{name:<34} [ERROR] {type(e).__name__}: {e}')
+                    continue
+            results[name] = r
+            line = (f"{name:<34} {r['cold_ms']:>6.0f}ms {r['wall_ms']:>6.0f}ms "
+                    f"{r['peak_mb']:>6.1f}MB {r['bytes'] / 1024:>7.0f}KB")
+            if name in baseline:
+                regressions = compare(r, baseline[name], tolerance)
+                if regressions:
+                    regressed += 1
+                    line += '  REGRESSED ' + ', '.join(f'{m} {old:g} -> {new:g}{_delta(old, new)}'
+                                                       for m, old, new in regressions)
+                else:
+                    line += f"  ok{_delta(baseline[name].get('wall_ms'), r['wall_ms'])}"
+            elif baseline:
+                line += '  (new case)'
+            print(line)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.update_baseline:
+        merged = load_baseline(args.baseline)
+        merged.update(results)
+        write_baseline(args.baseline, merged)
+        print(f'Baseline written: {args.baseline} ({len(results)} cases)')
+    elif not baseline:
+        print(f'No baseline at {args.baseline}; run with --update-baseline to record one')
+
+    print(f'{len(results)} cases, {regressed} regressed, {failed} failed')
+    if regressed or failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
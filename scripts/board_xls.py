@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+board_xls.py — Column-wise XLS reader with a Parquet sidecar cache
+
+Board Action files (202603BAD.XLS and friends) used to be read one cell at a
+time with ws.cell_value(r, c), converting float→int→str per cell. Here each
+column is pulled in one ws.col_values() call and coerced once per column:
+
+  - text-only columns are just stripped
+  - columns holding numbers get the float→int→str conversion
+  - empty cells become ''
+
+The coerced columns are written to a Parquet sidecar next to the source,
+named after the file's content hash:
+
+    202603BAD.XLS  →  202603BAD.XLS.<sha256[:16]>.parquet
+
+so a re-run on the same file (dry run, then the real run) loads straight from
+Parquet without touching xlrd. A changed file gets a new hash and a new
+sidecar. The cache needs pyarrow; without it the reader just parses the XLS.
+
+Usage as a module:
+    from board_xls import read_xls_columns, read_xls_rows
+    headers, columns = read_xls_columns('202603BAD.XLS')
+    rows = read_xls_rows('202603BAD.XLS')   # list of {header: str}
+
+Usage standalone (warm the cache / check a file):
+    python scripts/board_xls.py 202603BAD.XLS [--no-cache]
+
+Requires:
+  pip install xlrd [pyarrow]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+# Bump when coercion rules change so old sidecars are ignored
+CACHE_VERSION = 1
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents (plus CACHE_VERSION)."""
+    h = hashlib.sha256(f'v{CACHE_VERSION}:'.encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def sidecar_path(path, digest, sheet=0):
+    suffix = f'.sheet{sheet}' if sheet else ''
+    return f'{path}.{digest[:16]}{suffix}.parquet'
+
+
+# ── XLS ──────────────────────────────────────────────────
+
+def _coerce_column(values, types, xlrd):
+    """Coerce one column to stripped strings."""
+    text_types = {xlrd.XL_CELL_TEXT, xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK}
+    if text_types.issuperset(types):
+        return [v.strip() if v else '' for v in values]
+    out = []
+    for v in values:
+        if isinstance(v, float):
+            v = str(int(v)) if v == int(v) else str(v)
+        out.append(str(v).strip() if v else '')
+    return out
+
+
+def parse_xls_columns(path, sheet=0):
+    """Read a sheet column by column. Returns (headers, {header: [str, ...]})."""
+    try:
+        import xlrd
+    except ImportError:
+        print('[FATAL] xlrd not installed. Run: pip install xlrd')
+        sys.exit(1)
+    wb = xlrd.open_workbook(path)
+    ws = wb.sheet_by_index(sheet)
+    headers = [str(h).strip() for h in ws.row_values(0)]
+
+    columns = {}
+    for c, name in enumerate(headers):
+        values = ws.col_values(c, start_rowx=1)
+        types = ws.col_types(c, start_rowx=1)
+        # Duplicate headers: last column wins, as with per-row dicts
+        columns[name] = _coerce_column(values, types, xlrd)
+    return list(columns), columns
+
+
+# ── Parquet sidecar ──────────────────────────────────────
+
+def _load_sidecar(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    if not os.path.exists(path):
+        return None
+    try:
+        table = pq.read_table(path)
+    except Exception:
+        return None
+    return table.column_names, table.to_pydict()
+
+
+def _write_sidecar(path, headers, columns):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return False
+    table = pa.table({h: pa.array(columns[h], type=pa.string()) for h in headers})
+    tmp = path + '.tmp'
+    try:
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    return True
+
+
+def read_xls_columns(path, sheet=0, use_cache=True):
+    """Columns of an XLS sheet, from the Parquet sidecar when one matches the file."""
+    if not use_cache:
+        return parse_xls_columns(path, sheet)
+
+    cache = sidecar_path(path, file_hash(path), sheet)
+    cached = _load_sidecar(cache)
+    if cached is not None:
+        return cached
+
+    headers, columns = parse_xls_columns(path, sheet)
+    _write_sidecar(cache, headers, columns)
+    return headers, columns
+
+
+def read_xls_rows(path, sheet=0, use_cache=True):
+    """Rows of an XLS sheet as {header: str} dicts, built from the columns."""
+    headers, columns = read_xls_columns(path, sheet, use_cache)
+    return [dict(zip(headers, values)) for values in zip(*(columns[h] for h in headers))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Read an XLS column-wise and cache it as Parquet')
+    parser.add_argument('path')
+    parser.add_argument('--no-cache', action='store_true', help='Parse the XLS even if a sidecar exists')
+    args = parser.parse_args()
+
+    start = time.time()
+    headers, columns = read_xls_columns(args.path, use_cache=not args.no_cache)
+    n_rows = len(columns[headers[0]]) if headers else 0
+    print(f'{n_rows:,} rows x {len(headers)} columns in {time.time() - start:.2f}s')
+    if not args.no_cache:
+        cache = sidecar_path(args.path, file_hash(args.path))
+        print(f'  Sidecar: {cache if os.path.exists(cache) else "(not written — pip install pyarrow)"}')
+
+
+if __name__ == '__main__':
+    main()
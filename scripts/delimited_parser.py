@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+delimited_parser.py — Multi-process parser for large delimited board files
+
+Board rosters (TMB PHY, and any future pipe/CSV-style state roster) are
+plain delimited text. Instead of one `line.split('|')` loop, the file is:
+
+  1. memory-mapped and cut into newline-aligned byte ranges (CHUNK_BYTES each)
+  2. parsed range-by-range in a process pool, at most RANGES_AHEAD ranges
+     per worker in flight, so memory is bounded however large the file is
+  3. re-assembled in file order
+
+Rows come back as compact tuples of stripped fields, padded/truncated to the
+layout width, paired with their 1-based line number. Lines that are too short
+are reported as rejects with their line number, so error attribution is the
+same as a sequential read.
+
+Usage as a module:
+    from delimited_parser import iter_delimited
+    for rows, rejects in iter_delimited(path, n_fields=36, min_fields=30):
+        for line_num, fields in rows:
+            ...
+
+Usage standalone (parse-speed check):
+    python scripts/delimited_parser.py physician.txt --fields 36 [--workers 8]
+"""
+
+import argparse
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_BYTES = 8 * 1024 * 1024
+RANGES_AHEAD = 2  # parsed-but-unconsumed ranges allowed per worker
+
+
+def split_ranges(path, chunk_bytes=CHUNK_BYTES):
+    """Cut a file into [start, end) byte ranges that each end on a newline."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    ranges = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                nl = mm.find(b'\n', end)
+                end = size if nl == -1 else nl + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_range(path, start, end, n_fields, delimiter, min_fields, encoding):
+    """Parse one byte range. Returns (line_count, rows, rejects) with range-local line numbers."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+
+    lines = data.split(b'\n')
+    if lines and lines[-1] == b'':
+        lines.pop()
+    sep = delimiter.encode(encoding)
+    pad = ('',) * n_fields
+    rows = []
+    rejects = []
+
+    for i, raw in enumerate(lines, 1):
+        raw = raw.rstrip(b'\r')
+        if not raw:
+            continue
+        parts = raw.split(sep)
+        if len(parts) < min_fields:
+            rejects.append((i, f'{len(parts)} fields'))
+            continue
+        fields = tuple(p.decode(encoding, errors='replace').strip() for p in parts[:n_fields])
+        if len(fields) < n_fields:
+            fields = fields + pad[len(fields):]
+        rows.append((i, fields))
+
+    return len(lines), rows, rejects
+
+
+def _parse_range_args(args):
+    return parse_range(*args)
+
+
+def iter_delimited(path, n_fields, delimiter='|', min_fields=0, workers=None,
+                   encoding='utf-8', chunk_bytes=CHUNK_BYTES):
+    """Yield (rows, rejects) per byte range, in file order.
+
+    rows    — [(line_num, fields_tuple), ...]
+    rejects — [(line_num, reason), ...]
+    Line numbers are 1-based and global to the file.
+    """
+    ranges = split_ranges(path, chunk_bytes)
+    if not ranges:
+        return
+    tasks = [(path, s, e, n_fields, delimiter, min_fields, encoding) for s, e in ranges]
+    base = 0
+
+    if len(tasks) == 1 or workers == 1:
+        results = map(_parse_range_args, tasks)
+        for line_count, rows, rejects in results:
+            yield _offset(rows, base), _offset(rejects, base)
+            base += line_count
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = workers * RANGES_AHEAD
+    pending = iter(tasks)
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Submit a bounded window ahead and consume in submission order, so
+        # line offsets stay exact and only `window` ranges are held at once
+        for task in pending:
+            in_flight.append(pool.submit(_parse_range_args, task))
+            if len(in_flight) >= window:
+                break
+        while in_flight:
+            line_count, rows, rejects = in_flight.popleft().result()
+            task = next(pending, None)
+            if task is not None:
+                in_flight.append(pool.submit(_parse_range_args, task))
+            yield _offset(rows, base), _offset(rejects, base)
+            base += line_count
+
+
+def _offset(items, base):
+    if not base:
+        return items
+    return [(n + base, v) for n, v in items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse a large delimited file in parallel')
+    parser.add_argument('path')
+    parser.add_argument('--fields', type=int, required=True, help='Layout width')
+    parser.add_argument('--min-fields', type=int, default=0)
+    parser.add_argument('--delimiter', default='|')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.time()
+    n_rows = 0
+    n_rejects = 0
+    for rows, rejects in iter_delimited(args.path, args.fields, args.delimiter,
+                                        args.min_fields, args.workers):
+        n_rows += len(rows)
+        n_rejects += len(rejects)
+    elapsed = time.time() - start
+    print(f'{n_rows:,} rows, {n_rejects:,} rejects in {elapsed:.2f}s '
+          f'({os.path.getsize(args.path) / 1e6 / max(elapsed, 1e-9):.0f} MB/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+document_renderers.py — One entry point for every generated document
+
+The app renders documents by shelling out to a generator per request:
+generate-nppes-form.py for NPPES update forms and scripts/safe-harbor/*.py
+for the Safe Harbor kit. This module loads those generators in-process and
+renders any of them to bytes by document type, so a long-lived process
+(render_server.py, bulk jobs) pays the imports and style setup once.
+
+Document types match the asset ids in app/api/admin/generate-asset:
+
+    nppes-form            NPPES update form (params: the API route's JSON payload)
+    sb1188-policy-pack    SB 1188 Data Sovereignty Policy Pack
+    implementation-guide  Safe Harbor Implementation Guide
+    ai-disclosure-kit     AI Disclosure Kit
+    staff-training-guide  Staff Training Guide
+    compliance-roadmap    30-Day Compliance Roadmap
+    evidence-ledger       Evidence Ledger (XLSX)
+
+Usage as a module:
+    from document_renderers import render_document, document_filename
+    pdf_bytes = render_document('nppes-form', payload)
+
+Usage standalone (render one document):
+    python scripts/document_renderers.py compliance-roadmap -o roadmap.pdf
+    python scripts/document_renderers.py nppes-form --params form.json -o form.pdf
+
+Requires:
+  pip install reportlab openpyxl
+  pip install pikepdf   # optional: PDF size optimization (pdf_optimize.py)
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import sys
+import time
+from io import BytesIO
+
+from pdf_optimize import optimize_pdf
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PDF = 'application/pdf'
+XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Shared modules the Safe Harbor generators import; part of their version
+KIT_PDF_DEPENDS = ('safe-harbor/kit_brand.py', 'safe-harbor/kit_style.py', 'pdf_optimize.py')
+KIT_XLSX_DEPENDS = ('safe-harbor/kit_brand.py',)
+
+DOCUMENTS = {
+    'nppes-form': {
+        'script': 'generate-nppes-form.py',
+        'filename': None,  # per form: NPPES_Update_<npi>_<workflow>.pdf
+        'content_type': PDF,
+        'depends': ('pdf_optimize.py',),
+    },
+    'sb1188-policy-pack': {
+        'script': 'safe-harbor/generate_policy_pdf.py',
+        'filename': 'SB1188_Data_Sovereignty_Policy_Pack.pdf',
+        'content_type': PDF,
+        'depends': KIT_PDF_DEPENDS,
+    },
+    'implementation-guide': {
+        'script': 'safe-harbor/generate_impl_guide.py',
+        'filename': 'Safe_Harbor_Implementation_Guide.pdf',
+        'content_type': PDF,
+        'depends': KIT_PDF_DEPENDS,
+    },
+    'ai-disclosure-kit': {
+        'script': 'safe-harbor/generate_ai_kit.py',
+        'filename': 'AI_Disclosure_Kit.pdf',
+        'content_type': PDF,
+        'depends': KIT_PDF_DEPENDS,
+    },
+    'staff-training-guide': {
+        'script': 'safe-harbor/generate_staff_guide.py',
+        'filename': 'Staff_Training_Guide.pdf',
+        'content_type': PDF,
+        'depends': KIT_PDF_DEPENDS,
+    },
+    'compliance-roadmap': {
+        'script': 'safe-harbor/generate_roadmap.py',
+        'filename': 'Compliance_Roadmap.pdf',
+        'content_type': PDF,
+        'depends': KIT_PDF_DEPENDS,
+    },
+    'evidence-ledger': {
+        'script': 'safe-harbor/generate_evidence_ledger.py',
+        'filename': 'Evidence_Ledger.xlsx',
+        'content_type': XLSX,
+        'depends': KIT_XLSX_DEPENDS,
+    },
+}
+
+
+# Bump when the rendering contract changes without a generator edit
+RENDER_VERSION = 2
+
+
+class UnknownDocument(ValueError):
+    pass
+
+
+_modules = {}
+_versions = {}
+
+
+def load_generator(script):
+    """Import a generator script by its path under scripts/ (cached per process)."""
+    if script not in _modules:
+        path = os.path.join(SCRIPTS_DIR, script)
+        # Generators import their siblings (e.g. safe-harbor/kit_style.py)
+        directory = os.path.dirname(path)
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+        name = 'gen_' + os.path.splitext(os.path.basename(script))[0].replace('-', '_')
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[script] = module
+    return _modules[script]
+
+
+def _spec(doc_type):
+    if doc_type not in DOCUMENTS:
+        raise UnknownDocument(f"Unknown document type: {doc_type}. Valid: {', '.join(DOCUMENTS)}")
+    return DOCUMENTS[doc_type]
+
+
+def render_document(doc_type, params=None, optimize=True):
+    """Render one document to bytes. PDFs go through pdf_optimize unless
+    optimize=False."""
+    spec = _spec(doc_type)
+    module = load_generator(spec['script'])
+    if doc_type == 'nppes-form':
+        data = module.generate_nppes_form(module.form_data_from_api(params or {}))
+    else:
+        buf = BytesIO()
+        module.render(buf)
+        data = buf.getvalue()
+    if optimize and spec['content_type'] == PDF:
+        data = optimize_pdf(data)
+    return data
+
+
+def document_filename(doc_type, params=None):
+    spec = _spec(doc_type)
+    if doc_type == 'nppes-form':
+        return load_generator(spec['script']).form_filename(params or {})
+    return spec['filename']
+
+
+def content_type(doc_type):
+    return _spec(doc_type)['content_type']
+
+
+def generator_version(doc_type):
+    """Hash identifying what produced a document: the generator's source
+    and the shared modules it imports, the library it renders with, and
+    RENDER_VERSION. Any edit to the generator or its style module changes it.
+    """
+    if doc_type not in _versions:
+        spec = _spec(doc_type)
+        h = hashlib.sha256(f'v{RENDER_VERSION}:{_library_version(doc_type)}:'.encode())
+        for script in (spec['script'],) + spec.get('depends', ()):
+            with open(os.path.join(SCRIPTS_DIR, script), 'rb') as f:
+                h.update(f.read())
+        _versions[doc_type] = h.hexdigest()[:16]
+    return _versions[doc_type]
+
+
+def _library_version(doc_type):
+    name = 'openpyxl' if content_type(doc_type) == XLSX else 'reportlab'
+    try:
+        return f'{name}=={importlib.metadata.version(name)}'
+    except importlib.metadata.PackageNotFoundError:
+        return name
+
+
+def warm(doc_types=None):
+    """Import generators and build shared styles ahead of the first job.
+
+    Returns {doc_type: error} for generators that could not be loaded
+    (e.g. openpyxl missing); the rest are ready.
+    """
+    unavailable = {}
+    for doc_type in doc_types or DOCUMENTS:
+        try:
+            module = load_generator(_spec(doc_type)['script'])
+            if hasattr(module, 'get_styles'):
+                module.get_styles()
+        except Exception as e:
+            unavailable[doc_type] = f'{type(e).__name__}: {e}'
+    return unavailable
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render one generated document')
+    parser.add_argument('doc_type', choices=list(DOCUMENTS))
+    parser.add_argument('-o', '--output', help='Output path (default: the document filename)')
+    parser.add_argument('--params', help='JSON file with render parameters (nppes-form payload)')
+    args = parser.parse_args()
+
+    params = {}
+    if args.params:
+        with open(args.params, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+
+    start = time.time()
+    data = render_document(args.doc_type, params)
+    output = args.output or document_filename(args.doc_type, params)
+    with open(output, 'wb') as f:
+        f.write(data)
+    print(f'{args.doc_type}: {output} ({len(data) / 1024:.0f} KB) in {(time.time() - start) * 1000:.0f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+dr04_recrawl.py — Concurrent DR-04 third-party endpoint re-crawler
+
+DR-04 evidence in a provider's last_scan_result is whatever the last scan
+saw. Before outreach, this re-crawls each candidate homepage and rebuilds
+the DR-04 finding from what the site loads today:
+
+  1. Fetch homepages concurrently (thread pool, FETCH_WORKERS at a time).
+  2. Extract third-party hosts from script/iframe/link/img/source/form tags,
+     plus any absolute src/href/action URL (same pattern as the TS scanner).
+  3. Drop CDN domains (suffix join from foreign_routing), then resolve the
+     remaining hosts in one async DNS pass and classify them against the
+     local geo/ASN database (geo_verify), dropping CDN edges.
+
+The output is a DR-04 finding in the shape parse_foreign_findings expects:
+    {'id': 'DR-04', 'status': 'fail'|'pass'|'warn',
+     'evidence': {'non_us': [{'domain', 'country'}], ...}}
+
+A homepage that cannot be fetched yields status 'warn' (no DR-04 match):
+stale evidence is never carried into outreach.
+
+Usage as a module:
+    from dr04_recrawl import recrawl_dr04
+    findings = recrawl_dr04({'1234567890': 'https://example.com'}, geo_db)
+
+Usage standalone:
+    python scripts/dr04_recrawl.py https://example.com [...] --geo-db-dir DIR
+"""
+
+import argparse
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+from foreign_routing import cdn_mask
+from geo_verify import GEOIP_DB_DIR, GeoDatabase, classify_hosts, resolve_hosts
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    import urllib.request, ssl
+    HAS_REQUESTS = False
+
+FETCH_WORKERS = 48
+FETCH_TIMEOUT = 8  # seconds
+MAX_HTML_BYTES = 2_000_000
+USER_AGENT = 'Mozilla/5.0 (compatible; KairoLogic/1.0)'
+
+# Tag → attributes that load a third-party resource
+RESOURCE_ATTRS = {
+    'script': ('src',),
+    'iframe': ('src',),
+    'frame': ('src',),
+    'img': ('src',),
+    'source': ('src',),
+    'embed': ('src',),
+    'link': ('href',),
+    'form': ('action',),
+}
+
+ABSOLUTE_URL_RE = re.compile(r'''(?:src|href|action)=["']?(https?://[^"'\s>]+)''', re.IGNORECASE)
+
+
+# ── Fetch ────────────────────────────────────────────────
+
+def fetch_html(url, timeout=FETCH_TIMEOUT):
+    """Return (final_url, html) or (url, None) on failure."""
+    headers = {'User-Agent': USER_AGENT, 'Accept': 'text/html'}
+    try:
+        if HAS_REQUESTS:
+            r = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True)
+            if r.status_code != 200:
+                return url, None
+            return r.url, r.text[:MAX_HTML_BYTES]
+        req = urllib.request.Request(url, headers=headers)
+        ctx = ssl.create_default_context()
+        with urllib.request.urlopen(req, context=ctx, timeout=timeout) as resp:
+            body = resp.read(MAX_HTML_BYTES).decode('utf-8', errors='ignore')
+            return resp.geturl(), body
+    except Exception:
+        return url, None
+
+
+# ── Extract ──────────────────────────────────────────────
+
+class _ResourceParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        wanted = RESOURCE_ATTRS.get(tag)
+        if not wanted:
+            return
+        for name, value in attrs:
+            if name in wanted and value:
+                self.urls.append(value.strip())
+
+
+def site_of(host):
+    host = host.lower().rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+def extract_third_party_hosts(html, page_url):
+    """Hosts of resources the page loads from outside its own site."""
+    page_site = site_of(urlparse(page_url).hostname or '')
+    parser = _ResourceParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    urls = parser.urls + ABSOLUTE_URL_RE.findall(html)
+
+    hosts = []
+    for u in urls:
+        if u.startswith(('data:', 'javascript:', 'mailto:', 'tel:', '#')):
+            continue
+        try:
+            host = urlparse(urljoin(page_url, u)).hostname
+        except ValueError:
+            continue
+        if not host or host == 'localhost':
+            continue
+        host = host.lower().rstrip('.')
+        if host == page_site or host.endswith('.' + page_site):
+            continue
+        hosts.append(host)
+    return list(dict.fromkeys(hosts))
+
+
+# ── Re-crawl ─────────────────────────────────────────────
+
+def crawl_pages(urls_by_key, workers=FETCH_WORKERS):
+    """Fetch pages concurrently. Returns {key: [third-party hosts] or None if unreachable}."""
+    def crawl(item):
+        key, url = item
+        final_url, html = fetch_html(url)
+        if html is None:
+            return key, None
+        return key, extract_third_party_hosts(html, final_url)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(crawl, urls_by_key.items()))
+
+
+def dr04_finding(hosts, verdicts):
+    """Build a fresh DR-04 finding from a page's hosts and their geo verdicts."""
+    if hosts is None:
+        return {'id': 'DR-04', 'status': 'warn',
+                'evidence': {'non_us': [], 'unreachable': True, 'reverified': True}}
+    non_us = []
+    for h in hosts:
+        v = verdicts.get(h)
+        if v and v['verdict'] == 'foreign':
+            non_us.append({'domain': h, 'country': v['country']})
+    return {
+        'id': 'DR-04',
+        'status': 'fail' if non_us else 'pass',
+        'evidence': {'non_us': non_us, 'totalExternal': len(hosts), 'reverified': True},
+    }
+
+
+def recrawl_dr04(urls_by_key, geo_db, workers=FETCH_WORKERS):
+    """Re-crawl homepages and return {key: fresh DR-04 finding}."""
+    hosts_by_key = crawl_pages(urls_by_key, workers)
+
+    # CDN domains never need a DNS round trip
+    all_hosts = sorted({h for hosts in hosts_by_key.values() if hosts for h in hosts})
+    to_resolve = [h for h, cdn in zip(all_hosts, cdn_mask(all_hosts)) if not cdn]
+    verdicts = classify_hosts(to_resolve, geo_db, resolve_hosts(to_resolve))
+
+    return {key: dr04_finding(hosts, verdicts) for key, hosts in hosts_by_key.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-crawl homepages and rebuild DR-04 evidence')
+    parser.add_argument('urls', nargs='+', help='Homepage URLs')
+    parser.add_argument('--geo-db-dir', default=GEOIP_DB_DIR, help='Directory holding the .mmdb files')
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS)
+    args = parser.parse_args()
+
+    geo_db = GeoDatabase.from_dir(args.geo_db_dir)
+    start = time.time()
+    findings = recrawl_dr04({u: u for u in args.urls}, geo_db, args.workers)
+    geo_db.close()
+
+    for url, f in findings.items():
+        ev = f['evidence']
+        eps = ', '.join(f"{ep['domain']} ({ep['country']})" for ep in ev['non_us'])
+        print(f"  {f['status']:<5} {url}  {eps}")
+    print(f'Re-crawled {len(findings)} pages in {time.time() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -6,13 +6,39 @@ Principal Software Architect review gate for pull requests.
 Sends the git diff to Claude Opus 4.6 with a strict system prompt,
 parses the structured response, and exits non-zero on FAIL to block merge.
 
+Large diffs are reviewed map-reduce style instead of being truncated:
+  1. Split: the diff is cut at file boundaries, and files too large for one
+     request at hunk boundaries, into chunks of at most EVALUATOR_CHUNK_TOKENS.
+     Small files share a chunk.
+  2. Map: chunks are reviewed concurrently (EVALUATOR_CONCURRENCY at a time),
+     each with the same system prompt and context plus the list of every file
+     in the PR. Failed calls and unparseable responses are retried.
+  3. Reduce: the per-chunk STATUS/ISSUES results are merged into one
+     parse_response() result: worst status and severity win, issues and
+     remediation are concatenated.
+Every line of the diff is reviewed, and wall time is that of the slowest
+chunk. A diff that fits in one chunk is a single request, as before.
+
+Re-evaluation is incremental: clean verdicts (PASS, no issues) are cached
+per hunk, keyed on the hunk's normalized content (line numbers excluded, so
+moved hunks still hit) plus the model, system prompt and context files.
+Clean unchanged hunks are not sent again. A hunk with findings is never
+cached: it is re-reviewed on every run alongside the PR's new hunks, so a
+finding that is fixed in another file (a missing test, a caller's null
+check) clears. In CI the cache directory is carried between runs with
+actions/cache.
+
 Usage:
     python scripts/evaluator_node.py <diff_file> [--context-files FILE...]
     python scripts/evaluator_node.py diff.txt --context-files DESIGN_PRINCIPLES.md API_ROUTES_INDEX.md
 
 Environment:
-    ANTHROPIC_API_KEY  - Required. Claude API key.
-    EVALUATOR_MODEL    - Optional. Default: claude-sonnet-4-20250514
+    ANTHROPIC_API_KEY       - Required. Claude API key.
+    EVALUATOR_MODEL         - Optional. Default: claude-sonnet-4-20250514
+    EVALUATOR_CHUNK_TOKENS  - Optional. Diff tokens per request. Default: 8000
+    EVALUATOR_CONCURRENCY   - Optional. Requests in flight. Default: 4
+    EVALUATOR_OUTPUT        - Optional. Result JSON path. Default: evaluator-result.json
+    EVALUATOR_CACHE_DIR     - Optional. Hunk cache directory. Default: .evaluator-cache ("" disables)
 
 Exit codes:
     0  - PASS (all checks passed)
@@ -20,10 +46,15 @@ Exit codes:
     2  - ERROR (script or API failure)
 """
 
+import hashlib
 import json
 import os
+import random
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
@@ -31,8 +62,18 @@ from pathlib import Path
 # ---------------------------------------------------------------------------
 
 MODEL = os.environ.get("EVALUATOR_MODEL", "claude-sonnet-4-20250514")
-MAX_DIFF_CHARS = 80_000  # Truncate very large diffs to stay within context
+MAX_CHUNK_TOKENS = int(os.environ.get("EVALUATOR_CHUNK_TOKENS", "8000"))  # Diff per request
+MAX_CONCURRENCY = int(os.environ.get("EVALUATOR_CONCURRENCY", "4"))
+MAX_ATTEMPTS = 3  # Per chunk: API errors and unparseable responses are retried
+RETRY_BASE_DELAY = 2.0  # Seconds; doubles per attempt, plus jitter
+CHARS_PER_TOKEN = 4  # Rough estimate for code; keeps chunks well under the limit
 MAX_CONTEXT_CHARS = 30_000
+CACHE_DIR = os.environ.get("EVALUATOR_CACHE_DIR", ".evaluator-cache")  # "" disables the hunk cache
+CACHE_MAX_AGE_DAYS = 30
+CACHE_VERSION = 2  # Bump when the cache entry format or attribution changes (v1 cached findings)
+
+SEVERITY_ORDER = ["NONE", "LOW", "MEDIUM", "HIGH", "BLOCKER"]
+MAX_SUMMARIES = 3  # Chunk summaries quoted in a merged SUMMARY line
 
 SYSTEM_PROMPT = """### ROLE
 You are a Principal Software Architect and Security Auditor for KairoLogic, a healthcare provider compliance platform built with Next.js 14, Supabase, and TypeScript. Your sole purpose is to critically evaluate code changes submitted via pull request. You do not write new features; you identify flaws, architectural regressions, and logic errors.
@@ -202,63 +243,560 @@ def parse_response(text: str) -> dict:
     return result
 
 
-def call_claude(diff_text: str, context_text: str) -> str:
-    """Call the Claude API with the diff and context."""
+class EvaluatorError(Exception):
+    """API failure that should end the run with exit code 2."""
+
+
+# ---------------------------------------------------------------------------
+# Diff splitting (map input)
+# ---------------------------------------------------------------------------
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_diff(diff_text: str) -> list[dict]:
+    """Split a unified git diff into files: {"path", "header", "hunks"}.
+
+    header is everything before the first @@ line (diff --git, index, ---/+++),
+    hunks are the @@ sections. Text before the first file header (or a diff
+    without any) is kept as a file of its own.
+    """
+    files = []
+    current = None
+    for line in diff_text.splitlines(keepends=True):
+        if line.startswith("diff --git "):
+            m = re.match(r"diff --git a/(.*?) b/(.*)$", line.rstrip("\n"))
+            current = {"path": m.group(2) if m else line[11:].strip(), "header": line, "hunks": []}
+            files.append(current)
+        elif current is None:
+            current = {"path": "(diff)", "header": "", "hunks": []}
+            files.append(current)
+            current["header"] += line
+        elif line.startswith("@@"):
+            current["hunks"].append(line)
+        elif current["hunks"]:
+            current["hunks"][-1] += line
+        else:
+            current["header"] += line
+    return files
+
+
+def _split_hunk(header: str, hunk: str, max_chars: int) -> list[str]:
+    """Cut a hunk larger than one chunk at line boundaries; each piece repeats
+    the file header and the @@ line so it can be reviewed on its own."""
+    lines = hunk.splitlines(keepends=True)
+    at_line, body = lines[0], lines[1:]
+    pieces, piece = [], ""
+    for line in body:
+        if piece and len(header) + len(at_line) + len(piece) + len(line) > max_chars:
+            pieces.append(piece)
+            piece = ""
+        piece += line
+    pieces.append(piece)
+    total = len(pieces)
+    return [
+        header + at_line.rstrip("\n") + (f" [part {n}/{total} of this hunk]\n" if total > 1 else "\n") + body_part
+        for n, body_part in enumerate(pieces, 1)
+    ]
+
+
+def build_chunks(files: list[dict], max_tokens: int = MAX_CHUNK_TOKENS) -> list[dict]:
+    """Pack files into chunks of at most max_tokens: {"files", "text", "hunks"}.
+
+    A file that fits is never split. A larger file is split at hunk
+    boundaries, each part carrying the file header; a single hunk larger
+    than a chunk is split by lines. Consecutive small pieces share a chunk.
+    "hunks" lists the (file index, hunk index) pairs a chunk contains; a
+    file without hunks (binary, rename) is (file index, None).
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []  # (path, text, hunks)
+    for fi, f in enumerate(files):
+        whole = f["header"] + "".join(f["hunks"])
+        if len(whole) <= max_chars or not f["hunks"]:
+            pieces.append((f["path"], whole, [(fi, hi) for hi in range(len(f["hunks"]))] or [(fi, None)]))
+            continue
+        part, part_hunks = "", []
+        for hi, hunk in enumerate(f["hunks"]):
+            if len(f["header"]) + len(hunk) > max_chars:
+                if part:
+                    pieces.append((f["path"], f["header"] + part, part_hunks))
+                    part, part_hunks = "", []
+                pieces.extend((f["path"], p, [(fi, hi)]) for p in _split_hunk(f["header"], hunk, max_chars))
+            elif part and len(f["header"]) + len(part) + len(hunk) > max_chars:
+                pieces.append((f["path"], f["header"] + part, part_hunks))
+                part, part_hunks = hunk, [(fi, hi)]
+            else:
+                part += hunk
+                part_hunks.append((fi, hi))
+        if part:
+            pieces.append((f["path"], f["header"] + part, part_hunks))
+
+    chunks = []
+    for path, text, hunks in pieces:
+        if chunks and len(chunks[-1]["text"]) + len(text) <= max_chars:
+            chunks[-1]["text"] += text
+        else:
+            chunks.append({"files": [], "text": text, "hunks": []})
+        if path not in chunks[-1]["files"]:
+            chunks[-1]["files"].append(path)
+        chunks[-1]["hunks"].extend(h for h in hunks if h not in chunks[-1]["hunks"])
+    return chunks
+
+
+# ---------------------------------------------------------------------------
+# Claude API
+# ---------------------------------------------------------------------------
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _anthropic_client(api_key: str):
+    """Shared SDK client (thread-safe), or None when the SDK is not installed."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            try:
+                import anthropic
+            except ImportError:
+                return None
+            # Retries are handled per chunk in review_chunk()
+            _client = anthropic.Anthropic(api_key=api_key, max_retries=0)
+        return _client
+
+
+def call_claude(diff_text: str, context_text: str, scope: str = "") -> str:
+    """Call the Claude API with the diff and context. Raises EvaluatorError."""
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key:
-        print("ERROR: ANTHROPIC_API_KEY environment variable not set")
-        sys.exit(2)
+        raise EvaluatorError("ANTHROPIC_API_KEY environment variable not set")
 
-    # Use the anthropic SDK if available, otherwise fall back to requests
-    try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
-
-        user_message = f"## Code Diff to Review\n\n```diff\n{diff_text}\n```"
-        if context_text:
-            user_message = f"## Codebase Context\n\n{context_text}\n\n{user_message}"
-
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=4096,
-            system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_message}],
-        )
+    user_message = f"## Code Diff to Review\n\n```diff\n{diff_text}\n```"
+    if scope:
+        user_message = f"## Review Scope\n\n{scope}\n\n{user_message}"
+    if context_text:
+        user_message = f"## Codebase Context\n\n{context_text}\n\n{user_message}"
+
+    # Use the anthropic SDK if available, otherwise fall back to urllib
+    client = _anthropic_client(api_key)
+    if client is not None:
+        try:
+            response = client.messages.create(
+                model=MODEL,
+                max_tokens=4096,
+                system=SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": user_message}],
+            )
+        except Exception as e:
+            raise EvaluatorError(f"Claude API call failed: {type(e).__name__}: {e}") from e
         return response.content[0].text
 
-    except ImportError:
-        # Fall back to urllib (no external deps needed)
-        import urllib.request
-        import urllib.error
-
-        user_message = f"## Code Diff to Review\n\n```diff\n{diff_text}\n```"
-        if context_text:
-            user_message = f"## Codebase Context\n\n{context_text}\n\n{user_message}"
-
-        payload = json.dumps({
-            "model": MODEL,
-            "max_tokens": 4096,
-            "system": SYSTEM_PROMPT,
-            "messages": [{"role": "user", "content": user_message}],
-        })
-
-        req = urllib.request.Request(
-            "https://api.anthropic.com/v1/messages",
-            data=payload.encode("utf-8"),
-            headers={
-                "Content-Type": "application/json",
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-            },
+    # Fall back to urllib (no external deps needed)
+    import urllib.request
+    import urllib.error
+
+    payload = json.dumps({
+        "model": MODEL,
+        "max_tokens": 4096,
+        "system": SYSTEM_PROMPT,
+        "messages": [{"role": "user", "content": user_message}],
+    })
+
+    req = urllib.request.Request(
+        "https://api.anthropic.com/v1/messages",
+        data=payload.encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+        },
+    )
+
+    try:
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            body = json.loads(resp.read().decode("utf-8"))
+            return body["content"][0]["text"]
+    except urllib.error.HTTPError as e:
+        raise EvaluatorError(f"Claude API returned {e.code}: {e.read().decode()}") from e
+    except (urllib.error.URLError, TimeoutError, KeyError, ValueError) as e:
+        raise EvaluatorError(f"Claude API call failed: {type(e).__name__}: {e}") from e
+
+
+# ---------------------------------------------------------------------------
+# Map: review chunks concurrently
+# ---------------------------------------------------------------------------
+
+def chunk_scope(chunk: dict, index: int, total: int, all_files: list[str]) -> str:
+    """Tell the reviewer which part of the PR it sees and what else changed."""
+    if total == 1:
+        return ""
+    others = [f for f in all_files if f not in chunk["files"]]
+    lines = [
+        f"This is part {index} of {total} of a large pull request; each part is reviewed separately.",
+        "Review only the diff shown here. Do not report issues about code you cannot see.",
+        f"Files in this part: {', '.join(chunk['files'])}",
+    ]
+    if others:
+        lines.append(
+            "Other files changed in this PR (reviewed in other parts; consider them for "
+            f"TEST_COVERAGE and DOC_COVERAGE): {', '.join(others)}"
         )
+    return "\n".join(lines)
+
+
+def review_chunk(chunk: dict, index: int, total: int, context_text: str, all_files: list[str]) -> dict:
+    """Review one chunk with retries. Returns its parse_response() result plus
+    chunk metadata; status is ERROR if every attempt failed."""
+    scope = chunk_scope(chunk, index, total, all_files)
+    start = time.time()
+    result, error = None, ""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            result = parse_response(call_claude(chunk["text"], context_text, scope))
+            if result["status"] != "ERROR":
+                break
+            error = "unparseable response"
+        except EvaluatorError as e:
+            error = str(e)
+        if attempt < MAX_ATTEMPTS:
+            time.sleep(RETRY_BASE_DELAY * 2 ** (attempt - 1) + random.uniform(0, 1))
+    if result is None:
+        result = parse_response("")
+        result["summary"] = error
+    result["chunk"] = {
+        "index": index,
+        "files": chunk["files"],
+        "tokens": estimate_tokens(chunk["text"]),
+        "attempts": attempt,
+        "seconds": round(time.time() - start, 1),
+        "error": error if result["status"] == "ERROR" else "",
+    }
+    return result
+
+
+def review_chunks(chunks: list[dict], context_text: str, all_files: list[str]) -> list[dict]:
+    """Review all chunks, MAX_CONCURRENCY at a time. Results in chunk order."""
+    total = len(chunks)
+    results = [None] * total
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_CONCURRENCY, total))) as pool:
+        futures = {
+            pool.submit(review_chunk, chunk, i, total, context_text, all_files): i
+            for i, chunk in enumerate(chunks, 1)
+        }
+        for fut in as_completed(futures):
+            r = fut.result()
+            results[futures[fut] - 1] = r
+            c = r["chunk"]
+            if total > 1:
+                note = f" ({c['error']})" if c["error"] else ""
+                print(f"  [{c['index']}/{total}] {r['status']} {r['severity']:<7} "
+                      f"{c['seconds']:>5.1f}s  {', '.join(c['files'])}{note}")
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Reduce: merge chunk results into one parse_response() result
+# ---------------------------------------------------------------------------
+
+def _dedupe(items: list[str]) -> list[str]:
+    seen = set()
+    return [x for x in items if not (x in seen or seen.add(x))]
+
+
+def reduce_results(results: list[dict]) -> dict:
+    """Merge per-chunk results: any FAIL fails the PR, a chunk that could not
+    be reviewed makes it an ERROR, the highest severity wins, issues and
+    remediation are concatenated (most severe issues first). Coverage
+    verdicts come from this run's reviews; cached parts only decide them
+    when nothing was reviewed fresh."""
+    if len(results) == 1 and not results[0]["chunk"].get("cached"):
+        return {k: v for k, v in results[0].items() if k != "chunk"}
+
+    statuses = [r["status"] for r in results]
+    status = "FAIL" if "FAIL" in statuses else "ERROR" if "ERROR" in statuses else "PASS"
+    reviewed = [r for r in results if r["status"] != "ERROR"]
+    judged = [r for r in reviewed if not r["chunk"].get("cached")] or reviewed
+    severity = max((r["severity"] for r in reviewed), key=SEVERITY_ORDER.index, default="BLOCKER")
+    if "ERROR" in statuses:
+        severity = max(severity, "HIGH", key=SEVERITY_ORDER.index)
+
+    def issue_rank(issue: str) -> int:
+        m = re.match(r"\[(\w+)\]", issue)
+        level = m.group(1).upper() if m else ""
+        return -SEVERITY_ORDER.index(level) if level in SEVERITY_ORDER else 0
+
+    issues = _dedupe([i for r in results for i in r["issues"]])
+    issues.sort(key=issue_rank)  # stable: chunk order within a severity
+    for r in results:
+        if r["status"] == "ERROR":
+            issues.append(f"[HIGH] {', '.join(r['chunk']['files'])} - not reviewed: {r['chunk']['error']}")
+
+    worst = _dedupe([r["summary"] for r in reviewed if r["summary"] and r["severity"] == severity])
+    cached = sum(1 for r in results if r["chunk"].get("cached"))
+    summary = f"{len(reviewed)}/{len(results)} parts reviewed"
+    if cached:
+        summary += f" ({cached} unchanged, from cache)"
+    if worst:
+        summary += ": " + " | ".join(worst[:MAX_SUMMARIES])
+        if len(worst) > MAX_SUMMARIES:
+            summary += f" (+{len(worst) - MAX_SUMMARIES} more)"
+
+    return {
+        "status": status,
+        "severity": severity,
+        "summary": summary,
+        "issues": issues,
+        "test_coverage": "NEEDS_UPDATE" if any(r["test_coverage"] == "NEEDS_UPDATE" for r in judged) else "ADEQUATE",
+        "doc_coverage": "NEEDS_UPDATE" if any(r["doc_coverage"] == "NEEDS_UPDATE" for r in judged) else "ADEQUATE",
+        "remediation": _dedupe([x for r in results for x in r["remediation"]]),
+        "raw": "\n\n".join(
+            f"=== Part {r['chunk']['index']}/{len(results)}{' (cached)' if r['chunk'].get('cached') else ''}: "
+            f"{', '.join(r['chunk']['files'])} ===\n{r['raw']}"
+            for r in results
+        ),
+        "chunks": [dict(r["chunk"], status=r["status"], severity=r["severity"]) for r in results],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Hunk result cache (incremental re-review)
+# ---------------------------------------------------------------------------
+
+HUNK_HEADER_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+ISSUE_REF_RE = re.compile(r"^\[(\w+)\]\s+(\S+?):(\d+)")
+
+
+def hunk_range(hunk: str) -> tuple[int, int]:
+    """(first line, line count) of a hunk in the new file."""
+    m = HUNK_HEADER_RE.match(hunk)
+    if not m:
+        return 0, 0
+    return int(m.group(1)), int(m.group(2) or 1)
+
 
+def normalize_hunk(text: str) -> str:
+    """Hunk content without its @@ line numbers or trailing whitespace, so a
+    hunk that only moved (code added above it) keeps its key."""
+    lines = text.replace("\r\n", "\n").split("\n")
+    if lines and lines[0].startswith("@@"):
+        lines = lines[1:]
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def review_version(context_text: str) -> str:
+    """Everything besides the hunk that shapes a review: cache format, model,
+    system prompt and the loaded context files."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}:{MODEL}:".encode())
+    h.update(SYSTEM_PROMPT.encode("utf-8"))
+    h.update(hashlib.sha256(context_text.encode("utf-8")).digest())
+    return h.hexdigest()[:16]
+
+
+def hunk_key(path: str, text: str, version: str) -> str:
+    h = hashlib.sha256(f"{version}:{path}:".encode("utf-8"))
+    h.update(normalize_hunk(text).encode("utf-8"))
+    return h.hexdigest()
+
+
+class HunkCache:
+    """Clean review verdicts per hunk, one JSON file per key under a directory.
+
+    Restored and saved between workflow runs with actions/cache; locally it
+    is just a directory. Entries not read for CACHE_MAX_AGE_DAYS are pruned.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
         try:
-            with urllib.request.urlopen(req, timeout=120) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
-                return body["content"][0]["text"]
-        except urllib.error.HTTPError as e:
-            print(f"ERROR: Claude API returned {e.code}: {e.read().decode()}")
-            sys.exit(2)
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # mark as recently used
+            return entry
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, key: str, entry: dict):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def prune(self, max_age_days: int = CACHE_MAX_AGE_DAYS) -> int:
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+def review_units(files: list[dict], version: str) -> list[list[dict]]:
+    """Cache units per file: one per hunk, or the header alone for a file
+    without hunks (binary, rename). Each unit: {"path", "key", "start", "length"}."""
+    units = []
+    for f in files:
+        texts = f["hunks"] or [f["header"]]
+        units.append([
+            {"path": f["path"], "key": hunk_key(f["path"], text, version), "start": start, "length": length}
+            for text in texts
+            for start, length in [hunk_range(text)]
+        ])
+    return units
+
+
+def _same_path(ref: str, path: str) -> bool:
+    return ref == path or path.endswith("/" + ref) or ref.endswith("/" + path)
+
+
+def _issue_unit(issue: str, units: list[dict]) -> dict:
+    """The hunk an issue from a chunk review refers to: by file:line, else the
+    nearest hunk of that file, else the chunk's first hunk."""
+    m = ISSUE_REF_RE.match(issue)
+    if not m:
+        return units[0]
+    candidates = [u for u in units if _same_path(m.group(2), u["path"])]
+    if not candidates:
+        return units[0]
+    line = int(m.group(3))
+    return min(candidates, key=lambda u: 0 if u["start"] <= line < u["start"] + u["length"]
+               else min(abs(line - u["start"]), abs(line - (u["start"] + u["length"]))))
+
+
+def attribute_findings(result: dict, units: list[dict]) -> dict:
+    """Split one chunk's parse_response() result into cache entries per hunk."""
+    entries = {u["key"]: {"path": u["path"], "issues": [], "remediation": [],
+                          "status": "PASS", "severity": "NONE"} for u in units}
+    for issue in result["issues"]:
+        entries[_issue_unit(issue, units)["key"]]["issues"].append(issue)
+    for entry in entries.values():
+        if entry["issues"]:
+            levels = [m.group(1).upper() for m in map(ISSUE_REF_RE.match, entry["issues"])
+                      if m and m.group(1).upper() in SEVERITY_ORDER]
+            entry["severity"] = max(levels, key=SEVERITY_ORDER.index, default=result["severity"])
+            entry["status"] = result["status"]
+            entry["remediation"] = result["remediation"]
+    if result["status"] == "FAIL" and not result["issues"]:
+        # Verdict without attributable issues: it holds for every hunk shown
+        for entry in entries.values():
+            entry.update(status="FAIL", severity=result["severity"], remediation=result["remediation"])
+    return entries
+
+
+def is_clean(entry: dict) -> bool:
+    """Only a PASS without issues is safe to reuse: a finding may be resolved
+    by a change elsewhere in the PR, so hunks with findings are re-reviewed."""
+    return entry.get("status") == "PASS" and not entry.get("issues")
+
+
+def merge_entries(entries: list[dict]) -> dict:
+    """One hunk reviewed in several chunks (split by lines): combine findings."""
+    merged = dict(entries[0])
+    for e in entries[1:]:
+        merged["issues"] = _dedupe(merged["issues"] + e["issues"])
+        merged["remediation"] = _dedupe(merged["remediation"] + e["remediation"])
+        if e["status"] == "FAIL":
+            merged["status"] = "FAIL"
+        merged["severity"] = max(merged["severity"], e["severity"], key=SEVERITY_ORDER.index)
+    return merged
+
+
+def cached_results(hits: list[tuple[dict, dict]], first_index: int) -> list[dict]:
+    """PASS results for cached clean hunks, one per file. Their coverage
+    verdicts are left ADEQUATE: coverage is decided by this run's reviews."""
+    by_file = {}
+    for unit, _ in hits:
+        by_file.setdefault(unit["path"], []).append(unit)
+    results = []
+    for index, (path, file_units) in enumerate(by_file.items(), first_index):
+        result = parse_response("")
+        result.update(
+            status="PASS",
+            severity="NONE",
+            test_coverage="ADEQUATE",
+            doc_coverage="ADEQUATE",
+            raw=f"(unchanged: {len(file_units)} hunk{'s' if len(file_units) != 1 else ''} passed review earlier)",
+        )
+        result["chunk"] = {"index": index, "files": [path], "tokens": 0, "attempts": 0,
+                           "seconds": 0.0, "error": "", "cached": True, "hunks": len(file_units)}
+        results.append(result)
+    return results
+
+
+def evaluate(diff_text: str, context_text: str, cache: HunkCache | None = None) -> dict:
+    """Review a diff and return the reduced parse_response() result.
+
+    With a cache, hunks that passed review before with no issues (same
+    content, prompt, model and context) are not sent again; every other hunk
+    is reviewed, and the clean verdicts among them are stored per hunk.
+    """
+    files = split_diff(diff_text)
+    all_files = [f["path"] for f in files]
+    version = review_version(context_text)
+    units = review_units(files, version)
+
+    hits, todo = [], []  # todo: (file, its units, indexes of hunks to review)
+    for f, file_units in zip(files, units):
+        pending = []
+        for i, unit in enumerate(file_units):
+            entry = cache.get(unit["key"]) if cache else None
+            if entry is None or not is_clean(entry):
+                pending.append(i)
+            else:
+                hits.append((unit, entry))
+        if pending:
+            todo.append((f, file_units, pending))
+    todo_files = [dict(f, hunks=[f["hunks"][i] for i in pending] if f["hunks"] else [])
+                  for f, _, pending in todo]
+    todo_units = [[file_units[i] for i in pending] for _, file_units, pending in todo]
+    chunks = build_chunks(todo_files)
+
+    total = sum(len(u) for u in units)
+    print(f"Evaluating {len(diff_text)} chars of diff ({len(all_files)} files, {total} hunks) with model {MODEL}...")
+    if cache:
+        print(f"Hunk cache: {len(hits)}/{total} unchanged and clean, {total - len(hits)} to review")
+    if chunks:
+        print(f"Reviewing in {len(chunks)} part{'s' if len(chunks) != 1 else ''}...")
+    fresh = review_chunks(chunks, context_text, all_files) if chunks else []
+
+    if cache:
+        reviewed, failed = {}, set()
+        for chunk, r in zip(chunks, fresh):
+            chunk_units = [todo_units[fi][0 if hi is None else hi] for fi, hi in chunk["hunks"]]
+            if r["status"] == "ERROR":
+                failed.update(u["key"] for u in chunk_units)
+                continue
+            for key, entry in attribute_findings(r, chunk_units).items():
+                reviewed.setdefault(key, []).append(entry)
+        for key, entries in reviewed.items():
+            entry = merge_entries(entries)
+            if key not in failed and is_clean(entry):
+                cache.put(key, entry)
+
+    result = reduce_results(fresh + cached_results(hits, len(fresh) + 1))
+
+    # Coverage verdicts are about the whole PR: keep the last one per file set
+    if cache:
+        coverage_key = hashlib.sha256(f"{version}:coverage:{chr(10).join(sorted(all_files))}".encode()).hexdigest()
+        if fresh and all(r["status"] != "ERROR" for r in fresh):
+            cache.put(coverage_key, {k: result[k] for k in ("test_coverage", "doc_coverage")})
+        elif not fresh:
+            coverage = cache.get(coverage_key)
+            if coverage:
+                result.update(coverage)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -276,7 +814,6 @@ def main():
         sys.exit(2)
 
     diff_text = diff_path.read_text(encoding="utf-8", errors="replace")
-    diff_text = truncate(diff_text, MAX_DIFF_CHARS)
 
     if not diff_text.strip():
         print("No changes detected in diff. Skipping evaluation.")
@@ -284,6 +821,10 @@ def main():
         print("SEVERITY: NONE")
         sys.exit(0)
 
+    if not os.environ.get("ANTHROPIC_API_KEY"):
+        print("ERROR: ANTHROPIC_API_KEY environment variable not set")
+        sys.exit(2)
+
     # Parse optional context files
     context_files = []
     if "--context-files" in sys.argv:
@@ -292,12 +833,14 @@ def main():
 
     context_text = load_context_files(context_files) if context_files else ""
 
-    # Call Claude
-    print(f"Evaluating {len(diff_text)} chars of diff with model {MODEL}...")
-    raw_response = call_claude(diff_text, context_text)
+    cache = HunkCache(CACHE_DIR) if CACHE_DIR else None
 
-    # Parse response
-    result = parse_response(raw_response)
+    # Call Claude
+    start = time.time()
+    result = evaluate(diff_text, context_text, cache)
+    print(f"Review finished in {time.time() - start:.1f}s")
+    if cache:
+        cache.prune()
 
     # Output
     print("\n" + "=" * 60)
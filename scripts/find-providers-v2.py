@@ -4,19 +4,30 @@ KairoLogic Campaign Provider Finder v2
 Smarter filtering:
 - DR-01: foreign primary domain (excludes Canada/CDN false positives)
 - DR-04: third-party endpoints routing to non-US servers
+- Optional DR-01 re-verification against a local GeoIP/ASN database
+- Optional DR-04 re-crawl of candidate homepages (fresh third-party evidence)
 - Email domain validation (must match provider website)
 - Non-healthcare entity filter
 
-Usage: py scripts/find-providers-v2.py
+Usage:
+  py scripts/find-providers-v2.py
+  py scripts/find-providers-v2.py --reverify --geo-db-dir path/to/geoip
+  py scripts/find-providers-v2.py --reverify --recrawl --geo-db-dir path/to/geoip
+  py scripts/find-providers-v2.py --changed-only     # only rows rescanned since last run
+  py scripts/find-providers-v2.py --reset-cursor     # start again from the lowest scores
 """
 
-import hmac, hashlib, json, re, time, csv, sys
+import argparse, hmac, hashlib, json, os, re, time, csv, sys
+import urllib.parse
+from datetime import datetime, timezone
+
+from foreign_routing import replace_finding, screen_registry, screen_scans
 
 try:
     import requests
     HAS_REQUESTS = True
 except ImportError:
-    import urllib.request, urllib.parse, ssl
+    import urllib.request, ssl
     HAS_REQUESTS = False
     print("Note: Install 'requests' for better performance: pip install requests")
 
@@ -28,18 +39,10 @@ REPORT_SECRET = 'b6f59bad31ffd504440de822bde1d3d84c08658969a2207b23671fe92a373de
 TARGET_COUNT = 50
 MAX_SCORE = 79
 PAGE_SIZE = 200
-
-# CDN countries to skip for DR-01 (false positives from anycast)
-CDN_FALSE_POSITIVE_COUNTRIES = {'CA', 'US'}
-
-# Known CDN/infrastructure domains to ignore in DR-04
-CDN_DOMAINS = {
-    'cloudflare.com', 'cloudflare-dns.com', 'cloudflareinsights.com',
-    'fastly.net', 'fastlylb.net',
-    'akamai.net', 'akamaized.net', 'akamaitechnologies.com',
-    'amazonaws.com', 'cloudfront.net',
-    'azureedge.net', 'azure.com', 'msecnd.net',
-}
+OUTREACH_PAGE_SIZE = 1000
+UPSERT_BATCH_SIZE = 500
+CAMPAIGN_NAME = 'sb1188-foreign-v1'
+CURSOR_FILE = '.find-providers-v2-cursor.json'
 
 URL_BLOCKLIST = [
     'facebook.com', 'yelp.com', 'healthgrades.com', 'vitals.com', 'zocdoc.com',
@@ -68,19 +71,6 @@ JUNK_EMAIL_DOMAINS = [
     'example.com', 'test.com', 'ndiscovered.com',
 ]
 
-COUNTRY_NAMES = {
-    'GB': 'Great Britain', 'IE': 'Ireland', 'DE': 'Germany', 'FR': 'France',
-    'NL': 'Netherlands', 'BE': 'Belgium', 'DK': 'Denmark', 'SE': 'Sweden',
-    'NO': 'Norway', 'FI': 'Finland', 'AU': 'Australia',
-    'SG': 'Singapore', 'JP': 'Japan', 'IN': 'India', 'BR': 'Brazil',
-    'HK': 'Hong Kong', 'KR': 'South Korea', 'IT': 'Italy', 'ES': 'Spain',
-    'LU': 'Luxembourg', 'CH': 'Switzerland', 'AT': 'Austria', 'PL': 'Poland',
-    'RO': 'Romania', 'BG': 'Bulgaria', 'CZ': 'Czech Republic', 'RU': 'Russia',
-    'CN': 'China', 'TW': 'Taiwan', 'PH': 'Philippines', 'TH': 'Thailand',
-    'ZA': 'South Africa', 'MX': 'Mexico', 'AR': 'Argentina', 'CL': 'Chile',
-    'CA': 'Canada',
-}
-
 # ── HELPERS ──
 
 def supabase_get(table, query):
@@ -100,6 +90,77 @@ def supabase_get(table, query):
         print('  DB error: ' + str(e))
         return []
 
+def supabase_get_strict(table, query):
+    """Like supabase_get, but raises instead of returning [] on error."""
+    url = SUPABASE_URL + '/rest/v1/' + table + '?' + query
+    headers = {'apikey': SUPABASE_KEY, 'Authorization': 'Bearer ' + SUPABASE_KEY}
+    if HAS_REQUESTS:
+        r = requests.get(url, headers=headers, timeout=30)
+        r.raise_for_status()
+        return r.json()
+    req = urllib.request.Request(url, headers=headers)
+    ctx = ssl.create_default_context()
+    with urllib.request.urlopen(req, context=ctx, timeout=30) as resp:
+        return json.loads(resp.read())
+
+def supabase_upsert(table, rows, on_conflict):
+    """Insert rows, skipping any that hit the on_conflict unique key."""
+    url = SUPABASE_URL + '/rest/v1/' + table + '?on_conflict=' + on_conflict
+    headers = {
+        'apikey': SUPABASE_KEY,
+        'Authorization': 'Bearer ' + SUPABASE_KEY,
+        'Content-Type': 'application/json',
+        'Prefer': 'resolution=ignore-duplicates,return=minimal',
+    }
+    if HAS_REQUESTS:
+        r = requests.post(url, headers=headers, json=rows, timeout=30)
+        if r.status_code >= 400:
+            raise Exception('Upsert failed: ' + str(r.status_code) + ' ' + r.text[:300])
+        return
+    req = urllib.request.Request(url, data=json.dumps(rows).encode('utf-8'), headers=headers, method='POST')
+    ctx = ssl.create_default_context()
+    with urllib.request.urlopen(req, context=ctx, timeout=30):
+        pass
+
+def fetch_outreach_npis():
+    """Every NPI already in campaign_outreach, keyset-paged by npi.
+
+    A single limit=1000 select silently truncates once the table grows, so
+    page until exhausted and fail loudly rather than exclude a partial set.
+    """
+    npis = set()
+    last = None
+    while True:
+        query = 'select=npi&order=npi.asc&limit=' + str(OUTREACH_PAGE_SIZE)
+        if last is not None:
+            query += '&npi=gt.' + urllib.parse.quote(last)
+        try:
+            page = supabase_get_strict('campaign_outreach', query)
+        except Exception as e:
+            print('  [FATAL] Could not read campaign_outreach: ' + str(e))
+            sys.exit(1)
+        if not page:
+            break
+        npis.update(str(r['npi']) for r in page)
+        last = str(page[-1]['npi'])
+        if len(page) < OUTREACH_PAGE_SIZE:
+            break
+    return npis
+
+def upsert_outreach(rows):
+    """Write outreach rows in conflict-aware batches. Returns (written, failed batches)."""
+    written = 0
+    failed = 0
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[i:i + UPSERT_BATCH_SIZE]
+        try:
+            supabase_upsert('campaign_outreach', batch, 'npi,campaign_name')
+            written += len(batch)
+        except Exception as e:
+            failed += 1
+            print('  Error on batch ' + str(i // UPSERT_BATCH_SIZE + 1) + ': ' + str(e))
+    return written, failed
+
 def get_domain(url):
     try:
         if HAS_REQUESTS:
@@ -266,105 +327,144 @@ def scrape_email(url, timeout=8):
     return best_email, best_source
 
 
-# ── SCAN PARSING ──
+# ── REGISTRY CURSOR ──
+#
+# Runs resume where the previous one stopped instead of re-reading the same
+# low-score rows from offset=0:
+#   risk_cursor — (risk_score, npi) of the last row consumed, keyset order
+#   scan_cursor — (last_scan_timestamp, npi); with --changed-only, only rows
+#                 rescanned after this point are read
+# When a risk sweep reaches the end of the registry it starts over next run,
+# and scan_cursor is set to when that sweep began so --changed-only picks up
+# only rows rescanned since.
 
-def parse_foreign_findings(scan):
-    """
-    Extract foreign routing info from scan result.
-    Returns dict with:
-      - dr01_foreign: bool (primary domain is foreign, excluding CA)
-      - dr01_country: str
-      - dr01_host: str
-      - dr04_foreign_endpoints: list of {domain, country}
-      - finding_text: str (for email)
-      - source: 'dr01' | 'dr04' | 'both'
+def load_cursor(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cursor(path, state):
+    state['updated_at'] = datetime.now(timezone.utc).isoformat()
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+def keyset_filter(column, after):
+    """PostgREST filter for rows strictly after (value, npi) in (column, npi) order."""
+    if not after:
+        return ''
+    value, npi = after
+    expr = ('(' + column + '.gt."' + str(value) + '",and(' + column + '.eq."' + str(value) +
+            '",npi.gt."' + str(npi) + '"))')
+    return '&or=' + urllib.parse.quote(expr, safe='(),.')
+
+def registry_page(changed_only, after):
+    """Next page of registry rows after the keyset cursor."""
+    query = ('select=npi,name,city,url,risk_score,last_scan_timestamp,last_scan_result'
+             '&url=neq.__NOT_FOUND__&risk_score=lt.' + str(MAX_SCORE) + '&risk_score=gt.0')
+    if changed_only:
+        query += '&last_scan_timestamp=not.is.null'
+        query += keyset_filter('last_scan_timestamp', after)
+        query += '&order=last_scan_timestamp.asc,npi.asc'
+    else:
+        query += keyset_filter('risk_score', after)
+        query += '&order=risk_score.asc,npi.asc'
+    return supabase_get('registry', query + '&limit=' + str(PAGE_SIZE))
+
+def row_key(p, changed_only):
+    return [p.get('last_scan_timestamp') if changed_only else p.get('risk_score'), str(p.get('npi', ''))]
+
+
+# ── CANDIDATES ──
+
+def apply_foreign(c, foreign):
+    """Copy rules-engine output onto a candidate row."""
+    # Build foreign country summary
+    countries = []
+    if foreign['dr01_country']:
+        countries.append(foreign['dr01_country'])
+    for ep in foreign['dr04_foreign_endpoints']:
+        if ep['country'] not in countries:
+            countries.append(ep['country'])
+
+    c['countries'] = ', '.join(countries)
+    c['source'] = foreign['source']
+    c['dr01_host'] = foreign['dr01_host']
+    c['dr04_endpoints'] = foreign['dr04_foreign_endpoints']
+    c['finding'] = foreign['finding_text']
+
+
+def refresh_candidates(candidates, reverify, recrawl, geo_db_dir):
+    """Replace stale scan evidence with fresh local checks and re-screen.
+
+    --reverify re-checks DR-01 hosts against the local GeoIP database;
+    --recrawl re-fetches homepages and rebuilds DR-04 third-party evidence.
+    Returns (candidates still showing foreign routing, findings cleared).
     """
-    result = {
-        'dr01_foreign': False, 'dr01_country': '', 'dr01_host': '',
-        'dr04_foreign_endpoints': [],
-        'finding_text': '', 'source': None,
-    }
+    from geo_verify import GeoDatabase, host_of, reverify_dr01
+    from dr04_recrawl import recrawl_dr04
 
-    sb = scan.get('sb1188_findings', [])
-
-    # Check DR-01 (primary domain)
-    dr01 = next((f for f in sb if f.get('id') == 'DR-01'), None)
-    if dr01 and dr01.get('status') == 'fail':
-        ev = dr01.get('evidence', {})
-        geo = ev.get('geo', '')
-        ip_host = str(ev.get('ip', '')).rstrip('.')
-        is_us = ev.get('isUS', True)
-
-        if not is_us and geo not in CDN_FALSE_POSITIVE_COUNTRIES:
-            result['dr01_foreign'] = True
-            result['dr01_country'] = COUNTRY_NAMES.get(geo, geo)
-            result['dr01_host'] = ip_host
-
-    # Check DR-04 (third-party endpoints)
-    dr04 = next((f for f in sb if f.get('id') == 'DR-04'), None)
-    if dr04 and dr04.get('status') == 'fail':
-        ev = dr04.get('evidence', {})
-        non_us = ev.get('non_us', [])
-        if isinstance(non_us, list):
-            for ep in non_us:
-                # Handle both dict and string formats
-                if isinstance(ep, dict):
-                    domain = ep.get('domain', 'unknown')
-                    country = ep.get('country', 'Foreign')
-                elif isinstance(ep, str):
-                    domain = ep
-                    country = 'Foreign'
-                else:
-                    continue
-                # Skip CDN infrastructure domains
-                is_cdn = False
-                for cdn in CDN_DOMAINS:
-                    if cdn in domain.lower():
-                        is_cdn = True
-                        break
-                if not is_cdn:
-                    country_name = COUNTRY_NAMES.get(country, country)
-                    result['dr04_foreign_endpoints'].append({
-                        'domain': domain,
-                        'country': country_name,
-                    })
-
-    # Build finding text and determine source
-    parts = []
-
-    if result['dr01_foreign']:
-        parts.append(
-            'Your website is hosted on a server geolocated to ' + result['dr01_country'] +
-            ', routing patient data outside the US.'
-        )
-        result['source'] = 'dr01'
-
-    if result['dr04_foreign_endpoints']:
-        ep_count = len(result['dr04_foreign_endpoints'])
-        countries = list(set(ep['country'] for ep in result['dr04_foreign_endpoints']))
-        country_str = ', '.join(countries[:3])
-        if ep_count > 3:
-            country_str += ' and others'
-        domains = [ep['domain'] for ep in result['dr04_foreign_endpoints'][:3]]
-        domain_str = ', '.join(domains)
-
-        parts.append(
-            'Your website loads ' + str(ep_count) + ' third-party resource' +
-            ('s' if ep_count > 1 else '') + ' (' + domain_str + ') that route data through ' +
-            country_str + '.'
-        )
-        if result['source'] == 'dr01':
-            result['source'] = 'both'
-        else:
-            result['source'] = 'dr04'
+    geo_db = GeoDatabase.from_dir(geo_db_dir)
+    fresh = {}  # npi -> [finding, ...]
+
+    if reverify:
+        dr01 = [c for c in candidates if c['source'] in ('dr01', 'both')]
+        by_host = reverify_dr01([host_of(c['url']) for c in dr01], geo_db)
+        for c in dr01:
+            finding = by_host.get(host_of(c['url']))
+            if finding:
+                fresh.setdefault(c['npi'], []).append(finding)
+
+    if recrawl:
+        by_npi = recrawl_dr04({c['npi']: c['url'] for c in candidates}, geo_db)
+        for npi, finding in by_npi.items():
+            fresh.setdefault(npi, []).append(finding)
+
+    geo_db.close()
+
+    cleared = 0
+    changed = [c for c in candidates if c['npi'] in fresh]
+    for c in changed:
+        before = {f['id']: f.get('status') for f in c['scan'].get('sb1188_findings', []) or []
+                  if isinstance(f, dict)}
+        for finding in fresh[c['npi']]:
+            c['scan'] = replace_finding(c['scan'], finding)
+            if before.get(finding['id']) == 'fail' and finding['status'] != 'fail':
+                cleared += 1
 
-    result['finding_text'] = ' '.join(parts)
-    return result
+    for c, foreign in zip(changed, screen_scans([c['scan'] for c in changed])):
+        apply_foreign(c, foreign)
+
+    return [c for c in candidates if c['source']], cleared
 
 
 # ── MAIN ──
 
 def main():
+    parser = argparse.ArgumentParser(description='Find campaign providers with foreign data routing')
+    parser.add_argument('--reverify', action='store_true',
+                        help='Re-check DR-01 hosts against a local GeoIP/ASN database before scraping')
+    parser.add_argument('--recrawl', action='store_true',
+                        help='Re-crawl candidate homepages and rebuild DR-04 third-party evidence')
+    parser.add_argument('--geo-db-dir', default=os.environ.get('GEOIP_DB_DIR', ''),
+                        help='Directory holding GeoLite2-Country/ASN .mmdb files (or GEOIP_DB_DIR)')
+    parser.add_argument('--campaign', default=CAMPAIGN_NAME,
+                        help='campaign_name for new outreach rows (default: ' + CAMPAIGN_NAME + ')')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Do not write campaign_outreach rows')
+    parser.add_argument('--sql', action='store_true',
+                        help='Also export the rows as campaign-expansion-v2.sql')
+    parser.add_argument('--changed-only', action='store_true',
+                        help='Only read registry rows rescanned since the last --changed-only run')
+    parser.add_argument('--reset-cursor', action='store_true',
+                        help='Ignore the saved cursor and start from the top of the registry')
+    parser.add_argument('--cursor-file', default=CURSOR_FILE,
+                        help='Where the registry cursor is kept (default: ' + CURSOR_FILE + ')')
+    args = parser.parse_args()
+
     print('=' * 55)
     print('KairoLogic Campaign Provider Finder v2')
     print('DR-01 (excl. Canada) + DR-04 third-party endpoints')
@@ -373,34 +473,43 @@ def main():
 
     # Step 1: Existing campaign NPIs
     print('Step 1: Fetching existing campaign records...')
-    existing = supabase_get('campaign_outreach', 'select=npi&limit=1000')
-    existing_npis = set(str(r['npi']) for r in existing)
+    existing_npis = fetch_outreach_npis()
     print('  ' + str(len(existing_npis)) + ' existing records to exclude')
     print()
 
     # Step 2: Query providers
+    cursor_state = {} if args.reset_cursor else load_cursor(args.cursor_file)
+    cursor_name = 'scan_cursor' if args.changed_only else 'risk_cursor'
+    after = cursor_state.get(cursor_name)
+    sweep_started = cursor_state.get('sweep_started_at') if after else None
+    sweep_started = sweep_started or datetime.now(timezone.utc).isoformat()
+
     print('Step 2: Finding providers (score < ' + str(MAX_SCORE) + ', real URLs)...')
+    if args.changed_only:
+        print('  Mode: rescanned since ' + (str(after[0]) if after else 'the beginning'))
+    elif after:
+        print('  Resuming after risk_score=' + str(after[0]) + ', npi=' + str(after[1]))
     candidates = []
     seen_npis = set()
-    offset = 0
     total_scanned = 0
-    dr01_count = 0
-    dr04_count = 0
-    both_count = 0
+    last_key = after
+    exhausted = False
 
     while len(candidates) < TARGET_COUNT * 3:
-        providers = supabase_get('registry',
-            'select=npi,name,city,url,risk_score,last_scan_result'
-            '&url=neq.__NOT_FOUND__&risk_score=lt.' + str(MAX_SCORE) + '&risk_score=gt.0'
-            '&order=risk_score.asc&offset=' + str(offset) + '&limit=' + str(PAGE_SIZE))
+        providers = registry_page(args.changed_only, last_key)
 
         if not providers:
+            exhausted = True
             break
         total_scanned += len(providers)
 
-        for p in providers:
+        # Screen the whole page through the rules engine in one pass
+        scans, screened = screen_registry(providers)
+
+        for p, scan, foreign in zip(providers, scans, screened):
             if len(candidates) >= TARGET_COUNT * 3:
                 break
+            last_key = row_key(p, args.changed_only)
 
             npi = str(p.get('npi', ''))
             url = p.get('url', '')
@@ -412,19 +521,8 @@ def main():
                 continue
             if not is_healthcare_entity(name):
                 continue
-
-            raw = p.get('last_scan_result')
-            if not raw:
+            if scan is None:
                 continue
-            scan = raw if isinstance(raw, dict) else {}
-            if isinstance(raw, str):
-                try:
-                    scan = json.loads(raw)
-                except:
-                    continue
-
-            # Parse foreign findings (DR-01 excl. Canada + DR-04)
-            foreign = parse_foreign_findings(scan)
 
             if not foreign['source']:
                 continue  # No foreign routing found
@@ -432,39 +530,39 @@ def main():
             score = scan.get('score', p.get('risk_score', 50))
             seen_npis.add(npi)
 
-            if foreign['source'] == 'dr01':
-                dr01_count += 1
-            elif foreign['source'] == 'dr04':
-                dr04_count += 1
-            else:
-                both_count += 1
-
-            # Build foreign country summary
-            countries = []
-            if foreign['dr01_country']:
-                countries.append(foreign['dr01_country'])
-            for ep in foreign['dr04_foreign_endpoints']:
-                if ep['country'] not in countries:
-                    countries.append(ep['country'])
-
-            candidates.append({
+            c = {
                 'npi': npi, 'name': name, 'city': p.get('city', ''),
+                'cursor': last_key,
                 'url': url, 'clean_url': clean_display_url(url),
                 'score': score,
-                'countries': ', '.join(countries),
-                'source': foreign['source'],
-                'dr01_host': foreign['dr01_host'],
-                'dr04_endpoints': foreign['dr04_foreign_endpoints'],
+                'scan': scan,
                 'email': None, 'email_source': '',
                 'code': gen_code(npi),
                 'report_url': 'https://kairologic.net/report/' + gen_code(npi),
-                'finding': foreign['finding_text'],
-            })
+            }
+            apply_foreign(c, foreign)
+            candidates.append(c)
 
-        offset += PAGE_SIZE
         print('  Scanned ' + str(total_scanned) + ' providers, ' + str(len(candidates)) + ' candidates...')
 
     print()
+
+    # Step 2b (optional): refresh DR-01 / DR-04 evidence locally before outreach
+    if (args.reverify or args.recrawl) and candidates:
+        print('Step 2b: Refreshing scan evidence (' +
+              ', '.join(n for n, on in [('DR-01 GeoIP', args.reverify), ('DR-04 re-crawl', args.recrawl)] if on) +
+              ')...')
+        t0 = time.time()
+        before = len(candidates)
+        candidates, cleared = refresh_candidates(candidates, args.reverify, args.recrawl, args.geo_db_dir)
+        print('  ' + str(cleared) + ' stale findings cleared, ' + str(before - len(candidates)) +
+              ' candidates dropped (' + str(round(time.time() - t0, 1)) + 's)')
+        print()
+
+    dr01_count = len([c for c in candidates if c['source'] == 'dr01'])
+    dr04_count = len([c for c in candidates if c['source'] == 'dr04'])
+    both_count = len([c for c in candidates if c['source'] == 'both'])
+
     print('  Total candidates: ' + str(len(candidates)))
     print('    DR-01 only (primary domain foreign): ' + str(dr01_count))
     print('    DR-04 only (third-party endpoints):  ' + str(dr04_count))
@@ -526,16 +624,32 @@ def main():
 
     print('  CSV: campaign-expansion-v2.csv (' + str(len(final)) + ' providers)')
 
-    # SQL
     email_rows = [c for c in final if c['email']]
-    if email_rows:
+    outreach_rows = [{
+        'npi': c['npi'], 'report_code': c['code'],
+        'email_sent_to': c['email'], 'campaign_name': args.campaign,
+    } for c in email_rows]
+
+    # Direct write
+    failed = 0
+    if not outreach_rows:
+        print('  campaign_outreach: no validated emails found')
+    elif args.dry_run:
+        print('  campaign_outreach: DRY RUN — would upsert ' + str(len(outreach_rows)) + ' records')
+    else:
+        written, failed = upsert_outreach(outreach_rows)
+        print('  campaign_outreach: ' + str(written) + ' records upserted, ' + str(failed) + ' batch errors')
+
+    # SQL (optional export)
+    if args.sql and outreach_rows:
         lines = []
-        for c in email_rows:
+        for r in outreach_rows:
             # Escape single quotes in email
-            safe_email = c['email'].replace("'", "''")
-            lines.append("  ('" + c['npi'] + "', '" + c['code'] + "', '" + safe_email + "', 'sb1188-foreign-v1')")
+            safe_email = r['email_sent_to'].replace("'", "''")
+            lines.append("  ('" + r['npi'] + "', '" + r['report_code'] + "', '" + safe_email +
+                         "', '" + r['campaign_name'].replace("'", "''") + "')")
 
-        sql_text = '-- Campaign Expansion v2: ' + str(len(email_rows)) + ' providers with validated emails\n'
+        sql_text = '-- Campaign Expansion v2: ' + str(len(outreach_rows)) + ' providers with validated emails\n'
         sql_text += '-- DR-01 (excl. Canada) + DR-04 third-party endpoints\n'
         sql_text += '-- Generated by find-providers-v2.py\n'
         sql_text += 'INSERT INTO campaign_outreach (npi, report_code, email_sent_to, campaign_name) VALUES\n'
@@ -544,9 +658,32 @@ def main():
 
         with open('campaign-expansion-v2.sql', 'w') as f:
             f.write(sql_text)
-        print('  SQL: campaign-expansion-v2.sql (' + str(len(email_rows)) + ' records)')
-    else:
-        print('  SQL: no validated emails found')
+        print('  SQL: campaign-expansion-v2.sql (' + str(len(outreach_rows)) + ' records)')
+
+    # Registry cursor: resume after the last candidate actually used. Rows
+    # between it and where collection stopped are re-read next run. A failed
+    # outreach batch (e.g. the npi,campaign_name unique index not applied yet)
+    # leaves the cursor where it was so those providers are retried.
+    if failed:
+        print('  Cursor: not advanced (' + str(failed) + ' outreach batch errors); '
+              'this run\'s candidates are re-read next run')
+    elif not args.dry_run:
+        if processed < len(candidates):
+            stop_key = candidates[processed - 1]['cursor'] if processed else after
+            exhausted = False
+        else:
+            stop_key = last_key
+        if exhausted and not args.changed_only:
+            cursor_state.pop('risk_cursor', None)
+            cursor_state.pop('sweep_started_at', None)
+            cursor_state.setdefault('scan_cursor', [sweep_started, ''])
+        else:
+            cursor_state[cursor_name] = stop_key
+            if not args.changed_only:
+                cursor_state['sweep_started_at'] = sweep_started
+        save_cursor(args.cursor_file, cursor_state)
+        print('  Cursor: ' + args.cursor_file + (' (sweep complete, next run starts at the top)'
+                                                 if exhausted and not args.changed_only else ''))
 
     # Summary
     print()
@@ -588,7 +725,10 @@ def main():
             print('    ' + src + ': ' + str(n))
 
     print()
-    print('Done! Review campaign-expansion-v2.csv, then run campaign-expansion-v2.sql in Supabase.')
+    if args.dry_run:
+        print('Done! Review campaign-expansion-v2.csv, then re-run without --dry-run to write campaign_outreach.')
+    else:
+        print('Done! Review campaign-expansion-v2.csv.')
 
 
 if __name__ == '__main__':
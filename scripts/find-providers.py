@@ -16,6 +16,11 @@ Requirements: pip install requests (if not already installed)
 
 import hmac, hashlib, json, re, time, csv, sys
 
+from foreign_routing import RULES, screen_registry
+
+# This finder only targets DR-01 (primary domain hosted abroad)
+DR01_RULES = [r for r in RULES if r['id'] == 'DR-01']
+
 # Try requests, fall back to urllib
 try:
     import requests
@@ -42,14 +47,6 @@ URL_BLOCKLIST = [
     'doximity.com','practo.com','mapquest.com','superpages.com',
 ]
 
-COUNTRY_NAMES = {
-    'GB':'Great Britain','IE':'Ireland','DE':'Germany','FR':'France',
-    'NL':'Netherlands','BE':'Belgium','DK':'Denmark','SE':'Sweden',
-    'NO':'Norway','FI':'Finland','CA':'Canada','AU':'Australia',
-    'SG':'Singapore','JP':'Japan','IN':'India','BR':'Brazil',
-    'HK':'Hong Kong','KR':'South Korea','IT':'Italy','ES':'Spain',
-}
-
 # ── HELPERS ──
 
 def supabase_get(table, query):
@@ -204,7 +201,9 @@ def main():
             break
         total_scanned += len(providers)
 
-        for p in providers:
+        scans, screened = screen_registry(providers, DR01_RULES)
+
+        for p, scan, foreign in zip(providers, scans, screened):
             if len(candidates) >= TARGET_COUNT * 3: break
             npi = str(p.get('npi',''))
             url = p.get('url','')
@@ -212,31 +211,19 @@ def main():
 
             if npi in existing_npis: continue
             if not is_good_url(url): continue
-
-            # Parse scan
-            raw = p.get('last_scan_result')
-            if not raw: continue
-            scan = raw if isinstance(raw, dict) else {}
-            if isinstance(raw, str):
-                try: scan = json.loads(raw)
-                except: continue
+            if scan is None: continue
 
             # Check DR-01
-            sb = scan.get('sb1188_findings', [])
-            dr01 = next((f for f in sb if f.get('id') == 'DR-01'), None)
-            if not dr01 or dr01.get('status') != 'fail': continue
-            ev = dr01.get('evidence', {})
-            if ev.get('isUS', True): continue
-
-            geo = ev.get('geo', '')
-            ip_host = str(ev.get('ip', '')).rstrip('.')
-            country = COUNTRY_NAMES.get(geo, geo)
+            if not foreign['dr01_foreign']: continue
+
+            country = foreign['dr01_country']
+            ip_host = foreign['dr01_host']
             score = scan.get('score', p.get('risk_score', 50))
 
             candidates.append({
                 'npi': npi, 'name': name, 'city': p.get('city',''),
                 'url': url, 'clean_url': clean_display_url(url),
-                'score': score, 'country': country, 'country_code': geo,
+                'score': score, 'country': country,
                 'host': ip_host, 'email': None, 'email_source': '',
                 'code': gen_code(npi),
                 'report_url': f'https://kairologic.net/report/{gen_code(npi)}',
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+foreign_routing.py — SB 1188 foreign-routing rules engine
+
+Shared by find-providers.py and find-providers-v2.py. Instead of walking one
+scan at a time, a batch of scans is loaded into a columnar FindingsFrame
+(one row per primary-host finding or per third-party endpoint) and every
+rule in RULES is evaluated against whole columns in a single pass.
+
+  - CDN exclusion is a suffix-set join: each unique host is expanded into its
+    label suffixes once and intersected with CDN_DOMAINS, instead of a
+    substring scan over every CDN domain for every endpoint.
+  - Rules are declarative. DR-01 (primary domain) and DR-04 (third-party
+    endpoints) ship here; further SB 1188 checks are added as RULES entries.
+
+Usage as a module:
+    from foreign_routing import parse_foreign_findings, screen_registry
+    results = screen_registry(registry_rows)
+
+Usage standalone (screen an exported registry dump, one JSON row per line):
+    python scripts/foreign_routing.py registry-export.jsonl
+"""
+
+import json
+import sys
+import time
+
+# CDN countries to skip for DR-01 (false positives from anycast)
+CDN_FALSE_POSITIVE_COUNTRIES = {'CA', 'US'}
+
+# Known CDN/infrastructure domains to ignore in DR-04
+CDN_DOMAINS = {
+    'cloudflare.com', 'cloudflare-dns.com', 'cloudflareinsights.com',
+    'fastly.net', 'fastlylb.net',
+    'akamai.net', 'akamaized.net', 'akamaitechnologies.com',
+    'amazonaws.com', 'cloudfront.net',
+    'azureedge.net', 'azure.com', 'msecnd.net',
+}
+
+COUNTRY_NAMES = {
+    'GB': 'Great Britain', 'IE': 'Ireland', 'DE': 'Germany', 'FR': 'France',
+    'NL': 'Netherlands', 'BE': 'Belgium', 'DK': 'Denmark', 'SE': 'Sweden',
+    'NO': 'Norway', 'FI': 'Finland', 'AU': 'Australia',
+    'SG': 'Singapore', 'JP': 'Japan', 'IN': 'India', 'BR': 'Brazil',
+    'HK': 'Hong Kong', 'KR': 'South Korea', 'IT': 'Italy', 'ES': 'Spain',
+    'LU': 'Luxembourg', 'CH': 'Switzerland', 'AT': 'Austria', 'PL': 'Poland',
+    'RO': 'Romania', 'BG': 'Bulgaria', 'CZ': 'Czech Republic', 'RU': 'Russia',
+    'CN': 'China', 'TW': 'Taiwan', 'PH': 'Philippines', 'TH': 'Thailand',
+    'ZA': 'South Africa', 'MX': 'Mexico', 'AR': 'Argentina', 'CL': 'Chile',
+    'CA': 'Canada',
+}
+
+# ── Rules ────────────────────────────────────────────────
+
+# Each rule selects failing rows for one finding id:
+#   match='primary'   — one row per scan (evidence.geo / evidence.ip / evidence.isUS)
+#   match='endpoints' — one row per evidence.non_us entry
+# `source` names the result keys ({source}_foreign, {source}_country, ...)
+# and `text` is the outreach sentence for a match.
+RULES = [
+    {
+        'id': 'DR-01',
+        'source': 'dr01',
+        'match': 'primary',
+        'exclude_geos': CDN_FALSE_POSITIVE_COUNTRIES,
+        'text': ('Your website is hosted on a server geolocated to {country}, '
+                 'routing patient data outside the US.'),
+    },
+    {
+        'id': 'DR-04',
+        'source': 'dr04',
+        'match': 'endpoints',
+        'exclude_cdn': True,
+        'text': ('Your website loads {count} third-party resource{plural} ({domains}) '
+                 'that route data through {countries}.'),
+    },
+]
+
+
+# ── Columnar frame ───────────────────────────────────────
+
+class FindingsFrame:
+    """Columnar view of SB 1188 findings across a batch of scans."""
+
+    COLUMNS = ('scan', 'finding_id', 'status', 'geo', 'is_us', 'host')
+
+    def __init__(self, n_scans=0):
+        self.n_scans = n_scans
+        for col in self.COLUMNS:
+            setattr(self, col, [])
+
+    def __len__(self):
+        return len(self.scan)
+
+    def _append(self, scan, finding_id, status, geo, is_us, host):
+        self.scan.append(scan)
+        self.finding_id.append(finding_id)
+        self.status.append(status)
+        self.geo.append(geo)
+        self.is_us.append(is_us)
+        self.host.append(host)
+
+    @classmethod
+    def from_scans(cls, scans, rules=RULES):
+        """Load parsed scan dicts (None for unparseable) into a frame.
+
+        Findings of an endpoint rule contribute one row per evidence.non_us
+        entry and nothing when non_us is missing; every other finding
+        contributes one primary-host row.
+        """
+        endpoint_ids = {r['id'] for r in rules if r['match'] == 'endpoints'}
+        frame = cls(len(scans))
+        for idx, scan in enumerate(scans):
+            if not scan:
+                continue
+            seen = set()
+            for f in scan.get('sb1188_findings', []) or []:
+                if not isinstance(f, dict):
+                    continue
+                fid = f.get('id')
+                # First finding per id wins, matching the old next(...) lookup
+                if fid in seen:
+                    continue
+                seen.add(fid)
+
+                status = f.get('status')
+                ev = f.get('evidence') or {}
+                if fid in endpoint_ids:
+                    non_us = ev.get('non_us')
+                    if not isinstance(non_us, list):
+                        continue
+                    for ep in non_us:
+                        # Handle both dict and string formats
+                        if isinstance(ep, dict):
+                            domain = ep.get('domain', 'unknown')
+                            country = ep.get('country', 'Foreign')
+                        elif isinstance(ep, str):
+                            domain = ep
+                            country = 'Foreign'
+                        else:
+                            continue
+                        frame._append(idx, fid, status, country, False, domain)
+                else:
+                    frame._append(idx, fid, status, ev.get('geo', ''),
+                                  ev.get('isUS', True), str(ev.get('ip', '')).rstrip('.'))
+        return frame
+
+
+def host_suffixes(host):
+    """'a.b.cloudfront.net' -> ['a.b.cloudfront.net', 'b.cloudfront.net', 'cloudfront.net', 'net']"""
+    labels = host.lower().strip('.').split('.')
+    return ['.'.join(labels[i:]) for i in range(len(labels))]
+
+
+def cdn_mask(hosts, cdn_domains=CDN_DOMAINS):
+    """Boolean column: host is (a subdomain of) a CDN domain.
+
+    Each distinct host is expanded once; the mask is then a lookup per row.
+    """
+    verdict = {}
+    for h in set(hosts):
+        verdict[h] = not cdn_domains.isdisjoint(host_suffixes(h))
+    return [verdict[h] for h in hosts]
+
+
+# ── Evaluation ───────────────────────────────────────────
+
+def _empty_result(rules):
+    result = {'finding_text': '', 'source': None, 'sources': []}
+    for rule in rules:
+        src = rule['source']
+        if rule['match'] == 'primary':
+            result.update({src + '_foreign': False, src + '_country': '', src + '_host': ''})
+        else:
+            result[src + '_foreign_endpoints'] = []
+    return result
+
+
+def evaluate(frame, rules=RULES):
+    """Evaluate rules over a frame. Returns one result dict per scan.
+
+    Result keys follow the rule sources, e.g. for the default rules:
+      - dr01_foreign / dr01_country / dr01_host
+      - dr04_foreign_endpoints: list of {domain, country}
+      - finding_text: str (for email)
+      - source: 'dr01' | 'dr04' | 'both' | None
+      - sources: every matched rule source, in rule order
+    """
+    results = [_empty_result(rules) for _ in range(frame.n_scans)]
+    if not len(frame):
+        return results
+
+    failing = [s == 'fail' for s in frame.status]
+    is_cdn = cdn_mask(frame.host) if any(r.get('exclude_cdn') for r in rules) else None
+
+    for rule in rules:
+        src = rule['source']
+        rid = rule['id']
+        exclude_geos = rule.get('exclude_geos') or ()
+        rows = [i for i, fid in enumerate(frame.finding_id) if fid == rid and failing[i]]
+
+        if rule['match'] == 'primary':
+            for i in rows:
+                if frame.is_us[i] or frame.geo[i] in exclude_geos:
+                    continue
+                res = results[frame.scan[i]]
+                res[src + '_foreign'] = True
+                res[src + '_country'] = COUNTRY_NAMES.get(frame.geo[i], frame.geo[i])
+                res[src + '_host'] = frame.host[i]
+        else:
+            for i in rows:
+                if is_cdn is not None and rule.get('exclude_cdn') and is_cdn[i]:
+                    continue
+                if frame.geo[i] in exclude_geos:
+                    continue
+                results[frame.scan[i]][src + '_foreign_endpoints'].append({
+                    'domain': frame.host[i],
+                    'country': COUNTRY_NAMES.get(frame.geo[i], frame.geo[i]),
+                })
+
+    for res in results:
+        _finish_result(res, rules)
+    return results
+
+
+def _finish_result(res, rules):
+    """Build finding text and source labels for one scan's matches."""
+    parts = []
+    for rule in rules:
+        src = rule['source']
+        if rule['match'] == 'primary':
+            if not res[src + '_foreign']:
+                continue
+            parts.append(rule['text'].format(country=res[src + '_country']))
+        else:
+            eps = res[src + '_foreign_endpoints']
+            if not eps:
+                continue
+            countries = list(dict.fromkeys(ep['country'] for ep in eps))
+            country_str = ', '.join(countries[:3])
+            if len(eps) > 3:
+                country_str += ' and others'
+            parts.append(rule['text'].format(
+                count=len(eps),
+                plural='s' if len(eps) > 1 else '',
+                domains=', '.join(ep['domain'] for ep in eps[:3]),
+                countries=country_str,
+            ))
+        res['sources'].append(src)
+
+    if len(res['sources']) == 1:
+        res['source'] = res['sources'][0]
+    elif res['sources']:
+        res['source'] = 'both'
+    res['finding_text'] = ' '.join(parts)
+
+
+# ── Entry points ─────────────────────────────────────────
+
+def load_scan(raw):
+    """Parse a registry last_scan_result (dict or JSON string). None if unusable."""
+    if not raw:
+        return None
+    if isinstance(raw, dict):
+        return raw
+    if isinstance(raw, str):
+        try:
+            scan = json.loads(raw)
+        except ValueError:
+            return None
+        return scan if isinstance(scan, dict) else None
+    return None
+
+
+def replace_finding(scan, finding):
+    """Return a copy of scan with the finding of the same id swapped for a fresh one."""
+    findings = [f for f in scan.get('sb1188_findings', []) or []
+                if not (isinstance(f, dict) and f.get('id') == finding['id'])]
+    return {**scan, 'sb1188_findings': [finding] + findings}
+
+
+def screen_scans(scans, rules=RULES):
+    """Evaluate rules over a list of parsed scans in one pass."""
+    return evaluate(FindingsFrame.from_scans(scans, rules), rules)
+
+
+def screen_registry(rows, rules=RULES):
+    """Screen registry rows (with last_scan_result). Returns (scans, results)."""
+    scans = [load_scan(r.get('last_scan_result')) for r in rows]
+    return scans, screen_scans(scans, rules)
+
+
+def parse_foreign_findings(scan, rules=RULES):
+    """Extract foreign routing info from a single scan result."""
+    return screen_scans([scan], rules)[0]
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/foreign_routing.py registry-export.jsonl")
+        sys.exit(1)
+
+    start = time.time()
+    rows = []
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rows.append(json.loads(line))
+    loaded = time.time()
+
+    scans, results = screen_registry(rows)
+    elapsed = time.time() - start
+
+    counts = {}
+    for res in results:
+        if res['source']:
+            counts[res['source']] = counts.get(res['source'], 0) + 1
+
+    print(f"Screened {len(rows):,} registry rows in {elapsed:.2f}s "
+          f"(load {loaded - start:.2f}s, rules {elapsed - (loaded - start):.2f}s)")
+    print(f"  Unparseable scans: {sum(1 for s in scans if s is None):,}")
+    for src in ['dr01', 'dr04', 'both']:
+        print(f"  {src:<5} {counts.get(src, 0):>8,}")
+
+
+if __name__ == '__main__':
+    main()
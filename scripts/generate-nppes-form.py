@@ -12,8 +12,30 @@ Usage as a module:
 
 Usage standalone:
     python generate_nppes_form.py
+    python generate-nppes-form.py input.json output.pdf      # one form (API route)
+
+Bulk mode (month-end batches):
+    python generate-nppes-form.py --jsonl forms.jsonl --out-dir forms/
+    python generate-nppes-form.py --pending --zip nppes-forms.zip [--workers 8]
+
+Bulk input is the API route's JSON payload, one per line, or every approved
+nppes_update workflow that is not yet resolved (--pending; needs SUPABASE_URL
+and SUPABASE_SERVICE_ROLE_KEY). Forms render on a pool of worker processes
+that import reportlab and build the paragraph styles once at startup, then
+stream into the output directory or ZIP as they finish.
+
+Forms written by the API route and bulk modes are shrunk with pdf_optimize.py
+(when pikepdf is installed); generate_nppes_form() returns the PDF as rendered.
 """
 
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from datetime import datetime
 from io import BytesIO
 from reportlab.lib.pagesizes import letter
@@ -26,6 +48,8 @@ from reportlab.platypus import (
 from reportlab.pdfgen import canvas as pdf_canvas
 from reportlab.lib import colors
 
+from pdf_optimize import optimize_pdf
+
 
 # KairoLogic brand color
 KAIRO_BLUE = HexColor('#1F4E79')
@@ -78,6 +102,43 @@ class NumberedCanvas(pdf_canvas.Canvas):
         self.drawString(width / 2 - footer_width / 2, 0.4 * inch, footer_text)
 
 
+_STYLES = None
+
+
+def get_styles() -> dict:
+    """Paragraph styles for the form, built once per process and reused."""
+    global _STYLES
+    if _STYLES is None:
+        styles = getSampleStyleSheet()
+        _STYLES = {
+            'title': ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=14,
+                textColor=KAIRO_BLUE,
+                spaceAfter=12,
+                fontName='Helvetica-Bold'
+            ),
+            'heading': ParagraphStyle(
+                'CustomHeading',
+                parent=styles['Heading2'],
+                fontSize=11,
+                textColor=KAIRO_BLUE,
+                spaceAfter=8,
+                spaceBefore=12,
+                fontName='Helvetica-Bold'
+            ),
+            'normal': ParagraphStyle(
+                'CustomNormal',
+                parent=styles['Normal'],
+                fontSize=10,
+                textColor=DARK_TEXT,
+                spaceAfter=6
+            ),
+        }
+    return _STYLES
+
+
 def generate_nppes_form(data: dict) -> bytes:
     """
     Generate a pre-filled NPPES update form as a PDF.
@@ -137,34 +198,9 @@ def generate_nppes_form(data: dict) -> bytes:
         title="NPPES Update Form"
     )
 
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor=KAIRO_BLUE,
-        spaceAfter=12,
-        fontName='Helvetica-Bold'
-    )
-
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=11,
-        textColor=KAIRO_BLUE,
-        spaceAfter=8,
-        spaceBefore=12,
-        fontName='Helvetica-Bold'
-    )
-
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=DARK_TEXT,
-        spaceAfter=6
-    )
+    styles = get_styles()
+    heading_style = styles['heading']
+    normal_style = styles['normal']
 
     # Build document content
     content = []
@@ -311,6 +347,223 @@ def generate_nppes_form(data: dict) -> bytes:
     return pdf_bytes
 
 
+def form_data_from_api(api_data: dict) -> dict:
+    """Map the API route's JSON payload to generate_nppes_form() input."""
+    return {
+        'practice_name': api_data.get('practice_name', ''),
+        'npi_number': api_data.get('npi', ''),
+        'provider_name': api_data.get('provider_name', ''),
+        'workflow_id': api_data.get('workflow_id', ''),
+        'changes': [
+            {
+                'field': c['field'],
+                'current_value': c['current_value'],
+                'corrected_value': c['corrected_value'],
+                'source': c.get('source', 'KairoLogic'),
+            }
+            for c in api_data.get('corrections', [])
+        ],
+    }
+
+
+def form_filename(api_data: dict) -> str:
+    """Download name used by the API route: NPPES_Update_<npi>_<workflow>.pdf"""
+    name = f"NPPES_Update_{api_data.get('npi', '')}_{api_data.get('workflow_id', '')}.pdf"
+    return name.replace('/', '_').replace('\\', '_')
+
+
+# ── Bulk mode ────────────────────────────────────────────
+
+BULK_WORKERS = os.cpu_count() or 4
+FETCH_PAGE = 1000
+
+
+def read_jsonl_payloads(path: str):
+    """Yield API-format payloads from a JSONL file ('-' for stdin)."""
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _supabase_get(path: str):
+    url = os.environ.get('SUPABASE_URL') or os.environ.get('NEXT_PUBLIC_SUPABASE_URL', '')
+    key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY', '')
+    if not url or not key:
+        print('[FATAL] Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY env vars')
+        sys.exit(1)
+    req = urllib.request.Request(f'{url}/rest/v1/{path}', headers={
+        'apikey': key,
+        'Authorization': f'Bearer {key}',
+    })
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        return json.loads(resp.read())
+
+
+def pending_workflow_payloads():
+    """Yield API-format payloads for approved nppes_update workflows still open.
+
+    Mirrors /api/workflows/[id]/generate-form: the NPPES value is the current
+    value, the approved value is the correction, and the practice name comes
+    from practice_websites (looked up once per page).
+    """
+    offset = 0
+    while True:
+        rows = _supabase_get(
+            'workflow_instances?select=id,provider_npi,provider_name,finding_details,approved_value,practice_id'
+            '&workflow_type=eq.nppes_update&approved_value=not.is.null'
+            '&status=not.in.(resolved,cancelled)'
+            f'&order=id&limit={FETCH_PAGE}&offset={offset}'
+        )
+        if not rows:
+            return
+        practice_ids = sorted({r['practice_id'] for r in rows if r.get('practice_id')})
+        practices = {}
+        if practice_ids:
+            for p in _supabase_get(f"practice_websites?select=id,name&id=in.({','.join(practice_ids)})"):
+                practices[p['id']] = p.get('name')
+
+        for r in rows:
+            details = r.get('finding_details') or {}
+            yield {
+                'workflow_id': r['id'],
+                'practice_name': practices.get(r.get('practice_id')) or 'Unknown Practice',
+                'provider_name': r.get('provider_name') or 'Unknown Provider',
+                'npi': r.get('provider_npi') or '',
+                'corrections': [{
+                    'field': details.get('field') or 'unknown',
+                    'current_value': details.get('nppes_value') or '',
+                    'corrected_value': r['approved_value'],
+                    'source': 'KairoLogic',
+                }],
+            }
+        if len(rows) < FETCH_PAGE:
+            return
+        offset += FETCH_PAGE
+
+
+def _warm_worker():
+    """Pool initializer: pay the reportlab setup and style build once per worker."""
+    get_styles()
+
+
+def _render_payload(api_data: dict):
+    """Render one payload in a worker. Returns (filename, pdf_bytes, error)."""
+    name = form_filename(api_data)
+    try:
+        return name, optimize_pdf(generate_nppes_form(form_data_from_api(api_data))), None
+    except Exception as e:
+        return name, None, f'{type(e).__name__}: {e}'
+
+
+def render_bulk(payloads, workers: int = BULK_WORKERS):
+    """Render payloads across a warm process pool.
+
+    Yields (filename, pdf_bytes, error) in completion order. At most
+    workers * 4 payloads are in flight, so input is read lazily and output
+    can be written as it arrives.
+    """
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+        pending = set()
+        for api_data in payloads:
+            pending.add(pool.submit(_render_payload, api_data))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        for fut in as_completed(pending):
+            yield fut.result()
+
+
+class DirectorySink:
+    """Writes each PDF into a directory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, name: str, pdf_bytes: bytes):
+        with open(os.path.join(self.path, name), 'wb') as f:
+            f.write(pdf_bytes)
+
+    def close(self):
+        pass
+
+
+class ZipSink:
+    """Streams PDFs into a ZIP archive ('-' writes to stdout).
+
+    PDFs are already compressed internally, so entries are stored.
+    """
+
+    def __init__(self, path: str):
+        self.stream = sys.stdout.buffer if path == '-' else open(path, 'wb')
+        self.zip = zipfile.ZipFile(self.stream, 'w', compression=zipfile.ZIP_STORED)
+        self.names = set()
+
+    def write(self, name: str, pdf_bytes: bytes):
+        # Duplicate workflow ids would otherwise make duplicate entries
+        base, n = name, 1
+        while name in self.names:
+            n += 1
+            name = base.replace('.pdf', f'_{n}.pdf')
+        self.names.add(name)
+        self.zip.writestr(name, pdf_bytes)
+
+    def close(self):
+        self.zip.close()
+        if self.stream is not sys.stdout.buffer:
+            self.stream.close()
+
+
+def bulk_main():
+    """Render many NPPES forms: python generate-nppes-form.py --jsonl forms.jsonl --zip forms.zip"""
+    parser = argparse.ArgumentParser(description='Bulk-render NPPES update forms')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--jsonl', help="API-format payloads, one per line ('-' for stdin)")
+    source.add_argument('--pending', action='store_true',
+                        help='Approved, unresolved nppes_update workflows from Supabase')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--out-dir', help='Write one PDF per form into this directory')
+    target.add_argument('--zip', help="Stream all PDFs into this ZIP ('-' for stdout)")
+    parser.add_argument('--workers', type=int, default=BULK_WORKERS, help='Render processes')
+    args = parser.parse_args()
+
+    # Progress goes to stderr so --zip - keeps stdout clean
+    log = sys.stderr
+    payloads = pending_workflow_payloads() if args.pending else read_jsonl_payloads(args.jsonl)
+    sink = ZipSink(args.zip) if args.zip else DirectorySink(args.out_dir)
+
+    start = time.time()
+    rendered = failed = total_bytes = 0
+    try:
+        for name, pdf_bytes, error in render_bulk(payloads, args.workers):
+            if error:
+                failed += 1
+                print(f'  [ERROR] {name}: {error}', file=log)
+                continue
+            sink.write(name, pdf_bytes)
+            rendered += 1
+            total_bytes += len(pdf_bytes)
+            if rendered % 500 == 0:
+                elapsed = time.time() - start
+                print(f'  Rendered {rendered:,} forms ({rendered / elapsed:.0f}/s)', file=log)
+    finally:
+        sink.close()
+
+    elapsed = time.time() - start
+    print(f'Rendered {rendered:,} forms ({total_bytes / 1e6:.1f} MB) in {elapsed:.1f}s '
+          f'with {args.workers} workers — {failed} failed', file=log)
+    if failed:
+        sys.exit(1)
+
+
 def main():
     """Generate a sample NPPES update form for demonstration."""
 
@@ -365,37 +618,19 @@ def main():
 
 
 if __name__ == '__main__':
-    import sys
-    import json
-
     # If called with input/output args from API route:
     #   python generate-nppes-form.py input.json output.pdf
-    if len(sys.argv) == 3:
+    if len(sys.argv) == 3 and not sys.argv[1].startswith('--'):
         input_path = sys.argv[1]
         output_path = sys.argv[2]
         with open(input_path, 'r') as f:
             api_data = json.load(f)
 
-        # Map API format to generator format
-        form_data = {
-            'practice_name': api_data.get('practice_name', ''),
-            'npi_number': api_data.get('npi', ''),
-            'provider_name': api_data.get('provider_name', ''),
-            'workflow_id': api_data.get('workflow_id', ''),
-            'changes': [
-                {
-                    'field': c['field'],
-                    'current_value': c['current_value'],
-                    'corrected_value': c['corrected_value'],
-                    'source': c.get('source', 'KairoLogic'),
-                }
-                for c in api_data.get('corrections', [])
-            ],
-        }
-
-        pdf_bytes = generate_nppes_form(form_data)
+        pdf_bytes = optimize_pdf(generate_nppes_form(form_data_from_api(api_data)))
         with open(output_path, 'wb') as f:
             f.write(pdf_bytes)
         print(f"Generated {output_path} ({len(pdf_bytes)} bytes)")
+    elif len(sys.argv) > 1:
+        bulk_main()
     else:
         main()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+geo_verify.py — Offline DR-01 re-verification
+
+Campaign candidates are picked from each provider's stored last_scan_result,
+which can be weeks old, and anycast CDN edges are only filtered by excluding
+'CA'/'US' geos. This module re-checks candidates locally before outreach:
+
+  1. Resolve candidate hosts concurrently with an async DNS resolver
+     (aiodns when installed, otherwise the event loop's getaddrinfo).
+  2. Look up country + ASN for every IP in local MaxMind-format (.mmdb)
+     databases, opened memory-mapped so lookups never touch the network.
+  3. Classify CDN edges by ASN for CDN-only networks (CDN_ASNS) and by
+     published prefix list for CDNs inside a general cloud (CloudFront,
+     Azure Front Door), instead of by country.
+
+Lookups are cached per IP and resolutions per host, so bulk re-checks of a
+few hundred candidates cost one DNS round per unique host.
+
+Databases (e.g. GeoLite2-Country.mmdb + GeoLite2-ASN.mmdb) and the cloud
+CDN prefix lists are read from --geo-db-dir or GEOIP_DB_DIR.
+
+Usage as a module:
+    from geo_verify import GeoDatabase, reverify_dr01
+    geo_db = GeoDatabase.from_dir('/opt/geoip')
+    verdicts = reverify_dr01(['example.com'], geo_db)
+
+Usage standalone (re-check a finder CSV without re-running the scanner):
+    python scripts/geo_verify.py campaign-expansion-v2.csv [--geo-db-dir DIR]
+
+Requires:
+  pip install maxminddb [aiodns]
+"""
+
+import argparse
+import asyncio
+import csv
+import glob
+import ipaddress
+import json
+import os
+import socket
+import sys
+import time
+from functools import lru_cache
+
+GEOIP_DB_DIR = os.environ.get('GEOIP_DB_DIR', '')
+COUNTRY_DB_NAMES = ['GeoLite2-Country.mmdb', 'GeoLite2-City.mmdb', 'dbip-country-lite.mmdb']
+ASN_DB_NAMES = ['GeoLite2-ASN.mmdb', 'dbip-asn-lite.mmdb']
+
+DNS_CONCURRENCY = 100
+DNS_TIMEOUT = 5  # seconds per host
+
+# ASNs that only run anycast CDN / shared-edge infrastructure. A foreign geo
+# on one of these is a CDN false positive, not foreign hosting.
+CDN_ASNS = {
+    13335: 'Cloudflare',
+    209242: 'Cloudflare',
+    54113: 'Fastly',
+    20940: 'Akamai',
+    16625: 'Akamai',
+    12222: 'Akamai',
+    21342: 'Akamai',
+    19551: 'Imperva',
+    15133: 'Edgio',
+    200325: 'Bunny CDN',
+    60068: 'CDN77',
+    30148: 'Sucuri',
+}
+
+# CDNs that share an ASN with their provider's general cloud hosting
+# (CloudFront on AWS 16509/14618, Front Door on Microsoft 8075) are matched
+# by the provider's published prefix list instead, so a site hosted in a
+# foreign AWS or Azure region is still reported as foreign. Drop the files
+# next to the .mmdb databases:
+#   ip-ranges.json              https://ip-ranges.amazonaws.com/ip-ranges.json
+#   ServiceTags_Public_*.json   Azure IP Ranges and Service Tags (Public Cloud)
+# Google publishes no CDN-only list (Cloud CDN serves from the customer's
+# load balancer addresses), so Google IPs are classified by geo like any host.
+AWS_RANGES_NAME = 'ip-ranges.json'
+AZURE_TAGS_PATTERN = 'ServiceTags_Public*.json'
+
+
+# ── Cloud CDN prefix lists ───────────────────────────────
+
+class CdnPrefixes:
+    """Published CDN address ranges, matched by longest-prefix set lookup."""
+
+    def __init__(self):
+        self._nets = {}  # (ip version, prefix length) -> {network int: cdn name}
+
+    def __len__(self):
+        return sum(len(nets) for nets in self._nets.values())
+
+    def add(self, prefix, name):
+        try:
+            net = ipaddress.ip_network(prefix, strict=False)
+        except ValueError:
+            return
+        key = (net.version, net.prefixlen)
+        self._nets.setdefault(key, {})[int(net.network_address)] = name
+
+    def match(self, ip):
+        """CDN name if ip lies in a published CDN prefix, else ''."""
+        try:
+            addr = ipaddress.ip_address(ip)
+        except ValueError:
+            return ''
+        bits = addr.max_prefixlen
+        value = int(addr)
+        for (version, length), nets in self._nets.items():
+            if version != addr.version:
+                continue
+            name = nets.get(value >> (bits - length) << (bits - length))
+            if name:
+                return name
+        return ''
+
+    @classmethod
+    def from_dir(cls, db_dir):
+        """Load the AWS CloudFront and Azure Front Door ranges found in db_dir."""
+        prefixes = cls()
+        aws_path = os.path.join(db_dir, AWS_RANGES_NAME)
+        if os.path.exists(aws_path):
+            with open(aws_path, 'r', encoding='utf-8') as f:
+                ranges = json.load(f)
+            for p in ranges.get('prefixes', []):
+                if p.get('service') == 'CLOUDFRONT':
+                    prefixes.add(p['ip_prefix'], 'Amazon CloudFront')
+            for p in ranges.get('ipv6_prefixes', []):
+                if p.get('service') == 'CLOUDFRONT':
+                    prefixes.add(p['ipv6_prefix'], 'Amazon CloudFront')
+        azure_paths = sorted(glob.glob(os.path.join(db_dir, AZURE_TAGS_PATTERN)))
+        if azure_paths:
+            with open(azure_paths[-1], 'r', encoding='utf-8') as f:
+                tags = json.load(f)
+            for tag in tags.get('values', []):
+                if tag.get('name') == 'AzureFrontDoor.Frontend':
+                    for prefix in tag.get('properties', {}).get('addressPrefixes', []):
+                        prefixes.add(prefix, 'Azure Front Door')
+        return prefixes
+
+
+# ── Local geo/ASN database ───────────────────────────────
+
+class GeoDatabase:
+    """Memory-mapped country + ASN lookups with a per-IP cache."""
+
+    def __init__(self, country_path, asn_path=None, cdn_prefixes=None):
+        try:
+            import maxminddb
+        except ImportError:
+            print('[FATAL] maxminddb not installed. Run: pip install maxminddb')
+            sys.exit(1)
+        self._country = maxminddb.open_database(country_path, maxminddb.MODE_MMAP)
+        self._asn = None
+        if asn_path and os.path.abspath(asn_path) != os.path.abspath(country_path):
+            self._asn = maxminddb.open_database(asn_path, maxminddb.MODE_MMAP)
+        self._cdn_prefixes = cdn_prefixes or CdnPrefixes()
+        # Bound the cache per instance, not per class
+        self.lookup = lru_cache(maxsize=200_000)(self._lookup)
+
+    @classmethod
+    def from_dir(cls, db_dir):
+        """Open the first known country and ASN databases (and any CDN prefix
+        lists) found in db_dir."""
+        if not db_dir or not os.path.isdir(db_dir):
+            print(f'[FATAL] GeoIP database directory not found: {db_dir or "(unset)"}')
+            print('  Pass --geo-db-dir or set GEOIP_DB_DIR')
+            sys.exit(1)
+        country = next((os.path.join(db_dir, n) for n in COUNTRY_DB_NAMES
+                        if os.path.exists(os.path.join(db_dir, n))), None)
+        asn = next((os.path.join(db_dir, n) for n in ASN_DB_NAMES
+                    if os.path.exists(os.path.join(db_dir, n))), None)
+        if not country:
+            print(f'[FATAL] No country database in {db_dir} (looked for {", ".join(COUNTRY_DB_NAMES)})')
+            sys.exit(1)
+        return cls(country, asn or country, CdnPrefixes.from_dir(db_dir))
+
+    def _lookup(self, ip):
+        """Return {'country', 'asn', 'org', 'cdn'} for an IP (empty values if unknown)."""
+        rec = self._country.get(ip) or {}
+        country = ((rec.get('country') or rec.get('registered_country') or {})
+                   .get('iso_code', ''))
+        asn_rec = (self._asn.get(ip) if self._asn else rec) or {}
+        asn = asn_rec.get('autonomous_system_number')
+        return {
+            'country': country,
+            'asn': asn,
+            'org': asn_rec.get('autonomous_system_organization', ''),
+            'cdn': CDN_ASNS.get(asn) or self._cdn_prefixes.match(ip),
+        }
+
+    def close(self):
+        self._country.close()
+        if self._asn:
+            self._asn.close()
+
+
+# ── Async DNS ────────────────────────────────────────────
+
+async def _resolve_all(hosts, concurrency, timeout):
+    try:
+        import aiodns
+        resolver = aiodns.DNSResolver(timeout=timeout)
+    except ImportError:
+        resolver = None
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def resolve(host):
+        async with sem:
+            try:
+                if resolver is not None:
+                    res = await resolver.gethostbyname(host, socket.AF_INET)
+                    ips = list(res.addresses)
+                else:
+                    infos = await asyncio.wait_for(
+                        loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM),
+                        timeout)
+                    ips = [info[4][0] for info in infos]
+            except Exception:
+                ips = []
+        return host, list(dict.fromkeys(ips))
+
+    pairs = await asyncio.gather(*(resolve(h) for h in hosts))
+    return dict(pairs)
+
+
+def resolve_hosts(hosts, concurrency=DNS_CONCURRENCY, timeout=DNS_TIMEOUT):
+    """Resolve unique hosts concurrently. Returns {host: [ipv4, ...]}."""
+    unique = list(dict.fromkeys(h.lower().rstrip('.') for h in hosts if h))
+    if not unique:
+        return {}
+    return asyncio.run(_resolve_all(unique, concurrency, timeout))
+
+
+# ── Classification ───────────────────────────────────────
+
+def classify_ips(ips, geo_db):
+    """Classify a host's IPs.
+
+    Returns {'verdict', 'country', 'asn', 'org', 'ips'} where verdict is:
+      'us'         — at least one IP is in the US
+      'cdn'        — every foreign IP is a CDN edge (CDN ASN or published CDN prefix)
+      'foreign'    — resolves only to non-US, non-CDN networks
+      'unresolved' — DNS failed or no IP could be geolocated
+    """
+    result = {'verdict': 'unresolved', 'country': '', 'asn': None, 'org': '', 'ips': ips}
+    looked_up = [(ip, geo_db.lookup(ip)) for ip in ips]
+    looked_up = [(ip, rec) for ip, rec in looked_up if rec['country']]
+    if not looked_up:
+        return result
+
+    if any(rec['country'] == 'US' for _, rec in looked_up):
+        us = next(rec for _, rec in looked_up if rec['country'] == 'US')
+        result.update(verdict='us', country='US', asn=us['asn'], org=us['org'])
+        return result
+
+    first = looked_up[0][1]
+    if all(rec['cdn'] for _, rec in looked_up):
+        result.update(verdict='cdn', country=first['country'], asn=first['asn'],
+                      org=first['cdn'])
+        return result
+
+    foreign = next(rec for _, rec in looked_up if not rec['cdn'])
+    result.update(verdict='foreign', country=foreign['country'], asn=foreign['asn'],
+                  org=foreign['org'])
+    return result
+
+
+def classify_hosts(hosts, geo_db, resolved=None):
+    """Resolve (unless already resolved) and classify hosts. Returns {host: verdict dict}."""
+    resolved = resolved if resolved is not None else resolve_hosts(hosts)
+    return {h: classify_ips(ips, geo_db) for h, ips in resolved.items()}
+
+
+def dr01_finding(host, verdict):
+    """Build a fresh DR-01 finding in the shape parse_foreign_findings expects."""
+    is_foreign = verdict['verdict'] == 'foreign'
+    return {
+        'id': 'DR-01',
+        'status': 'fail' if is_foreign else ('warn' if verdict['verdict'] == 'unresolved' else 'pass'),
+        'evidence': {
+            'ip': verdict['ips'][0] if verdict['ips'] else host,
+            'geo': verdict['country'],
+            'isUS': not is_foreign,
+            'asn': verdict['asn'],
+            'org': verdict['org'],
+            'cdn': verdict['verdict'] == 'cdn',
+            'reverified': True,
+        },
+    }
+
+
+def reverify_dr01(hosts, geo_db):
+    """Re-check DR-01 for a list of primary hosts. Returns {host: DR-01 finding}."""
+    verdicts = classify_hosts(hosts, geo_db)
+    return {h: dr01_finding(h, v) for h, v in verdicts.items()}
+
+
+# ── CLI ──────────────────────────────────────────────────
+
+def host_of(url):
+    from urllib.parse import urlparse
+    if '://' not in url:
+        url = 'https://' + url
+    h = urlparse(url).hostname or ''
+    return h.lower().rstrip('.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-verify DR-01 for finder candidates against a local GeoIP database')
+    parser.add_argument('csv_path', help='Finder CSV (needs a URL column)')
+    parser.add_argument('--geo-db-dir', default=GEOIP_DB_DIR, help='Directory holding the .mmdb files')
+    parser.add_argument('--output', help='Write annotated CSV here (default: <input>.verified.csv)')
+    args = parser.parse_args()
+
+    with open(args.csv_path, 'r', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    if not rows or 'URL' not in rows[0]:
+        print('[FATAL] CSV has no URL column')
+        sys.exit(1)
+
+    geo_db = GeoDatabase.from_dir(args.geo_db_dir)
+    hosts = [host_of(r['URL']) for r in rows]
+
+    start = time.time()
+    resolved = resolve_hosts(hosts)
+    resolved_at = time.time()
+    verdicts = classify_hosts(hosts, geo_db, resolved)
+    done = time.time()
+
+    counts = {}
+    for r, h in zip(rows, hosts):
+        v = verdicts.get(h) or {'verdict': 'unresolved', 'country': '', 'asn': None, 'org': ''}
+        counts[v['verdict']] = counts.get(v['verdict'], 0) + 1
+        r['DR01 Verdict'] = v['verdict']
+        r['DR01 Country'] = v['country']
+        r['DR01 ASN'] = v['asn'] or ''
+        r['DR01 Org'] = v['org']
+
+    output = args.output or os.path.splitext(args.csv_path)[0] + '.verified.csv'
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        w.writeheader()
+        w.writerows(rows)
+    geo_db.close()
+
+    print(f'Re-verified {len(set(hosts)):,} hosts '
+          f'(DNS {resolved_at - start:.1f}s, lookups {done - resolved_at:.2f}s)')
+    for verdict in ['foreign', 'cdn', 'us', 'unresolved']:
+        print(f'  {verdict:<11} {counts.get(verdict, 0):>6,}')
+    print(f'  Written: {output}')
+
+
+if __name__ == '__main__':
+    main()
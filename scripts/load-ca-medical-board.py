@@ -10,9 +10,23 @@ Source: Medical Board of California (MBC) public data
   - 13 disciplinary tables (~20K records)
   - Free, weekly refresh from MBC website
 
+The .accdb is read through accdb_reader: mdbtools on Linux/macOS (CI),
+pyodbc + the Access ODBC driver on Windows. Tables stream as generators.
+
+Loads are deltas: every built record is fingerprinted (minus the sync
+timestamps) into a snapshot (roster_diff.py), and only new or changed
+licenses are upserted. Status changes and newly disciplined licensees are
+reported and written to ca-mb-status-events-<date>.jsonl. --full upserts
+every license regardless. --limit reads a partial roster, so like --dry-run
+it leaves the snapshot untouched.
+
 Usage:
-  python scripts/load-ca-medical-board.py [--dry-run] [--limit 1000]
-  python scripts/load-ca-medical-board.py --db-path "C:\\path\\to\\file.accdb"
+  python scripts/load-ca-medical-board.py --db-path MBC.accdb [--dry-run] [--limit 1000]
+  CA_MB_ACCDB_PATH=MBC.accdb python scripts/load-ca-medical-board.py [--backend mdbtools]
+  python scripts/load-ca-medical-board.py --db-path MBC.accdb [--full] [--snapshot path] [--events path]
+
+Requires:
+  apt-get install mdbtools   (or, on Windows: pip install pyodbc)
 """
 
 import os
@@ -20,21 +34,32 @@ import sys
 import json
 import time
 import argparse
+import queue
+import threading
 import urllib.request
 import urllib.error
 from datetime import datetime, date
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from accdb_reader import AccessReadError, BACKENDS, open_access_db
+from roster_diff import (diff_snapshot, print_diff, read_snapshot, record_fingerprint, snapshot_entry,
+                         write_events, write_snapshot)
 
 # ── Config ──────────────────────────────────────────────
 
 SUPABASE_URL = os.environ.get('SUPABASE_URL') or os.environ.get('NEXT_PUBLIC_SUPABASE_URL', '')
 SUPABASE_KEY = os.environ.get('SUPABASE_SERVICE_ROLE_KEY', '')
 
-DEFAULT_DB_PATH = r'C:\Users\ravic\Claude-project\MBCPhysicianAndSurgeonInformation-PUBLIC.accdb'
+DEFAULT_DB_PATH = os.environ.get('CA_MB_ACCDB_PATH', '')
+SNAPSHOT_FILE = '.ca-mb-roster-snapshot.tsv.gz'
 
 BATCH_SIZE = 500
-RETRY_DELAY = 2  # seconds between retries
-MAX_RETRIES = 3
+UPLOAD_WORKERS = 8        # concurrent upsert requests (upper bound for the throttle)
+LATENCY_TARGET = 3.0      # seconds; slower responses shrink the in-flight limit
+REQUEST_TIMEOUT = 60
+RETRY_DELAY = 2  # base backoff in seconds (doubles per attempt)
+MAX_RETRIES = 4
 
 # All disciplinary tables to scan
 DISCIPLINARY_TABLES = [
@@ -54,6 +79,15 @@ DISCIPLINARY_TABLES = [
     'VoluntaryLimitation',
 ]
 
+# Only these columns are read from the disciplinary tables (missing → None)
+DISC_DETAIL_FIELDS = ['Description', 'DescriptionOfAction', 'ProbationSummary',
+                      'CaseNumber', 'Court', 'Docket', 'Sentence',
+                      'HealthCareFacility', 'JudgmentAmount', 'SettlementHistory']
+DISC_DATE_FIELDS = ['EffectiveDate', 'EffectiveDateOfAction', 'DateOfAction']
+DISC_COLUMNS = ['LicenseID'] + DISC_DETAIL_FIELDS + DISC_DATE_FIELDS
+DISC_WORKERS = 7          # disciplinary tables read concurrently
+MAX_DISC_ACTIONS = 20     # actions kept per license for disciplinary_details
+
 # ── Status code mapping (populated from REF_PrimaryStatusCode) ──
 # Fallback if REF table can't be read
 STATUS_FALLBACK = {
@@ -72,35 +106,154 @@ STATUS_FALLBACK = {
 }
 
 
-def supabase_request(path, method='GET', body=None, retry=0):
-    """Make a request to Supabase REST API with retry logic."""
-    url = f"{SUPABASE_URL}/rest/v1/{path}"
+def post_batch(rows):
+    """POST one upsert batch. Returns (status, retry_after_seconds, error_text).
+
+    status is None for network errors. Never sleeps or retries itself;
+    the upload pipeline decides what to do with a failure.
+    """
+    url = f"{SUPABASE_URL}/rest/v1/provider_licenses?on_conflict=license_number,state"
     headers = {
         'apikey': SUPABASE_KEY,
         'Authorization': f'Bearer {SUPABASE_KEY}',
         'Content-Type': 'application/json',
-        'Prefer': 'resolution=merge-duplicates,return=minimal' if method == 'POST' else '',
+        'Prefer': 'resolution=merge-duplicates,return=minimal',
     }
-
-    data = json.dumps(body).encode('utf-8') if body else None
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    data = json.dumps(rows, default=str).encode('utf-8')
+    req = urllib.request.Request(url, data=data, headers=headers, method='POST')
 
     try:
-        with urllib.request.urlopen(req) as resp:
-            if resp.status in (200, 201):
-                ct = resp.getheader('content-type') or ''
-                if 'json' in ct:
-                    return json.loads(resp.read())
-            return None
+        with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
+            return resp.status, None, ''
     except urllib.error.HTTPError as e:
-        status = e.code
-        err_body = e.read().decode('utf-8', errors='replace')[:200]
-        if status in (502, 503, 504, 429) and retry < MAX_RETRIES:
-            delay = RETRY_DELAY * (retry + 1)
-            print(f"    Retry {retry + 1}/{MAX_RETRIES} after {status} (waiting {delay}s)...")
-            time.sleep(delay)
-            return supabase_request(path, method, body, retry + 1)
-        raise Exception(f"Supabase {method} {path}: {status} {err_body}")
+        retry_after = e.headers.get('Retry-After') if e.headers else None
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        return e.code, retry_after, e.read().decode('utf-8', errors='replace')[:200]
+    except (urllib.error.URLError, OSError) as e:
+        return None, None, str(e)[:200]
+
+
+class AdaptiveThrottle:
+    """AIMD limit on upload requests in flight.
+
+    A 429/503 halves the limit and pauses new requests for Retry-After (or
+    RETRY_DELAY); a response slower than LATENCY_TARGET drops it by one; a
+    fast one grows it by ~one per round trip, up to the worker count.
+    """
+
+    def __init__(self, max_limit, latency_target=LATENCY_TARGET):
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.resume_at = 0.0
+        self.throttled = 0
+        self.cond = threading.Condition()
+
+    def acquire(self):
+        with self.cond:
+            while True:
+                pause = self.resume_at - time.monotonic()
+                if pause > 0:
+                    self.cond.wait(pause)
+                elif self.in_flight >= int(self.limit):
+                    self.cond.wait()
+                else:
+                    break
+            self.in_flight += 1
+
+    def release(self, latency, throttled=False, retry_after=None):
+        with self.cond:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self.limit = max(1.0, self.limit / 2)
+                self.resume_at = max(self.resume_at, time.monotonic() + (retry_after or RETRY_DELAY))
+            elif latency > self.latency_target:
+                self.limit = max(1.0, self.limit - 1)
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self.cond.notify_all()
+
+
+def upload_batches(batches, dry_run, workers=UPLOAD_WORKERS):
+    """Upsert batches through a producer/consumer pipeline.
+
+    The caller's generator (record building + dedup) fills a bounded queue
+    that `workers` upload threads drain under an AdaptiveThrottle. Retryable
+    failures (429, 5xx, network) are re-queued from a timer thread after an
+    exponential backoff, so neither the producer nor the other workers wait
+    on them. Returns (rows upserted, failed batches, throttle).
+    """
+    throttle = AdaptiveThrottle(workers)
+    if dry_run:
+        return sum(len(b) for b in batches), 0, throttle
+
+    q = queue.Queue(maxsize=workers * 4)
+    lock = threading.Lock()
+    progress = {'inserted': 0, 'failed': 0, 'retries': 0}
+    start_time = time.time()
+
+    def requeue(item):
+        q.put(item)
+        q.task_done()  # the failed attempt this replaces
+
+    def uploader():
+        while True:
+            item = q.get()
+            if item is None:
+                q.task_done()
+                return
+            attempt, batch = item
+
+            throttle.acquire()
+            sent = time.monotonic()
+            status, retry_after, err = post_batch(batch)
+            latency = time.monotonic() - sent
+            throttled = status in (429, 503)
+            throttle.release(latency, throttled, retry_after)
+
+            if status is not None and status < 300:
+                with lock:
+                    before = progress['inserted']
+                    progress['inserted'] += len(batch)
+                    if progress['inserted'] // 5000 > before // 5000:
+                        elapsed = time.time() - start_time
+                        rate = progress['inserted'] / elapsed if elapsed > 0 else 0
+                        print(f"  Inserted: {progress['inserted']:,}  ({rate:.0f}/s, "
+                              f"{int(throttle.limit)} in flight)")
+                q.task_done()
+            elif (status is None or status == 429 or status >= 500) and attempt < MAX_RETRIES:
+                delay = retry_after or RETRY_DELAY * (2 ** attempt)
+                with lock:
+                    progress['retries'] += 1
+                timer = threading.Timer(delay, requeue, ((attempt + 1, batch),))
+                timer.daemon = True
+                timer.start()
+            else:
+                with lock:
+                    progress['failed'] += 1
+                    print(f"  Error on batch ({len(batch)} rows, attempt {attempt + 1}): "
+                          f"{status or 'network'} {err}")
+                q.task_done()
+
+    threads = [threading.Thread(target=uploader, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for batch in batches:
+        q.put((0, batch))
+    q.join()  # includes retries still waiting on their timers
+    for _ in threads:
+        q.put(None)
+    for t in threads:
+        t.join()
+
+    if progress['retries'] or throttle.throttled:
+        print(f"  Retried {progress['retries']} batches ({throttle.throttled} throttled responses)")
+    return progress['inserted'], progress['failed'], throttle
 
 
 def safe_date(val):
@@ -122,58 +275,93 @@ def safe_str(val, max_len=500):
     return s[:max_len] if s else None
 
 
-def load_status_codes(cursor):
+def load_status_codes(db):
     """Return short status labels keyed by PrimaryStatusCode."""
     # Use authoritative short labels — REF table has long descriptions we don't need
     print(f"  Using {len(STATUS_FALLBACK)} status code mappings")
     return dict(STATUS_FALLBACK)
 
 
-def load_disciplinary_records(cursor):
-    """Load all disciplinary tables and aggregate by LicenseID."""
-    disc_by_license = defaultdict(list)
+class DisciplinaryAggregate:
+    """Compact per-LicenseID roll-up: action count, types, first few actions."""
+
+    __slots__ = ('count', 'types', 'actions')
+
+    def __init__(self):
+        self.count = 0
+        self.types = {}  # ordered set
+        self.actions = []
+
+    def add(self, table, count, actions):
+        self.count += count
+        self.types[table] = None
+        room = MAX_DISC_ACTIONS - len(self.actions)
+        if room > 0:
+            self.actions.extend(actions[:room])
+
+
+def fold_disciplinary_table(db, table):
+    """Stream one table's projected columns into {LicenseID: [count, first actions]}."""
+    cols, rows = db.read_table(table, DISC_COLUMNS)
+    detail_idx = [(key, cols.index(key)) for key in DISC_DETAIL_FIELDS]
+    date_idx = [cols.index(key) for key in DISC_DATE_FIELDS]
+    partial = {}
+
+    for row in rows:
+        license_id = row[0]
+        if not license_id:
+            continue
+
+        acc = partial.get(license_id)
+        if acc is None:
+            acc = partial[license_id] = [0, []]
+        acc[0] += 1
+        if len(acc[1]) >= MAX_DISC_ACTIONS:
+            continue
+
+        # Build summary entry
+        entry = {'type': table}
+        for key, i in detail_idx:
+            if row[i]:
+                entry[key] = safe_str(row[i], 300)
+        for i in date_idx:
+            if row[i]:
+                entry['effective_date'] = safe_date(row[i])
+                break
+        acc[1].append(entry)
+
+    return partial
+
+
+def load_disciplinary_records(db, workers=DISC_WORKERS):
+    """Read the disciplinary tables concurrently and aggregate by LicenseID.
+
+    Each table streams only DISC_COLUMNS on its own reader connection and is
+    folded into a per-table partial; partials are merged in DISCIPLINARY_TABLES
+    order so each license keeps the same first actions as a serial read.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(table, pool.submit(fold_disciplinary_table, db, table))
+                   for table in DISCIPLINARY_TABLES]
+
+    disc_by_license = {}
     total = 0
-
-    for table in DISCIPLINARY_TABLES:
+    for table, future in futures:
         try:
-            cursor.execute(f'SELECT * FROM [{table}]')
-            cols = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            count = 0
-
-            for row in rows:
-                row_dict = dict(zip(cols, row))
-                license_id = row_dict.get('LicenseID')
-                if not license_id:
-                    continue
-
-                # Build summary entry
-                entry = {'type': table}
-
-                # Extract common fields
-                for key in ['Description', 'DescriptionOfAction', 'ProbationSummary',
-                            'CaseNumber', 'Court', 'Docket', 'Sentence',
-                            'HealthCareFacility', 'JudgmentAmount', 'SettlementHistory']:
-                    val = row_dict.get(key)
-                    if val:
-                        entry[key] = safe_str(val, 300)
-
-                # Extract date fields
-                for key in ['EffectiveDate', 'EffectiveDateOfAction', 'DateOfAction']:
-                    val = row_dict.get(key)
-                    if val:
-                        entry['effective_date'] = safe_date(val)
-                        break
-
-                disc_by_license[license_id].append(entry)
-                count += 1
-
-            total += count
-            if count > 0:
-                print(f"    {table}: {count:,} records")
-
+            partial = future.result()
         except Exception as e:
             print(f"    Warning: Could not read {table}: {e}")
+            continue
+        count = 0
+        for license_id, (n, actions) in partial.items():
+            agg = disc_by_license.get(license_id)
+            if agg is None:
+                agg = disc_by_license[license_id] = DisciplinaryAggregate()
+            agg.add(table, n, actions)
+            count += n
+        total += count
+        if count > 0:
+            print(f"    {table}: {count:,} records")
 
     unique_licenses = len(disc_by_license)
     print(f"  Total: {total:,} disciplinary records across {unique_licenses:,} unique licenses")
@@ -200,22 +388,22 @@ def build_provider_license(row_dict, status_map, disc_by_license):
     license_status = status_map.get(raw_status, raw_status) if raw_status else None
 
     # Disciplinary data
-    disc_records = disc_by_license.get(license_id, [])
-    has_disciplinary = len(disc_records) > 0
+    disc = disc_by_license.get(license_id)
+    has_disciplinary = disc is not None
 
     # Build disciplinary_details JSON (truncate to fit text column)
     disc_details = None
     if has_disciplinary:
         summary = {
-            'total_actions': len(disc_records),
-            'types': list(set(d['type'] for d in disc_records)),
-            'actions': disc_records[:20],  # cap at 20 entries to avoid column overflow
+            'total_actions': disc.count,
+            'types': list(disc.types),
+            'actions': disc.actions,  # capped at MAX_DISC_ACTIONS to avoid column overflow
         }
         disc_details = json.dumps(summary, default=str)
         # Truncate if needed (Supabase text columns have practical limits)
         if len(disc_details) > 10000:
-            summary['actions'] = disc_records[:5]
-            summary['note'] = f'Truncated: {len(disc_records)} total actions'
+            summary['actions'] = disc.actions[:5]
+            summary['note'] = f'Truncated: {disc.count} total actions'
             disc_details = json.dumps(summary, default=str)
 
     return {
@@ -244,9 +432,15 @@ def build_provider_license(row_dict, status_map, disc_by_license):
 
 def main():
     parser = argparse.ArgumentParser(description='Load CA Medical Board .accdb into provider_licenses')
-    parser.add_argument('--db-path', default=DEFAULT_DB_PATH, help='Path to .accdb file')
+    parser.add_argument('--db-path', default=DEFAULT_DB_PATH, help='Path to .accdb file (default: $CA_MB_ACCDB_PATH)')
+    parser.add_argument('--backend', choices=['auto', *BACKENDS], default='auto',
+                        help='Access reader: mdbtools (Linux/macOS) or odbc (Windows)')
     parser.add_argument('--dry-run', action='store_true', help='Preview without inserting')
     parser.add_argument('--limit', type=int, default=0, help='Limit rows (0=all)')
+    parser.add_argument('--workers', type=int, default=UPLOAD_WORKERS, help='Max concurrent upload requests')
+    parser.add_argument('--full', action='store_true', help='Upsert every license, not just new/changed ones')
+    parser.add_argument('--snapshot', default=SNAPSHOT_FILE, help='Fingerprint snapshot from the previous load')
+    parser.add_argument('--events', help='Write status/disciplinary events here (JSONL)')
     args = parser.parse_args()
 
     print('═' * 55)
@@ -255,137 +449,132 @@ def main():
     print(f'  Database:  {args.db_path}')
     print(f'  Dry run:   {args.dry_run}')
     print(f'  Limit:     {args.limit or "ALL"}')
+    print(f'  Mode:      {"full" if args.full else "delta"}')
     print()
 
     if not SUPABASE_URL or not SUPABASE_KEY:
         print('[FATAL] Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY env vars')
         sys.exit(1)
 
-    # ── Connect to Access DB ──
-    try:
-        import pyodbc
-    except ImportError:
-        print('[FATAL] pyodbc not installed. Run: pip install pyodbc')
+    # ── Open Access DB ──
+    if not args.db_path or not os.path.exists(args.db_path):
+        print(f'[FATAL] Database not found: {args.db_path or "(unset)"}')
+        print('  Pass --db-path or set CA_MB_ACCDB_PATH')
         sys.exit(1)
-
-    conn_str = f'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={args.db_path};'
     try:
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-        print('[1/4] Connected to Access database')
-    except Exception as e:
+        db = open_access_db(args.db_path, args.backend)
+        print(f'[1/4] Opened Access database ({db.backend})')
+    except AccessReadError as e:
         print(f'[FATAL] Cannot open database: {e}')
+        print('  Linux/macOS: apt-get install mdbtools | brew install mdbtools')
+        print('  Windows:     pip install pyodbc (+ Access Database Engine)')
         sys.exit(1)
 
     # ── Step 1: Load status code reference ──
     print('\n[2/4] Loading reference data...')
-    status_map = load_status_codes(cursor)
+    status_map = load_status_codes(db)
 
     # ── Step 2: Load all disciplinary records ──
     print('\n[3/4] Loading disciplinary records...')
-    disc_by_license = load_disciplinary_records(cursor)
+    disc_by_license = load_disciplinary_records(db)
 
-    # ── Step 3: Process License table and upsert ──
+    # ── Step 3: Fingerprint License table, diff, upsert changes ──
     print(f'\n[4/4] Processing License table...')
-    query = 'SELECT * FROM License'
-    if args.limit > 0:
-        query = f'SELECT TOP {args.limit} * FROM License'
 
-    cursor.execute(query)
-    cols = [desc[0] for desc in cursor.description]
+    def license_records():
+        cols, license_rows = db.read_table('License', limit=args.limit)
+        for row in license_rows:
+            record = build_provider_license(dict(zip(cols, row)), status_map, disc_by_license)
+            if record['license_number'] is not None:
+                yield record
 
-    inserted = 0
-    errors = 0
-    batch = []
     start_time = time.time()
 
     # Status distribution tracking
     status_counts = defaultdict(int)
     disc_count = 0
 
-    while True:
-        rows = cursor.fetchmany(1000)
-        if not rows:
-            break
-
-        for row in rows:
-            row_dict = dict(zip(cols, row))
-            record = build_provider_license(row_dict, status_map, disc_by_license)
-
-            if record['license_number'] is None:
-                continue
-
-            # Track stats
+    # Pass 1: fingerprint every license (last occurrence wins)
+    entries = {}
+    try:
+        for record in license_records():
             status_counts[record['license_status'] or 'Unknown'] += 1
             if record['has_disciplinary_action']:
                 disc_count += 1
-
+            entries[record['license_number']] = snapshot_entry(record, flag='has_disciplinary_action')
+    except AccessReadError as e:
+        print(f'[FATAL] Cannot read License table: {e}')
+        sys.exit(1)
+    fingerprints = {key: entry[1] for key, entry in entries.items()}
+    entries = sorted(entries.values())
+
+    diff = diff_snapshot(read_snapshot(args.snapshot), entries)
+    print_diff(diff, 'CA', flag_label='Newly disciplined')
+    if (diff['events'] or diff['flagged']) and not args.dry_run:
+        events_path = args.events or f"ca-mb-status-events-{datetime.utcnow():%Y-%m-%d}.jsonl"
+        events = ([{'event': 'status_change', **e} for e in diff['events']] +
+                  [{'event': 'new_disciplinary_action', **e} for e in diff['flagged']])
+        write_events(events_path, events, board='CA_MB', detected_at=datetime.utcnow().isoformat())
+        print(f'  Events written: {events_path}')
+
+    to_write = {e[0] for e in entries} if args.full else diff['changed']
+    queued = {'rows': 0}
+
+    def license_batches():
+        # Pass 2 producer: rebuild the licenses to write; runs ahead of the
+        # upload workers. Duplicate license numbers can land in different
+        # batches and race each other, so only the occurrence pass 1
+        # fingerprinted (the last) is sent, once per run.
+        batch = []
+        written = set()
+        for record in license_records():
+            license_number = record['license_number']
+            if license_number not in to_write or license_number in written:
+                continue
+            if record_fingerprint(record) != fingerprints[license_number]:
+                continue
+            written.add(license_number)
             batch.append(record)
-
             if len(batch) >= BATCH_SIZE:
-                # Deduplicate within batch by license_number (keep last occurrence)
-                seen_keys = {}
-                for rec in batch:
-                    key = (rec['license_number'], rec['state'])
-                    seen_keys[key] = rec
-                batch = list(seen_keys.values())
-                if args.dry_run:
-                    inserted += len(batch)
-                else:
-                    try:
-                        supabase_request(
-                            'provider_licenses?on_conflict=license_number,state',
-                            method='POST',
-                            body=batch
-                        )
-                        inserted += len(batch)
-                    except Exception as e:
-                        print(f'  Error on batch: {str(e)[:200]}')
-                        errors += 1
-
+                queued['rows'] += len(batch)
+                yield batch
                 batch = []
-
-                if inserted % 5000 == 0:
-                    elapsed = time.time() - start_time
-                    rate = inserted / elapsed if elapsed > 0 else 0
-                    print(f'  Inserted: {inserted:,}  ({rate:.0f}/s)')
-
-                # Small delay to avoid Supabase rate limits
-                time.sleep(0.1)
-
-    # Final batch
-    if batch:
-        # Deduplicate within batch
-        seen_keys = {}
-        for rec in batch:
-            key = (rec['license_number'], rec['state'])
-            seen_keys[key] = rec
-        batch = list(seen_keys.values())
-
-        if args.dry_run:
-            inserted += len(batch)
+        if batch:
+            queued['rows'] += len(batch)
+            yield batch
+
+    if not to_write:
+        print('  Nothing changed — no upserts needed')
+        inserted, errors, throttle = 0, 0, None
+    else:
+        print(f"  Upserting {len(to_write):,} {'licenses' if args.full else 'new/changed licenses'}...")
+        inserted, errors, throttle = upload_batches(license_batches(), args.dry_run, args.workers)
+
+    if args.limit and not args.dry_run:
+        # A partial read would make the next full run see every other license as new
+        print(f'  Snapshot NOT updated (--limit {args.limit} read a partial roster)')
+    elif not args.dry_run:
+        if errors == 0 and inserted == queued['rows']:
+            write_snapshot(args.snapshot, entries)
+            print(f'  Snapshot saved: {args.snapshot} ({len(entries):,} licenses)')
         else:
-            try:
-                supabase_request(
-                    'provider_licenses?on_conflict=license_number,state',
-                    method='POST',
-                    body=batch
-                )
-                inserted += len(batch)
-            except Exception as e:
-                print(f'  Error on final batch: {str(e)[:200]}')
-                errors += 1
-
-    conn.close()
+            print(f"  Snapshot NOT updated ({queued['rows'] - inserted:,} rows failed) — "
+                  f'the next run will retry them')
 
     # ── Summary ──
     elapsed = time.time() - start_time
     print()
     print('═' * 55)
     print(f'  CA Medical Board load complete in {elapsed:.1f}s')
-    print(f'  Licenses loaded:   {inserted:,}')
+    print(f'  Licenses read:     {len(entries):,}')
+    print(f'  Licenses upserted: {inserted:,}')
     print(f'  With disciplinary: {disc_count:,}')
-    print(f'  Errors:            {errors}')
+    print(f"  Newly disciplined: {len(diff['flagged']):,}")
+    print(f"  Status changes:    {len(diff['events']):,}")
+    print(f'  Failed batches:    {errors}')
+    if throttle and not args.dry_run:
+        print(f'  Upload rate:       {inserted / elapsed if elapsed > 0 else 0:,.0f} rows/s '
+              f'(final in-flight limit {int(throttle.limit)}/{args.workers})')
     print()
     print('  Status distribution:')
     for status, count in sorted(status_counts.items(), key=lambda x: -x[1]):
@@ -396,16 +585,12 @@ def main():
         print('\n  DRY RUN — no data written to Supabase')
         print('  Sample record:')
         # Re-read one row for sample
-        conn2 = pyodbc.connect(conn_str)
-        c2 = conn2.cursor()
-        c2.execute('SELECT TOP 1 * FROM License')
-        sample_cols = [d[0] for d in c2.description]
-        sample_row = dict(zip(sample_cols, c2.fetchone()))
-        sample = build_provider_license(sample_row, status_map, disc_by_license)
-        for k, v in sample.items():
-            if v is not None:
-                print(f'    {k}: {str(v)[:80]}')
-        conn2.close()
+        sample_cols, sample_rows = db.read_table('License', limit=1)
+        for sample_row in sample_rows:
+            sample = build_provider_license(dict(zip(sample_cols, sample_row)), status_map, disc_by_license)
+            for k, v in sample.items():
+                if v is not None:
+                    print(f'    {k}: {str(v)[:80]}')
 
 
 if __name__ == '__main__':
@@ -8,20 +8,26 @@ Loads the TMB Board Action Data XLS file into the provider_licenses table.
 This is a one-time bootstrap loader. After loading, the TMB Newsroom Monitor
 handles ongoing detection and the ORSSP PHY file provides the full roster quarterly.
 
+Rows written here are keyed on (license_number, source), so they sit alongside
+the roster rather than on it. For routine loads use the unified mode instead,
+which joins the roster and this file and writes one row per license:
+  python scripts/load-tmb-data.py --phy physician.txt --bad 202603BAD.XLS
+
 Usage:
   python scripts/load-tmb-board-actions.py path/to/202603BAD.XLS [--dry-run]
 
 Requires:
-  pip install xlrd requests
+  pip install xlrd requests [pyarrow]
 """
 
 import sys
 import os
 import json
-import xlrd
 import requests
 from collections import Counter
 
+from board_xls import read_xls_rows
+
 # ── Config ────────────────────────────────────────────────
 
 SUPABASE_URL = os.environ.get('SUPABASE_URL') or os.environ.get('NEXT_PUBLIC_SUPABASE_URL', '')
@@ -90,22 +96,12 @@ STATUS_MAP = {
 
 def parse_board_actions(filepath):
     """Parse the TMB Board Action XLS file into provider_licenses rows."""
-    wb = xlrd.open_workbook(filepath)
-    ws = wb.sheet_by_index(0)
-    headers = [ws.cell_value(0, c).strip() for c in range(ws.ncols)]
-    
     records = []
     seen_keys = set()
     skipped = 0
     
-    for r in range(1, ws.nrows):
-        row = {}
-        for c in range(ws.ncols):
-            val = ws.cell_value(r, c)
-            if isinstance(val, float):
-                val = str(int(val)) if val == int(val) else str(val)
-            row[headers[c]] = str(val).strip() if val else ''
-        
+    # Column-wise read, cached as a Parquet sidecar keyed on the file hash
+    for row in read_xls_rows(filepath):
         license_num = row.get('LICENSE_NUM', '').strip()
         last_name = row.get('LAST_NAME', '').strip()
         first_name = row.get('FIRST_NAME', '').strip()
@@ -11,23 +11,64 @@ Usage:
   python scripts/load-tmb-data.py --bad path/to/202603BAD.XLS [--dry-run]
   python scripts/load-tmb-data.py --phy physician.txt --bad 202603BAD.XLS [--dry-run]
 
-The PHY file should be loaded FIRST (full roster), then the BAD file overlays
-disciplinary data on top using license_number as the join key.
+With both --phy and --bad, the files are hash-joined on license number in
+memory (the Board Action file is the small build side) and every license is
+upserted exactly once: roster fields from PHY, disciplinary fields aggregated
+across all of its board actions. Licenses that only appear in the Board Action
+file are written from their most recent action. Either file alone still loads
+on its own.
+
+Every --bad load also bulk-loads each board action (license, action type,
+action date) into provider_disciplinary_actions, and the license row carries
+a compact summary: disciplinary_action_count, board_action_date and
+latest_board_action. Both come from one grouping pass over the file.
+
+The PHY roster is streamed: newline-aligned byte ranges are parsed into
+row tuples across PARSE_WORKERS processes (delimited_parser.py), and record
+batches go into a bounded queue that UPLOAD_WORKERS uploader threads drain,
+so parsing overlaps network I/O.
+
+Roster loads (--phy, with or without --bad) are diffed against the snapshot
+of the previous load (roster_diff.py, default .tmb-roster-snapshot.tsv.gz):
+only added or changed licenses are upserted, and license_status transitions
+(e.g. AC → SBA) are written to tmb-status-events-<date>.jsonl or --events.
+--full upserts every license but still diffs and refreshes the snapshot.
+The new entries are sorted on disk (roster_diff.SortedSpool), so a roster
+load holds at most one sort run plus the license numbers to upsert. A
+--bad-only load marks the licenses it overwrote as stale in the snapshot,
+so the next roster load rewrites just those.
 
 Requires:
-  pip install xlrd requests
+  pip install xlrd requests [pyarrow]
 """
 
 import sys
 import os
 import json
+import queue
+import threading
 import requests
 from collections import Counter
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from board_xls import read_xls_rows
+from delimited_parser import iter_delimited
+from roster_diff import (SortedSpool, diff_snapshot, invalidate_snapshot, print_diff, read_snapshot,
+                         snapshot_entry, write_events, write_snapshot)
 
 SUPABASE_URL = os.environ.get('SUPABASE_URL') or os.environ.get('NEXT_PUBLIC_SUPABASE_URL', '')
 SUPABASE_KEY = os.environ.get('SUPABASE_SERVICE_ROLE_KEY', '')
 BATCH_SIZE = 200
+UPLOAD_WORKERS = 4
+QUEUE_DEPTH = UPLOAD_WORKERS * 2  # batches buffered between parser and uploaders
+PARSE_WORKERS = None  # parser processes (None = one per CPU)
+SNAPSHOT_FILE = '.tmb-roster-snapshot.tsv.gz'  # last roster written, for diffing
+
+# Board action history (migrations/create-provider-disciplinary-actions.sql)
+HISTORY_TABLE = 'provider_disciplinary_actions'
+HISTORY_CONFLICT = 'license_number,state,action_type,action_date'
+# First of these present in the Board Action file is used as the action date
+ACTION_DATE_COLUMNS = ('ORDER_DATE', 'ORDER_DT', 'ACTION_DATE', 'ACTION_DT', 'BOARD_ACTION_DATE')
 
 # ── Registration status mapping (from Physician_Layout.pdf) ───
 
@@ -63,20 +104,20 @@ CRITICAL_STATUSES = {'SBA', 'DC', 'CN', 'CNB', 'DQ', 'CC'}
 
 # ── Supabase Helper ───────────────────────────────────────
 
-def upsert_batch(rows, on_conflict='license_number,state'):
-    url = f"{SUPABASE_URL}/rest/v1/provider_licenses?on_conflict={on_conflict}"
+def upsert_batch(rows, on_conflict='license_number,state', table='provider_licenses'):
+    url = f"{SUPABASE_URL}/rest/v1/{table}?on_conflict={on_conflict}"
     headers = {
         'apikey': SUPABASE_KEY,
         'Authorization': f'Bearer {SUPABASE_KEY}',
         'Content-Type': 'application/json',
         'Prefer': 'resolution=merge-duplicates,return=minimal',
     }
-    resp = requests.post(url, headers=headers, json=rows)
+    resp = requests.post(url, headers=headers, json=rows, timeout=60)
     if resp.status_code >= 400:
         # Fallback: try ignore-duplicates
         headers['Prefer'] = 'resolution=ignore-duplicates,return=minimal'
-        url2 = f"{SUPABASE_URL}/rest/v1/provider_licenses"
-        resp2 = requests.post(url2, headers=headers, json=rows)
+        url2 = f"{SUPABASE_URL}/rest/v1/{table}"
+        resp2 = requests.post(url2, headers=headers, json=rows, timeout=60)
         if resp2.status_code >= 400:
             raise Exception(f"Upsert failed: {resp2.status_code} {resp2.text[:300]}")
 
@@ -103,6 +144,14 @@ def parse_date_slash(val):
     except ValueError:
         return None
 
+def parse_action_date(val):
+    """Parse a Board Action date: MM/DD/YYYY text or an Excel serial day number."""
+    if not val:
+        return None
+    if val.isdigit() and len(val) <= 5:
+        return (datetime(1899, 12, 30) + timedelta(days=int(val))).strftime('%Y-%m-%d')
+    return parse_date_slash(val) or parse_date_mmddyyyy(val)
+
 # ════════════════════════════════════════════════════════════
 # PHY FILE PARSER (pipe-delimited, full roster)
 # ════════════════════════════════════════════════════════════
@@ -120,214 +169,479 @@ PHY_FIELDS = [
     'CNTY', 'GEN', 'RAC', 'HIS',
 ]
 
-def parse_phy_file(filepath):
-    """Parse the TMB Physician Database pipe-delimited file."""
-    records = []
-    skipped = 0
-    errors = 0
-    
-    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.rstrip('\n\r')
-            if not line:
-                continue
-            
-            parts = line.split('|')
-            
-            if len(parts) < 30:
-                skipped += 1
+PHY = {name: i for i, name in enumerate(PHY_FIELDS)}
+PHY_MIN_FIELDS = 30
+
+def build_phy_record(fields, synced_at):
+    """Map one PHY row tuple (stripped, PHY_FIELDS order) to a provider_licenses record (None if unusable)."""
+    license_num = fields[PHY['LIC']]
+    if not license_num:
+        return None
+
+    last_name = fields[PHY['LN']]
+    first_name = fields[PHY['FN']]
+    regstat = fields[PHY['RSC']]
+
+    provider_name = f"{last_name}, {first_name}".strip(', ')
+    license_status = STATUS_MAP.get(regstat, regstat or 'UNKNOWN')
+
+    # Parse dates
+    issue_date = parse_date_mmddyyyy(fields[PHY['LID']])
+    expiry_date = parse_date_mmddyyyy(fields[PHY['LED']])
+    degree = fields[PHY['DEG']]
+
+    # Keep all keys — Supabase requires consistent columns across batch
+    return {
+        'license_number': license_num,
+        'state': 'TX',
+        'license_state': fields[PHY['PS']] or 'TX',
+        'board_name': 'Texas Medical Board',
+        'licensee_name': provider_name,
+        'license_type': degree or 'MD',
+        'license_status': license_status,
+        'specialty': fields[PHY['SPEC1']] or None,
+        'address_line_1': fields[PHY['PA1']] or None,
+        'address_line_2': fields[PHY['PA2']] or None,
+        'city': fields[PHY['PC']] or None,
+        'zip_code': fields[PHY['PZIP']] or None,
+        'issue_date': issue_date,
+        'expiration_date': expiry_date,
+        'has_disciplinary_action': False,
+        'source': 'tmb_phy_file',
+        'last_synced_at': synced_at,
+    }
+
+def iter_phy_batches(filepath, counts, batch_size=BATCH_SIZE, workers=PARSE_WORKERS):
+    """Stream the PHY file as lists of at most batch_size records.
+
+    Byte ranges of the file are split into tuples in a process pool
+    (delimited_parser) and mapped here in file order. counts is updated in
+    place: 'parsed', 'skipped' (short or unlicensed lines) and 'errors'
+    (lines that raised while mapping), with the first few error line
+    numbers kept in 'error_lines'.
+    """
+    synced_at = datetime.utcnow().isoformat()
+    counts.setdefault('parsed', 0)
+    counts.setdefault('skipped', 0)
+    counts.setdefault('errors', 0)
+    counts.setdefault('error_lines', [])
+    batch = []
+
+    for rows, rejects in iter_delimited(filepath, len(PHY_FIELDS), '|',
+                                        PHY_MIN_FIELDS, workers):
+        counts['skipped'] += len(rejects)
+        for line_num, fields in rows:
+            try:
+                record = build_phy_record(fields, synced_at)
+            except Exception:
+                counts['errors'] += 1
+                if len(counts['error_lines']) < 10:
+                    counts['error_lines'].append(line_num)
                 continue
-            
-            # Map fields
-            row = {}
-            for i, field_name in enumerate(PHY_FIELDS):
-                row[field_name] = parts[i].strip() if i < len(parts) else ''
-            
-            license_num = row.get('LIC', '').strip()
-            if not license_num:
-                skipped += 1
+            if record is None:
+                counts['skipped'] += 1
                 continue
-            
-            last_name = row.get('LN', '').strip()
-            first_name = row.get('FN', '').strip()
-            regstat = row.get('RSC', '').strip()
-            
-            provider_name = f"{last_name}, {first_name}".strip(', ')
-            license_status = STATUS_MAP.get(regstat, regstat or 'UNKNOWN')
-            
-            # Parse dates
-            issue_date = parse_date_mmddyyyy(row.get('LID', ''))
-            expiry_date = parse_date_mmddyyyy(row.get('LED', ''))
-            status_date = parse_date_mmddyyyy(row.get('RSD', ''))
-            
-            record = {
-                'license_number': license_num,
-                'state': 'TX',
-                'license_state': row.get('PS', '').strip() or 'TX',
-                'board_name': 'Texas Medical Board',
-                'licensee_name': provider_name,
-                'license_type': 'MD' if row.get('DEG', '') == 'MD' else row.get('DEG', '') or 'MD',
-                'license_status': license_status,
-                'specialty': row.get('SPEC1', '').strip() or None,
-                'address_line_1': row.get('PA1', '').strip() or None,
-                'address_line_2': row.get('PA2', '').strip() or None,
-                'city': row.get('PC', '').strip() or None,
-                'zip_code': row.get('PZIP', '').strip() or None,
-                'issue_date': issue_date,
-                'expiration_date': expiry_date,
-                'has_disciplinary_action': False,
-                'source': 'tmb_phy_file',
-                'last_synced_at': datetime.utcnow().isoformat(),
-            }
-            
-            # Remove None values
-            # Keep all keys — Supabase requires consistent columns across batch
-            records.append(record)
-            return records, skipped    
-            return records, skipped, errors
+
+            counts['parsed'] += 1
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
+
+def parse_phy_file(filepath):
+    """Parse the TMB Physician Database pipe-delimited file into memory.
+
+    Returns (records, skipped, errors). The loader itself streams via
+    iter_phy_batches; this is for callers that need the whole roster.
+    """
+    counts = {}
+    records = []
+    for batch in iter_phy_batches(filepath, counts):
+        records.extend(batch)
+    return records, counts['skipped'], counts['errors']
 
 # ════════════════════════════════════════════════════════════
 # BOARD ACTION XLS PARSER (disciplinary records)
 # ════════════════════════════════════════════════════════════
 
-def parse_board_actions(filepath):
-    """Parse the TMB Board Action XLS file."""
-    import xlrd
-    wb = xlrd.open_workbook(filepath)
-    ws = wb.sheet_by_index(0)
-    headers = [ws.cell_value(0, c).strip() for c in range(ws.ncols)]
-    
-    records = []
+def read_board_action_rows(filepath):
+    """Read the TMB Board Action XLS into row dicts keyed by header.
+
+    Columns are read and coerced whole (board_xls), and re-runs on the same
+    file load from its Parquet sidecar.
+    """
+    return read_xls_rows(filepath)
+
+def group_board_actions(rows):
+    """Group Board Action rows by license in a single pass.
+
+    Returns ({license: group}, skipped). Each group holds the license's most
+    recent row ('last', for roster fields) and its distinct actions keyed by
+    (action type, action date); repeat rows for the same action only add
+    their violation. Both the history table and the license summary are
+    built from these groups.
+    """
+    date_col = next((c for c in ACTION_DATE_COLUMNS if rows and c in rows[0]), None)
+    groups = {}
     skipped = 0
-    
-    for r in range(1, ws.nrows):
-        row = {}
-        for c in range(ws.ncols):
-            val = ws.cell_value(r, c)
-            if isinstance(val, float):
-                val = str(int(val)) if val == int(val) else str(val)
-            row[headers[c]] = str(val).strip() if val else ''
-        
+    for row in rows:
         license_num = row.get('LICENSE_NUM', '').strip()
         if not license_num:
             skipped += 1
             continue
+        group = groups.get(license_num)
+        if group is None:
+            group = groups[license_num] = {'last': row, 'actions': {}}
+        group['last'] = row
         
-        last_name = row.get('LAST_NAME', '').strip()
-        first_name = row.get('FIRST_NAME', '').strip()
-        regstat = row.get('REGSTAT', '').strip()
-        order_disp = row.get('ORDER_DISP', '').strip()
-        mpa_primary = row.get('MPA_PRIMARY', '').strip()
-        
-        provider_name = f"{last_name}, {first_name}".strip(', ')
-        license_status = STATUS_MAP.get(regstat, regstat or 'UNKNOWN')
-        
-        # Build disciplinary details
-        details_parts = []
-        if order_disp:
-            details_parts.append(f"Action: {order_disp}")
-        if mpa_primary:
-            details_parts.append(f"Violation: {mpa_primary}")
-        disciplinary_details = ' | '.join(details_parts) if details_parts else None
-        
-        issue_date = parse_date_slash(row.get('LIC_ISSUE_DT', ''))
-        
-        record = {
-            'license_number': license_num,
-            'state': 'TX',
-            'license_state': 'TX',
-            'board_name': 'Texas Medical Board',
-            'licensee_name': provider_name,
-            'license_type': row.get('DEG', '').strip() or None,
-            'license_status': license_status,
-            'specialty': row.get('PRIMARY_SPEC', '').strip() or None,
-            'address_line_1': row.get('PADD1', '').strip() or None,
-            'address_line_2': row.get('PADD2', '').strip() or None,
-            'city': row.get('PCITY', '').strip() or None,
-            'zip_code': row.get('PZIP', '').strip() or None,
-            'issue_date': issue_date,
-            'has_disciplinary_action': True,
-            'disciplinary_details': disciplinary_details,
-            'source': 'tmb_board_action',
-            'last_synced_at': datetime.utcnow().isoformat(),
-        }
-        
-       # Keep all keys — Supabase requires consistent columns across batch
-        records.append(record)
-# Deduplicate by license_number — keep last (most recent) action
-    seen = {}
-    for r in records:
-        key = r.get('license_number', '')
-        seen[key] = r  # last one wins
-    unique = list(seen.values())
+        action_type = row.get('ORDER_DISP', '').strip()
+        violation = row.get('MPA_PRIMARY', '').strip()
+        action_date = parse_action_date(row.get(date_col, '').strip()) if date_col else None
+        action = group['actions'].get((action_type, action_date))
+        if action is None:
+            group['actions'][(action_type, action_date)] = {
+                'action_type': action_type,
+                'action_date': action_date,
+                'violations': [violation] if violation else [],
+                'regstat': row.get('REGSTAT', '').strip(),
+            }
+        elif violation and violation not in action['violations']:
+            action['violations'].append(violation)
+    return groups, skipped
+
+def disciplinary_fields(group):
+    """Summarize one license's board actions for its provider_licenses row."""
+    actions = list(group['actions'].values())
+    dated = [a for a in actions if a['action_date']]
+    latest = max(dated, key=lambda a: a['action_date']) if dated else actions[-1]
     
-    return unique, skipped + (len(records) - len(unique))
+    details = []
+    for a in actions:
+        parts = []
+        if a['action_type']:
+            parts.append(f"Action: {a['action_type']}")
+        if a['violations']:
+            parts.append(f"Violation: {', '.join(a['violations'])}")
+        if parts:
+            details.append(' | '.join(parts))
+    return {
+        'has_disciplinary_action': True,
+        'disciplinary_details': '; '.join(details) if details else None,
+        'disciplinary_action_count': len(actions),
+        'board_action_date': latest['action_date'],
+        'latest_board_action': latest['action_type'] or None,
+    }
+
+NO_DISCIPLINARY_FIELDS = {
+    'has_disciplinary_action': False,
+    'disciplinary_details': None,
+    'disciplinary_action_count': 0,
+    'board_action_date': None,
+    'latest_board_action': None,
+}
+
+def iter_history_batches(groups, source_file, batch_size=BATCH_SIZE):
+    """Stream provider_disciplinary_actions rows, one per grouped action."""
+    synced_at = datetime.utcnow().isoformat()
+    batch = []
+    for license_num, group in groups.items():
+        for a in group['actions'].values():
+            batch.append({
+                'license_number': license_num,
+                'state': 'TX',
+                'action_type': a['action_type'],
+                'action_date': a['action_date'],
+                'violation': '; '.join(a['violations']) or None,
+                'registration_status': a['regstat'] or None,
+                'source': 'tmb_board_action',
+                'source_file': os.path.basename(source_file),
+                'last_synced_at': synced_at,
+            })
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def build_board_action_record(license_num, group, synced_at):
+    """Build a record for a license known only from the Board Action file."""
+    row = group['last']  # roster fields from the most recent action
+    last_name = row.get('LAST_NAME', '').strip()
+    first_name = row.get('FIRST_NAME', '').strip()
+    regstat = row.get('REGSTAT', '').strip()
+    
+    provider_name = f"{last_name}, {first_name}".strip(', ')
+    license_status = STATUS_MAP.get(regstat, regstat or 'UNKNOWN')
+    
+    # Keep all keys — Supabase requires consistent columns across batch
+    return {
+        'license_number': license_num,
+        'state': 'TX',
+        'license_state': 'TX',
+        'board_name': 'Texas Medical Board',
+        'licensee_name': provider_name,
+        'license_type': row.get('DEG', '').strip() or None,
+        'license_status': license_status,
+        'specialty': row.get('PRIMARY_SPEC', '').strip() or None,
+        'address_line_1': row.get('PADD1', '').strip() or None,
+        'address_line_2': row.get('PADD2', '').strip() or None,
+        'city': row.get('PCITY', '').strip() or None,
+        'zip_code': row.get('PZIP', '').strip() or None,
+        'issue_date': parse_date_slash(row.get('LIC_ISSUE_DT', '')),
+        **disciplinary_fields(group),
+        'source': 'tmb_board_action',
+        'last_synced_at': synced_at,
+    }
+
+def board_action_records(groups):
+    """One provider_licenses record per license in the Board Action file."""
+    synced_at = datetime.utcnow().isoformat()
+    return [build_board_action_record(lic, group, synced_at) for lic, group in groups.items()]
+
+# ════════════════════════════════════════════════════════════
+# UNIFIED LOAD (PHY roster ⋈ Board Actions)
+# ════════════════════════════════════════════════════════════
+
+def iter_merged_batches(phy_file, groups, counts, batch_size=BATCH_SIZE):
+    """Stream PHY batches with board actions hash-joined on license number.
+
+    groups is the {license: group} build side from group_board_actions.
+    Roster records keep their roster fields and gain the aggregated
+    disciplinary fields; licenses that appear only in the Board Action file
+    follow as board-action records (in their own batches, since they carry
+    no expiration_date). Every license is emitted exactly once.
+    counts gains 'matched' and 'bad_only'.
+    """
+    matched = set()
+    counts.setdefault('matched', 0)
+    counts.setdefault('bad_only', 0)
+    
+    for batch in iter_phy_batches(phy_file, counts, batch_size):
+        for record in batch:
+            lic = record['license_number']
+            group = groups.get(lic)
+            if group is None:
+                record.update(NO_DISCIPLINARY_FIELDS)
+            else:
+                record.update(disciplinary_fields(group))
+                matched.add(lic)
+        yield batch
+    counts['matched'] = len(matched)
     
-    return records, skipped
+    synced_at = datetime.utcnow().isoformat()
+    leftovers = [build_board_action_record(lic, group, synced_at)
+                 for lic, group in groups.items() if lic not in matched]
+    counts['bad_only'] = len(leftovers)
+    for i in range(0, len(leftovers), batch_size):
+        yield leftovers[i:i + batch_size]
 
 # ════════════════════════════════════════════════════════════
 # MAIN
 # ════════════════════════════════════════════════════════════
 
+class RecordStats:
+    """Data-quality counters, accumulated batch by batch."""
+
+    def __init__(self):
+        self.total = 0
+        self.statuses = Counter()
+        self.with_addr = 0
+        self.with_spec = 0
+        self.disciplined = 0
+
+    def add(self, records):
+        self.total += len(records)
+        for r in records:
+            self.statuses[r.get('license_status', '')] += 1
+            if r.get('address_line_1'):
+                self.with_addr += 1
+            if r.get('specialty'):
+                self.with_spec += 1
+            if r.get('has_disciplinary_action'):
+                self.disciplined += 1
+
+    def print(self, label):
+        print(f"\n[{label}] Data quality:")
+        print(f"  Total records:         {self.total:,}")
+        print(f"  With practice address: {self.with_addr:,}")
+        print(f"  With specialty:        {self.with_spec:,}")
+        print(f"  With disciplinary:     {self.disciplined:,}")
+        print(f"\n  Status breakdown (top 10):")
+        for status, count in self.statuses.most_common(10):
+            marker = " ***" if status == 'SUSPENDED' else ""
+            print(f"    {count:>6,}  {status}{marker}")
+
 def print_stats(records, label):
-    statuses = Counter(r.get('license_status', '') for r in records)
-    with_addr = sum(1 for r in records if r.get('address_line_1'))
-    with_spec = sum(1 for r in records if r.get('specialty'))
-    disciplined = sum(1 for r in records if r.get('has_disciplinary_action'))
-    
-    print(f"\n[{label}] Data quality:")
-    print(f"  Total records:         {len(records):,}")
-    print(f"  With practice address: {with_addr:,}")
-    print(f"  With specialty:        {with_spec:,}")
-    print(f"  With disciplinary:     {disciplined:,}")
-    print(f"\n  Status breakdown (top 10):")
-    for status, count in statuses.most_common(10):
-        marker = " ***" if status == 'SUSPENDED' else ""
-        print(f"    {count:>6,}  {status}{marker}")
+    stats = RecordStats()
+    stats.add(records)
+    stats.print(label)
 
-def do_upsert(records, label, dry_run):
+def upload_batches(batches, label, dry_run, workers=UPLOAD_WORKERS, **upsert_args):
+    """Upsert batches from an iterator on a pool of uploader threads.
+
+    A bounded queue sits between the producer (usually a parsing generator)
+    and the uploaders, so parsing runs ahead of network I/O by at most
+    QUEUE_DEPTH batches and memory stays constant. upsert_args (table,
+    on_conflict) go to upsert_batch. Returns rows upserted.
+    """
     if dry_run:
-        print(f"\n[{label}] DRY RUN — would upsert {len(records):,} records")
+        total = sum(len(b) for b in batches)
+        print(f"\n[{label}] DRY RUN — would upsert {total:,} records")
         return 0
+
+    print(f"\n[{label}] Upserting with {workers} uploaders...")
+    q = queue.Queue(maxsize=QUEUE_DEPTH)
+    lock = threading.Lock()
+    progress = {'inserted': 0, 'errors': 0}
+
+    def uploader():
+        while True:
+            item = q.get()
+            if item is None:
+                q.task_done()
+                return
+            batch_no, batch = item
+            try:
+                upsert_batch(batch, **upsert_args)
+                with lock:
+                    before = progress['inserted']
+                    progress['inserted'] += len(batch)
+                    if progress['inserted'] // 10000 > before // 10000:
+                        print(f"  Upserted {progress['inserted']:,}...")
+            except Exception as e:
+                with lock:
+                    progress['errors'] += 1
+                    if progress['errors'] <= 3:
+                        print(f"  Error on batch {batch_no}: {e}")
+                    elif progress['errors'] == 4:
+                        print(f"  (suppressing further error messages)")
+            finally:
+                q.task_done()
+
+    threads = [threading.Thread(target=uploader, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for batch_no, batch in enumerate(batches, 1):
+        q.put((batch_no, batch))
+    for _ in threads:
+        q.put(None)
+    for t in threads:
+        t.join()
+
+    print(f"[{label}] Complete: {progress['inserted']:,} upserted, {progress['errors']} batch errors")
+    return progress['inserted']
+
+def do_upsert(records, label, dry_run):
+    batches = (records[i:i + BATCH_SIZE] for i in range(0, len(records), BATCH_SIZE))
+    return upload_batches(batches, label, dry_run)
+
+def load_roster(make_batches, label, dry_run, snapshot_path, events_path=None, full=False):
+    """Load a roster by diffing it against the previous snapshot.
+
+    make_batches(counts) streams the roster's record batches. Pass 1
+    fingerprints every record into an on-disk SortedSpool and merge-diffs
+    it against snapshot_path; pass 2 re-streams the roster from the parser
+    (records are never held) and upserts only added or changed licenses
+    (every license with full=True). The snapshot is replaced only when
+    every one of those rows was written.
+    Returns rows upserted.
+    """
+    with SortedSpool() as entries:
+        return _load_roster(entries, make_batches, label, dry_run, snapshot_path, events_path, full)
+
+def _load_roster(entries, make_batches, label, dry_run, snapshot_path, events_path, full):
+    counts = {}
+    stats = RecordStats()
+    for batch in make_batches(counts):
+        stats.add(batch)
+        for r in batch:
+            entries.add(snapshot_entry(r))
     
-    print(f"\n[{label}] Upserting {len(records):,} records...")
-    inserted = 0
-    errors = 0
+    print(f"[{label}] Parsed: {counts['parsed']:,} roster records "
+          f"({counts['skipped']} skipped, {counts['errors']} errors)")
+    if counts['error_lines']:
+        print(f"  First error lines: {', '.join(str(n) for n in counts['error_lines'])}")
+    if 'matched' in counts:
+        print(f"[{label}] Joined: {counts['matched']:,} roster licenses with actions, "
+              f"{counts['bad_only']:,} action-only licenses")
+    stats.print(label)
     
-    for i in range(0, len(records), BATCH_SIZE):
-        batch = records[i:i + BATCH_SIZE]
-        try:
-            upsert_batch(batch)
-            inserted += len(batch)
-            if inserted % 2000 == 0:
-                print(f"  Upserted {inserted:,}...")
-        except Exception as e:
-            errors += 1
-            if errors <= 3:
-                print(f"  Error on batch {i // BATCH_SIZE + 1}: {e}")
-            elif errors == 4:
-                print(f"  (suppressing further error messages)")
+    diff = diff_snapshot(read_snapshot(snapshot_path), entries)
+    n_licenses = diff['counts']['added'] + diff['counts']['changed'] + diff['counts']['unchanged']
+    print()
+    print_diff(diff, label)
+    if diff['events'] and not dry_run:
+        events_path = events_path or f"tmb-status-events-{datetime.utcnow():%Y-%m-%d}.jsonl"
+        write_events(events_path, diff['events'], board='TMB', detected_at=datetime.utcnow().isoformat())
+        print(f"  Events written: {events_path}")
+    
+    changed = diff['changed']
+    to_write = n_licenses if full else len(changed)
+    queued = {'rows': 0}
     
-    print(f"[{label}] Complete: {inserted:,} upserted, {errors} batch errors")
+    def changed_batches():
+        # Re-batch the survivors; action-only records carry a different
+        # column set, so a batch is also cut whenever the keys change
+        pending = []
+        keys = None
+        for batch in make_batches({}):
+            for r in batch:
+                if not full and r['license_number'] not in changed:
+                    continue
+                if pending and (len(pending) >= BATCH_SIZE or r.keys() != keys):
+                    yield pending
+                    pending = []
+                keys = r.keys()
+                pending.append(r)
+                queued['rows'] += 1
+        if pending:
+            yield pending
+    
+    if not to_write:
+        print(f"[{label}] Nothing changed — no upserts needed")
+        inserted = 0
+    else:
+        print(f"[{label}] Upserting {to_write:,} {'licenses' if full else 'added/changed licenses'}...")
+        inserted = upload_batches(changed_batches(), label, dry_run)
+    
+    if dry_run:
+        return inserted
+    if inserted == queued['rows']:
+        write_snapshot(snapshot_path, entries)
+        print(f"[{label}] Snapshot saved: {snapshot_path} ({n_licenses:,} licenses)")
+    else:
+        print(f"[{label}] Snapshot NOT updated ({queued['rows'] - inserted:,} rows failed) — "
+              f"the next run will retry them")
     return inserted
 
 def main():
     args = sys.argv[1:]
     dry_run = '--dry-run' in args
+    full = '--full' in args
     phy_file = None
     bad_file = None
+    snapshot_path = SNAPSHOT_FILE
+    events_path = None
     
     for i, a in enumerate(args):
         if a == '--phy' and i + 1 < len(args):
             phy_file = args[i + 1]
         if a == '--bad' and i + 1 < len(args):
             bad_file = args[i + 1]
+        if a == '--snapshot' and i + 1 < len(args):
+            snapshot_path = args[i + 1]
+        if a == '--events' and i + 1 < len(args):
+            events_path = args[i + 1]
     
     if not phy_file and not bad_file:
         print("Usage:")
         print("  python scripts/load-tmb-data.py --phy physician.txt [--dry-run]")
         print("  python scripts/load-tmb-data.py --bad 202603BAD.XLS [--dry-run]")
         print("  python scripts/load-tmb-data.py --phy physician.txt --bad 202603BAD.XLS [--dry-run]")
+        print("Roster options: [--full] [--snapshot PATH] [--events PATH]")
         sys.exit(1)
     
     if not SUPABASE_URL or not SUPABASE_KEY:
@@ -342,32 +656,49 @@ def main():
         print(f"  PHY file:  {phy_file}")
     if bad_file:
         print(f"  BAD file:  {bad_file}")
+    if phy_file:
+        print(f"  Snapshot:  {snapshot_path}{' (full write)' if full else ''}")
     print(f"  Dry run:   {dry_run}")
     print()
     
-    total_inserted = 0
-    
-    # Step 1: Load PHY file (full roster)
-    if phy_file:
-        if not os.path.exists(phy_file):
-            print(f"[FATAL] PHY file not found: {phy_file}")
+    for label, path in (('PHY', phy_file), ('BAD', bad_file)):
+        if path and not os.path.exists(path):
+            print(f"[FATAL] {label} file not found: {path}")
             sys.exit(1)
-        
-        print("[PHY] Parsing pipe-delimited physician roster...")
-        phy_records, phy_skipped, phy_errors = parse_phy_file(phy_file)
-        print(f"[PHY] Parsed: {len(phy_records):,} records ({phy_skipped} skipped)")
-        print_stats(phy_records, 'PHY')
-        total_inserted += do_upsert(phy_records, 'PHY', dry_run)
     
-    # Step 2: Load Board Action XLS (overlay disciplinary data)
+    total_inserted = 0
+    
+    # Board actions: one grouping pass feeds both the history table and
+    # the per-license summary
     if bad_file:
-        if not os.path.exists(bad_file):
-            print(f"[FATAL] BAD file not found: {bad_file}")
-            sys.exit(1)
+        print("[BAD] Parsing Board Action XLS...")
+        bad_rows = read_board_action_rows(bad_file)
+        groups, bad_skipped = group_board_actions(bad_rows)
+        n_actions = sum(len(g['actions']) for g in groups.values())
+        print(f"[BAD] Parsed: {len(bad_rows):,} rows → {n_actions:,} actions for "
+              f"{len(groups):,} licenses ({bad_skipped} without license number)")
         
-        print("\n[BAD] Parsing Board Action XLS...")
-        bad_records, bad_skipped = parse_board_actions(bad_file)
-        print(f"[BAD] Parsed: {len(bad_records):,} records ({bad_skipped} skipped)")
+        upload_batches(iter_history_batches(groups, bad_file), 'HISTORY', dry_run,
+                       table=HISTORY_TABLE, on_conflict=HISTORY_CONFLICT)
+        print()
+    
+    # Unified mode: join both files locally and write each license once
+    if phy_file and bad_file:
+        print("[TMB] Streaming PHY roster joined with board actions...")
+        total_inserted += load_roster(
+            lambda counts: iter_merged_batches(phy_file, groups, counts),
+            'TMB', dry_run, snapshot_path, events_path, full)
+    
+    # PHY only: full roster
+    elif phy_file:
+        print("[PHY] Streaming pipe-delimited physician roster...")
+        total_inserted += load_roster(
+            lambda counts: iter_phy_batches(phy_file, counts),
+            'PHY', dry_run, snapshot_path, events_path, full)
+    
+    # BAD only: overlay disciplinary data
+    else:
+        bad_records = board_action_records(groups)
         print_stats(bad_records, 'BAD')
         
         # Show newsroom suspension matches
@@ -378,6 +709,14 @@ def main():
                 print(f"    {s['licensee_name']:<35} Lic: {s['license_number']:<10}")
         
         total_inserted += do_upsert(bad_records, 'BAD', dry_run)
+        
+        # BAD rows overwrite roster rows the snapshot describes: mark just
+        # those stale so the next roster load rewrites them and diffs the rest
+        if not dry_run:
+            stale = invalidate_snapshot(snapshot_path, {r['license_number'] for r in bad_records})
+            if stale:
+                print(f"[BAD] Marked {stale:,} licenses stale in {snapshot_path}; "
+                      f"the next roster load rewrites them")
     
     print("\n" + "═" * 55)
     print(f"  Total records loaded: {total_inserted:,}")
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+pdf_optimize.py — Size optimization stage for generated PDFs
+
+Generated PDFs are emailed to practices and kept in Supabase storage. This
+stage rewrites a finished PDF to be smaller without changing how it looks:
+
+  1. Standard fonts by reference: an embedded copy of one of the 14 standard
+     PDF fonts (Helvetica, Times, Courier, Symbol, ZapfDingbats) is replaced
+     by a plain reference, which every viewer already provides.
+  2. Shared XObjects: identical images and forms (a logo drawn on every
+     page, the kit page chrome of spliced per-practice documents) are
+     stored once and referenced from each page.
+  3. Compression: every stream is decoded and re-compressed with Flate
+     only. reportlab wraps its streams in ASCII85, which adds a quarter to
+     their size. Objects are packed into compressed object streams.
+  4. Linearization (optional): first page viewable before the whole file
+     has downloaded.
+
+The generators already draw with the standard fonts and share the kit page
+chrome as a form XObject; steps 1 and 2 matter for spliced documents and
+any PDF produced elsewhere. The output is deterministic for a given input.
+
+Requires pikepdf (bundles qpdf). Without it, optimize_pdf() returns its
+input unchanged so rendering never fails on a missing optional package.
+
+Usage as a module:
+    from pdf_optimize import optimize_pdf
+    smaller = optimize_pdf(pdf_bytes)
+
+Usage standalone:
+    python scripts/pdf_optimize.py kit/*.pdf --in-place [--linearize]
+    python scripts/pdf_optimize.py form.pdf -o optimized/
+    python scripts/pdf_optimize.py --documents        # size report for every generated PDF
+
+Requires:
+  pip install pikepdf
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import sys
+import time
+from io import BytesIO
+
+try:
+    import pikepdf
+except ImportError:  # optional: optimize_pdf() passes PDFs through
+    pikepdf = None
+
+STANDARD_FONTS = {
+    'Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique',
+    'Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic',
+    'Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique',
+    'Symbol', 'ZapfDingbats',
+}
+
+# Common names for the standard fonts as embedded by other producers
+FONT_ALIASES = {
+    'Arial': 'Helvetica', 'Arial,Bold': 'Helvetica-Bold', 'Arial,Italic': 'Helvetica-Oblique',
+    'Arial,BoldItalic': 'Helvetica-BoldOblique', 'ArialMT': 'Helvetica', 'Arial-BoldMT': 'Helvetica-Bold',
+    'Arial-ItalicMT': 'Helvetica-Oblique', 'Arial-BoldItalicMT': 'Helvetica-BoldOblique',
+    'TimesNewRoman': 'Times-Roman', 'TimesNewRomanPSMT': 'Times-Roman', 'TimesNewRoman,Bold': 'Times-Bold',
+    'TimesNewRomanPS-BoldMT': 'Times-Bold', 'CourierNew': 'Courier', 'CourierNewPSMT': 'Courier',
+}
+
+# Encodings the standard fonts can be shown with by reference
+SIMPLE_ENCODINGS = {'/WinAnsiEncoding', '/StandardEncoding', '/MacRomanEncoding'}
+
+
+# ── Step 1: standard fonts by reference ──────────────────
+
+def _standard_name(base_font):
+    """Standard-14 name for an embedded font's BaseFont, or None."""
+    name = str(base_font).lstrip('/')
+    if len(name) > 7 and name[6] == '+':  # subset tag, e.g. ABCDEF+Helvetica
+        name = name[7:]
+    name = FONT_ALIASES.get(name, name)
+    return name if name in STANDARD_FONTS else None
+
+
+def _unembed_font(font):
+    """Turn an embedded simple font into a standard-14 reference. Returns True if changed."""
+    if font.get('/Subtype') not in ('/Type1', '/TrueType', '/MMType1'):
+        return False  # Type0/CID fonts map glyph ids, not characters
+    descriptor = font.get('/FontDescriptor')
+    if descriptor is None or not any(k in descriptor for k in ('/FontFile', '/FontFile2', '/FontFile3')):
+        return False
+    standard = _standard_name(font.get('/BaseFont', ''))
+    if standard is None:
+        return False
+    encoding = font.get('/Encoding')
+    symbolic = standard in ('Symbol', 'ZapfDingbats')
+    if not symbolic:
+        if encoding is None or (isinstance(encoding, pikepdf.Name) and str(encoding) not in SIMPLE_ENCODINGS):
+            return False  # builtin encoding of a subset: character codes are not text
+        if isinstance(encoding, pikepdf.Dictionary) and '/Differences' in encoding:
+            return False  # custom glyph names; keep the embedded program
+    font.Subtype = pikepdf.Name.Type1
+    font.BaseFont = pikepdf.Name('/' + standard)
+    for key in ('/FontDescriptor', '/Widths', '/FirstChar', '/LastChar', '/ToUnicode'):
+        if key in font:
+            del font[key]
+    return True
+
+
+def _font_dicts(pdf):
+    for obj in pdf.objects:
+        if isinstance(obj, pikepdf.Dictionary) and obj.get('/Type') == '/Font':
+            yield obj
+
+
+# ── Step 2: shared XObjects ──────────────────────────────
+
+def _fingerprint(obj, h, depth=0):
+    """Feed a structural hash of obj (indirect references resolved) into h."""
+    if depth > 32:
+        h.update(b'<deep>')
+        return
+    if isinstance(obj, pikepdf.Stream):
+        h.update(b'S')
+        _fingerprint(obj.stream_dict, h, depth + 1)
+        h.update(hashlib.sha256(obj.read_raw_bytes()).digest())
+    elif isinstance(obj, pikepdf.Dictionary):
+        h.update(b'D')
+        for key in sorted(obj.keys()):
+            if key in ('/Parent', '/Length'):
+                continue
+            h.update(key.encode())
+            _fingerprint(obj[key], h, depth + 1)
+    elif isinstance(obj, pikepdf.Array):
+        h.update(b'A')
+        for item in obj:
+            _fingerprint(item, h, depth + 1)
+    else:
+        h.update(repr(obj).encode())
+
+
+def _share_xobjects(pdf):
+    """Point every use of an identical image or form at one copy. Returns the
+    number of duplicate XObjects dropped."""
+    canonical = {}
+    dropped = set()
+
+    def walk(resources, seen):
+        xobjects = resources.get('/XObject') if resources is not None else None
+        if xobjects is None:
+            return
+        for name in list(xobjects.keys()):
+            xobj = xobjects[name]
+            if xobj.objgen in seen:
+                continue
+            if xobj.get('/Subtype') == '/Form':
+                walk(xobj.get('/Resources'), seen | {xobj.objgen})  # nested images first
+            h = hashlib.sha256()
+            _fingerprint(xobj, h)
+            first = canonical.setdefault(h.digest(), xobj)
+            if first.objgen != xobj.objgen:
+                xobjects[name] = first
+                dropped.add(xobj.objgen)
+
+    for page in pdf.pages:
+        walk(page.obj.get('/Resources'), set())
+    return len(dropped)
+
+
+# ── Pipeline ─────────────────────────────────────────────
+
+def optimize_pdf(data, linearize=False, stats=None):
+    """Return a smaller, visually identical copy of a PDF.
+
+    stats, if given, is filled with fonts_unembedded / xobjects_shared.
+    Without pikepdf the input is returned unchanged.
+    """
+    if pikepdf is None:
+        return data
+    with pikepdf.open(BytesIO(data)) as pdf:
+        fonts = sum(_unembed_font(font) for font in _font_dicts(pdf))
+        shared = _share_xobjects(pdf)
+        out = BytesIO()
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            out,
+            compress_streams=True,
+            recompress_flate=True,
+            stream_decode_level=pikepdf.StreamDecodeLevel.generalized,  # drops ASCII85
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            linearize=linearize,
+            deterministic_id=True,
+        )
+    if stats is not None:
+        stats.update(fonts_unembedded=fonts, xobjects_shared=shared)
+    result = out.getvalue()
+    return result if len(result) < len(data) or linearize else data
+
+
+def optimize_file(path, output=None, linearize=False):
+    """Optimize one PDF file in place (or into output). Returns (before, after) bytes."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    optimized = optimize_pdf(data, linearize=linearize)
+    with open(output or path, 'wb') as f:
+        f.write(optimized)
+    return len(data), len(optimized)
+
+
+# ── Size report ──────────────────────────────────────────
+
+def _report_line(name, before, after, ms, stats=None):
+    saved = (1 - after / before) * 100 if before else 0
+    extra = ''
+    if stats and (stats['fonts_unembedded'] or stats['xobjects_shared']):
+        extra = f"  fonts -{stats['fonts_unembedded']}, xobjects -{stats['xobjects_shared']}"
+    print(f'  {name:<44} {before / 1024:>7.1f} KB -> {after / 1024:>7.1f} KB  {saved:>5.1f}%  {ms:>5.0f}ms{extra}')
+
+
+def _document_sources():
+    """(name, pdf_bytes) for every PDF document type, rendered unoptimized."""
+    from document_renderers import DOCUMENTS, PDF, render_document
+    sample_form = {
+        'practice_name': 'Downtown Family Medicine', 'npi': '1234567890',
+        'provider_name': 'Dr. Michael Rodriguez', 'workflow_id': 'WF-SAMPLE',
+        'corrections': [{'field': f'Field {i}', 'current_value': f'{100 + i} Oak Street',
+                         'corrected_value': f'{200 + i} Oak Street'} for i in range(10)],
+    }
+    for doc_type, spec in DOCUMENTS.items():
+        if spec['content_type'] == PDF:
+            params = sample_form if doc_type == 'nppes-form' else None
+            yield doc_type, render_document(doc_type, params, optimize=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shrink generated PDFs and report before/after sizes')
+    parser.add_argument('paths', nargs='*', help='PDF files or glob patterns')
+    parser.add_argument('--documents', action='store_true', help='Render every PDF document type and report')
+    parser.add_argument('-o', '--out-dir', help='Write optimized copies here')
+    parser.add_argument('--in-place', action='store_true', help='Overwrite the input files')
+    parser.add_argument('--linearize', action='store_true', help='Linearize for fast first-page view')
+    args = parser.parse_args()
+
+    if pikepdf is None:
+        print('[FATAL] pikepdf not installed. Run: pip install pikepdf')
+        sys.exit(1)
+    if not args.paths and not args.documents:
+        parser.error('give PDF paths or --documents')
+
+    sources = []
+    for pattern in args.paths:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            with open(path, 'rb') as f:
+                sources.append((path, f.read()))
+    if args.documents:
+        sources.extend(_document_sources())
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    total_before = total_after = 0
+    for name, data in sources:
+        start = time.perf_counter()
+        stats = {}
+        optimized = optimize_pdf(data, linearize=args.linearize, stats=stats)
+        _report_line(os.path.basename(name), len(data), len(optimized), (time.perf_counter() - start) * 1000, stats)
+        total_before += len(data)
+        total_after += len(optimized)
+        target = None
+        if args.in_place and os.path.exists(name):
+            target = name
+        elif args.out_dir:
+            filename = os.path.basename(name)
+            target = os.path.join(args.out_dir, filename if filename.endswith('.pdf') else f'{filename}.pdf')
+        if target:
+            with open(target, 'wb') as f:
+                f.write(optimized)
+
+    if total_before:
+        print(f'{len(sources)} PDFs: {total_before / 1024:.0f} KB -> {total_after / 1024:.0f} KB '
+              f'({(1 - total_after / total_before) * 100:.1f}% smaller)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+render_cache.py — Content-addressed on-disk cache for generated documents
+
+Most renders repeat: the Safe Harbor documents take no inputs, and the
+same NPPES form is downloaded again and again. Each render is stored under
+a key that hashes
+
+    document type + generator_version() + canonical JSON of the params
+
+with volatile params (the caller's timestamp) left out of the key. A repeat
+request therefore costs a file read. A cached document keeps the
+generation timestamp of its first render, which is when that exact
+content was produced.
+
+Entries are files under the cache directory (default .render-cache, or
+$RENDER_CACHE_DIR), fanned out by key prefix:
+
+    .render-cache/3f/3f9c...e1.bin
+
+Each hit bumps the file's mtime. When the directory grows past max_bytes,
+the least recently used entries are deleted until it is back under 90% of
+the bound. Writes are atomic, so several processes can share one cache.
+
+Usage as a module:
+    from render_cache import RenderCache, render_with_cache
+    cache = RenderCache()
+    data, hit = render_with_cache(cache, 'nppes-form', payload)
+
+Usage standalone:
+    python scripts/render_cache.py render compliance-roadmap -o roadmap.pdf
+    python scripts/render_cache.py render nppes-form --params form.json -o form.pdf
+    python scripts/render_cache.py stats | prune | clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from document_renderers import DOCUMENTS, document_filename, generator_version, render_document
+
+DEFAULT_CACHE_DIR = os.environ.get('RENDER_CACHE_DIR', '.render-cache')
+DEFAULT_MAX_MB = 512
+PRUNE_TO = 0.9  # fraction of max_bytes left after an eviction pass
+
+# Params that vary per request without changing the document content
+VOLATILE_PARAMS = ('timestamp', 'generated_at')
+
+
+def cache_key(doc_type, params=None):
+    """Content address for one render."""
+    content = {k: v for k, v in (params or {}).items() if k not in VOLATILE_PARAMS}
+    blob = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    h = hashlib.sha256(f'{doc_type}:{generator_version(doc_type)}:'.encode())
+    h.update(blob.encode('utf-8'))
+    return h.hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered documents on disk."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.bin')
+
+    def _entries(self):
+        """(path, size, mtime) for every cached document."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.bin'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue  # evicted by another process
+                yield path, st.st_size, st.st_mtime
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self.lock:
+            self.size += len(data)
+            over = self.size > self.max_bytes
+        if over:
+            self.prune()
+
+    def prune(self, target=None):
+        """Evict least recently used entries down to target bytes (default 90% of max)."""
+        target = self.max_bytes * PRUNE_TO if target is None else target
+        with self.lock:
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            self.size = total
+        return removed
+
+    def clear(self):
+        with self.lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.makedirs(self.directory, exist_ok=True)
+            self.size = 0
+
+    def stats(self):
+        entries = list(self._entries())
+        with self.lock:
+            return {
+                'directory': self.directory,
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+def render_with_cache(cache, doc_type, params=None, render=render_document):
+    """Cached bytes for a render, rendering (and storing) on a miss.
+
+    Returns (bytes, hit). render is called as render(doc_type, params) and
+    may be swapped for one that runs elsewhere (e.g. a worker pool).
+    """
+    if cache is None:
+        return render(doc_type, params), False
+    key = cache_key(doc_type, params)
+    data = cache.get(key)
+    if data is not None:
+        return data, True
+    data = render(doc_type, params)
+    cache.put(key, data)
+    return data, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render through, inspect or prune the document render cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--max-mb', type=int, default=DEFAULT_MAX_MB)
+    sub = parser.add_subparsers(dest='command', required=True)
+    render_cmd = sub.add_parser('render', help='Render one document through the cache')
+    render_cmd.add_argument('doc_type', choices=list(DOCUMENTS))
+    render_cmd.add_argument('-o', '--output', help='Output path (default: the document filename)')
+    render_cmd.add_argument('--params', help='JSON file with render parameters (nppes-form payload)')
+    sub.add_parser('stats', help='Show entry count and size')
+    sub.add_parser('prune', help='Evict least recently used entries down to 90%% of --max-mb')
+    sub.add_parser('clear', help='Delete every entry')
+    args = parser.parse_args()
+
+    cache = RenderCache(args.cache_dir, args.max_mb * 1024 * 1024)
+
+    if args.command == 'render':
+        params = {}
+        if args.params:
+            with open(args.params, 'r', encoding='utf-8') as f:
+                params = json.load(f)
+        start = time.time()
+        data, hit = render_with_cache(cache, args.doc_type, params)
+        output = args.output or document_filename(args.doc_type, params)
+        with open(output, 'wb') as f:
+            f.write(data)
+        print(f"{args.doc_type}: {output} ({len(data) / 1024:.0f} KB) "
+              f"{'cache hit' if hit else 'rendered'} in {(time.time() - start) * 1000:.0f}ms")
+    elif args.command == 'stats':
+        s = cache.stats()
+        print(f"{s['directory']}: {s['entries']:,} entries, {s['bytes'] / 1e6:.1f} MB "
+              f"of {s['max_bytes'] / 1e6:.0f} MB")
+    elif args.command == 'prune':
+        print(f'Evicted {cache.prune():,} entries')
+    else:
+        cache.clear()
+        print(f'Cleared {args.cache_dir}')
+
+
+if __name__ == '__main__':
+    main()
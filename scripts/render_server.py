@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+render_server.py — Long-lived local render service for generated documents
+
+Every NPPES form and Safe Harbor document used to start a fresh Python
+process: interpreter startup, reportlab/openpyxl imports and style setup on
+every request. This server keeps a pool of worker processes with all
+generators imported and styles built (document_renderers.warm), and serves
+render jobs over local HTTP or a Unix socket. Jobs go through the on-disk
+render cache (render_cache.py) first, so a repeat render is a file read and
+never reaches the pool.
+
+The app's render routes (/api/workflows/nppes-form, /api/admin/generate-asset)
+call it through lib/documents/render-client.ts when RENDER_SERVER_URL or
+RENDER_SERVER_SOCKET is set, and spawn the generator script when it is not
+or the server is unreachable.
+
+Endpoints:
+    POST /render/<doc_type>   JSON body = render params ({} for Safe Harbor docs)
+                              → document bytes, streamed back with
+                                Content-Type, Content-Disposition,
+                                X-Render-Ms (in the worker, 0 on a hit),
+                                X-Total-Ms, X-Cache (hit | miss | off)
+    GET  /health              → {"status", "workers", "documents", "unavailable"}
+    GET  /stats               → per-document jobs, cache hits, p50/p95/max latency (ms),
+                                and cache size
+
+Usage:
+    python scripts/render_server.py [--port 8765] [--workers 4]
+    python scripts/render_server.py --socket /tmp/kairologic-render.sock
+    python scripts/render_server.py --cache-dir /var/cache/kairologic --cache-mb 2048 | --no-cache
+
+    curl -s -X POST localhost:8765/render/nppes-form -d @form.json -o form.pdf
+    curl -s --unix-socket /tmp/kairologic-render.sock -X POST http://x/render/compliance-roadmap -o roadmap.pdf
+
+Requires:
+  pip install reportlab openpyxl
+"""
+
+import argparse
+import json
+import math
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from document_renderers import DOCUMENTS, UnknownDocument, content_type, document_filename, render_document, warm
+from render_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_MB, RenderCache, render_with_cache
+
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+STREAM_CHUNK = 64 * 1024
+LATENCY_WINDOW = 1000     # recent jobs kept per document type for /stats
+MAX_BODY = 1024 * 1024
+
+
+# ── Worker side ──────────────────────────────────────────
+
+def _warm_worker():
+    warm()
+
+
+def _render_job(doc_type, params):
+    """Runs in a pool worker. Returns (bytes, render_ms)."""
+    start = time.perf_counter()
+    data = render_document(doc_type, params)
+    return data, (time.perf_counter() - start) * 1000
+
+
+# ── Latency tracking ─────────────────────────────────────
+
+class LatencyStats:
+    """Recent per-document latencies for /stats."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.hits = defaultdict(int)
+
+    def add(self, doc_type, total_ms, ok=True, hit=False):
+        with self.lock:
+            self.counts[doc_type] += 1
+            self.hits[doc_type] += hit
+            if ok:
+                self.samples[doc_type].append(total_ms)
+            else:
+                self.errors[doc_type] += 1
+
+    def summary(self):
+        with self.lock:
+            out = {}
+            for doc_type, count in self.counts.items():
+                ms = sorted(self.samples[doc_type])
+                pick = (lambda q: round(ms[max(0, math.ceil(q * len(ms)) - 1)], 1)) if ms else (lambda q: None)
+                out[doc_type] = {
+                    'jobs': count,
+                    'errors': self.errors[doc_type],
+                    'cache_hits': self.hits[doc_type],
+                    'p50_ms': pick(0.50),
+                    'p95_ms': pick(0.95),
+                    'max_ms': round(ms[-1], 1) if ms else None,
+                }
+            return out
+
+
+# ── HTTP ─────────────────────────────────────────────────
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = 'KairoLogicRender/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self):
+        # Unix-socket clients have no (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            sys.stderr.write(f'[render] {fmt % args}\n')
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {
+                'status': 'ok',
+                'workers': self.server.workers,
+                'documents': [d for d in DOCUMENTS if d not in self.server.unavailable],
+                'unavailable': self.server.unavailable,
+            })
+        elif self.path == '/stats':
+            summary = self.server.stats.summary()
+            if self.server.cache:
+                summary['_cache'] = self.server.cache.stats()
+            self._send_json(200, summary)
+        else:
+            self._send_json(404, {'error': f'Not found: {self.path}'})
+
+    def do_POST(self):
+        prefix = '/render/'
+        if not self.path.startswith(prefix):
+            self._send_json(404, {'error': f'Not found: {self.path}'})
+            return
+        doc_type = self.path[len(prefix):].split('?', 1)[0]
+        start = time.perf_counter()
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY:
+            self._send_json(413, {'error': 'Request body too large'})
+            return
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}') if length else {}
+        except json.JSONDecodeError as e:
+            self._send_json(400, {'error': f'Invalid JSON: {e}'})
+            return
+
+        timing = {'render_ms': 0.0}
+
+        def render_in_pool(doc_type, params):
+            data, timing['render_ms'] = self.server.pool.submit(_render_job, doc_type, params).result()
+            return data
+
+        try:
+            ctype = content_type(doc_type)
+            filename = document_filename(doc_type, params)
+            data, hit = render_with_cache(self.server.cache, doc_type, params, render=render_in_pool)
+        except UnknownDocument as e:
+            self._send_json(404, {'error': str(e)})
+            return
+        except Exception as e:
+            total_ms = (time.perf_counter() - start) * 1000
+            self.server.stats.add(doc_type, total_ms, ok=False)
+            self._send_json(500, {'error': f'{type(e).__name__}: {e}'})
+            return
+
+        total_ms = (time.perf_counter() - start) * 1000
+        render_ms = timing['render_ms']
+        cache_state = 'off' if self.server.cache is None else 'hit' if hit else 'miss'
+        self.server.stats.add(doc_type, total_ms, hit=hit)
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('X-Render-Ms', f'{render_ms:.1f}')
+        self.send_header('X-Total-Ms', f'{total_ms:.1f}')
+        self.send_header('X-Cache', cache_state)
+        self.end_headers()
+        view = memoryview(data)
+        for i in range(0, len(data), STREAM_CHUNK):
+            self.wfile.write(view[i:i + STREAM_CHUNK])
+        self.log_message('%s %.1fms (render %.1fms, cache %s) %.0fKB',
+                         doc_type, total_ms, render_ms, cache_state, len(data) / 1024)
+
+    def log_request(self, code='-', size='-'):
+        # Successful renders get a per-job latency line instead (do_POST)
+        if not (self.command == 'POST' and str(code) == '200'):
+            super().log_request(code, size)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(server, pool, workers, unavailable, cache=None, quiet=False):
+    server.pool = pool
+    server.cache = cache
+    server.workers = workers
+    server.unavailable = unavailable
+    server.stats = LatencyStats()
+    server.quiet = quiet
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve document renders from warm worker processes')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--socket', help='Listen on this Unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Render processes')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Render cache directory')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_MAX_MB, help='Render cache size bound')
+    parser.add_argument('--no-cache', action='store_true', help='Render every job')
+    parser.add_argument('--quiet', action='store_true', help='No per-request log lines')
+    args = parser.parse_args()
+
+    # Warm in the parent too, so missing generators are reported at startup
+    unavailable = warm()
+    for doc_type, err in unavailable.items():
+        print(f'[WARN] {doc_type} unavailable: {err}')
+
+    cache = None if args.no_cache else RenderCache(args.cache_dir, args.cache_mb * 1024 * 1024)
+
+    pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_warm_worker)
+    # Start every worker now rather than on the first requests
+    for f in [pool.submit(time.sleep, 0.2) for _ in range(args.workers)]:
+        f.result()
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = ThreadingUnixHTTPServer(args.socket, RenderHandler)
+        where = f'unix:{args.socket}'
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), RenderHandler)
+        where = f'http://{args.host}:{args.port}'
+
+    print(f'Render server on {where} — {args.workers} workers, '
+          f'{len(DOCUMENTS) - len(unavailable)} document types, '
+          f"cache {'off' if cache is None else args.cache_dir}")
+    # Exit cleanly (socket removed, workers stopped) under a process manager too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        serve(server, pool, args.workers, unavailable, cache, args.quiet)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown(cancel_futures=True)
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+roster_diff.py — Snapshot + merge-diff for board rosters
+
+A board roster load (TMB PHY quarterly, CA Medical Board weekly) used to
+rewrite every license. Instead,
+each load keeps a snapshot of what it wrote: one compact line per license,
+sorted by license number, gzip-compressed:
+
+    license_number <TAB> fingerprint <TAB> license_status <TAB> licensee_name [<TAB> flag]
+
+The fingerprint is a short hash of the upserted record minus sync timestamps,
+so it only moves when a column we write actually changes. The next load
+sorts its own entries and merge-joins them against the old snapshot as a
+stream (neither side is loaded into a dict), producing:
+
+  - the set of licenses to upsert (added or changed)
+  - status-transition events: old → new license_status, license, name
+  - licenses whose optional flag column turned on (e.g. has_disciplinary_action)
+  - counts of added / removed / unchanged licenses
+
+Events are written as JSON lines, one per transition, for the newsroom
+monitor and workflow triggers to consume.
+
+Large rosters sort their entries through a SortedSpool: entries are sorted
+in runs of SORT_RUN_ENTRIES and spilled to gzip temp files, then merged
+back in key order, so memory is bounded by one run however many licenses
+the roster has.
+
+Usage as a module:
+    from roster_diff import SortedSpool, snapshot_entry, diff_snapshot, write_snapshot
+    with SortedSpool() as entries:
+        for r in records:
+            entries.add(snapshot_entry(r))
+        diff = diff_snapshot(read_snapshot(path), entries)
+        write_snapshot(path, entries)
+
+Usage standalone (compare two snapshots):
+    python scripts/roster_diff.py old.tsv.gz new.tsv.gz [--events events.jsonl]
+"""
+
+import argparse
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+
+# Columns that change on every load without the data changing
+VOLATILE_FIELDS = ('last_synced_at', 'updated_at', 'source_updated_at')
+
+SORT_RUN_ENTRIES = 250_000  # entries held in memory per SortedSpool run
+
+
+# ── Entries ──────────────────────────────────────────────
+
+def record_fingerprint(record, exclude=VOLATILE_FIELDS):
+    """Short, stable hash of a record's content, ignoring sync timestamps."""
+    content = {k: v for k, v in record.items() if k not in exclude}
+    blob = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(blob.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _clean(value):
+    return (value or '').replace('\t', ' ').replace('\n', ' ')
+
+
+def snapshot_entry(record, key='license_number', status='license_status', name='licensee_name', flag=None):
+    """Compact (key, fingerprint, status, name[, flag]) tuple for one record.
+
+    With flag set, a fifth column records whether that boolean field is
+    truthy ('1' or ''), so the diff can report when it turns on.
+    """
+    entry = (record[key], record_fingerprint(record),
+             _clean(record.get(status)), _clean(record.get(name)))
+    if flag:
+        entry += ('1' if record.get(flag) else '',)
+    return entry
+
+
+# ── Snapshot file ────────────────────────────────────────
+
+def read_snapshot(path):
+    """Stream (key, fingerprint, status, name[, flag]) tuples from a snapshot, in key order."""
+    if not path or not os.path.exists(path):
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) in (4, 5):
+                yield tuple(parts)
+
+
+def write_snapshot(path, entries):
+    """Atomically write sorted entries as the new snapshot."""
+    tmp = path + '.tmp'
+    with gzip.open(tmp, 'wt', encoding='utf-8', compresslevel=6) as f:
+        for entry in entries:
+            f.write('\t'.join(entry) + '\n')
+    os.replace(tmp, path)
+
+
+def invalidate_snapshot(path, keys):
+    """Blank the fingerprint of keys in a snapshot, streaming it.
+
+    Used when rows the snapshot describes were overwritten by another load:
+    the next roster load sees those licenses as changed and rewrites them,
+    while every other license still diffs. Returns the number invalidated.
+    """
+    if not keys or not path or not os.path.exists(path):
+        return 0
+    invalidated = 0
+
+    def entries():
+        nonlocal invalidated
+        for entry in read_snapshot(path):
+            if entry[0] in keys:
+                invalidated += 1
+                entry = (entry[0], '') + entry[2:]
+            yield entry
+
+    write_snapshot(path, entries())
+    return invalidated
+
+
+# ── External sort ────────────────────────────────────────
+
+class SortedSpool:
+    """Sort snapshot entries that may not fit in memory.
+
+    add() entries in any order, then iterate them in key order as often as
+    needed; when a key is added more than once the last one wins. Sorted
+    runs of run_entries are spilled to gzip temp files and merged on
+    iteration. Use as a context manager so the temp files are removed.
+    """
+
+    def __init__(self, run_entries=SORT_RUN_ENTRIES, tmp_dir=None):
+        self.run_entries = run_entries
+        self.tmp_dir = tmp_dir
+        self._buffer = []
+        self._runs = []
+        self._seq = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, entry):
+        self._buffer.append((entry[0], self._seq, entry))
+        self._seq += 1
+        if len(self._buffer) >= self.run_entries:
+            self._spill()
+
+    def _spill(self):
+        self._buffer.sort()
+        fd, path = tempfile.mkstemp(prefix='roster-run-', suffix='.tsv.gz', dir=self.tmp_dir)
+        os.close(fd)
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=1) as f:
+            for key, seq, entry in self._buffer:
+                f.write(f'{seq}\t' + '\t'.join(entry) + '\n')
+        self._runs.append(path)
+        self._buffer = []
+
+    @staticmethod
+    def _read_run(path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                seq, _, rest = line.rstrip('\n').partition('\t')
+                entry = tuple(rest.split('\t'))
+                yield entry[0], int(seq), entry
+
+    def __iter__(self):
+        self._buffer.sort()
+        streams = [self._read_run(path) for path in self._runs] + [iter(self._buffer)]
+        previous = None
+        for key, seq, entry in heapq.merge(*streams):
+            if previous is not None and previous[0] != key:
+                yield previous
+            previous = entry
+        if previous is not None:
+            yield previous
+
+    def close(self):
+        for path in self._runs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._runs = []
+        self._buffer = []
+
+
+# ── Merge-diff ───────────────────────────────────────────
+
+def merge_join(old_entries, new_entries):
+    """Merge two key-sorted entry streams. Yields (old or None, new or None) pairs."""
+    old_iter = iter(old_entries)
+    new_iter = iter(new_entries)
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            yield old, None
+            old = next(old_iter, None)
+        elif old is None or new[0] < old[0]:
+            yield None, new
+            new = next(new_iter, None)
+        else:
+            yield old, new
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+
+
+def diff_snapshot(old_entries, new_entries):
+    """Diff a previous snapshot against new entries (both sorted by key).
+
+    Returns {'changed': set of keys to upsert, 'events': [transition dicts],
+    'flagged': [licenses whose flag turned on],
+    'counts': Counter(added, changed, removed, unchanged)}.
+    """
+    changed = set()
+    events = []
+    flagged = []
+    counts = Counter()
+
+    for old, new in merge_join(old_entries, new_entries):
+        if new is None:
+            counts['removed'] += 1
+        elif old is None:
+            counts['added'] += 1
+            changed.add(new[0])
+        elif old[1] == new[1]:
+            counts['unchanged'] += 1
+        else:
+            counts['changed'] += 1
+            changed.add(new[0])
+            if old[2] != new[2]:
+                events.append({
+                    'license_number': new[0],
+                    'licensee_name': new[3],
+                    'old_status': old[2],
+                    'new_status': new[2],
+                })
+            # A flag can only turn on when the fingerprint moves
+            if len(new) > 4 and new[4] and not (len(old) > 4 and old[4]):
+                flagged.append({
+                    'license_number': new[0],
+                    'licensee_name': new[3],
+                    'license_status': new[2],
+                })
+
+    return {'changed': changed, 'events': events, 'flagged': flagged, 'counts': counts}
+
+
+def write_events(path, events, **context):
+    """Write transition events as JSON lines, each tagged with context fields."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps({**context, **event}) + '\n')
+
+
+def print_diff(diff, label, flag_label='Newly flagged'):
+    counts = diff['counts']
+    print(f"[{label}] Diff vs previous snapshot: "
+          f"{counts['added']:,} added, {counts['changed']:,} changed, "
+          f"{counts['removed']:,} removed, {counts['unchanged']:,} unchanged")
+    transitions = Counter((e['old_status'], e['new_status']) for e in diff['events'])
+    if transitions:
+        print(f"  Status transitions: {len(diff['events']):,}")
+        for (old, new), n in transitions.most_common(10):
+            print(f"    {n:>6,}  {old} → {new}")
+    if diff['flagged']:
+        print(f"  {flag_label}: {len(diff['flagged']):,}")
+        for f in diff['flagged'][:10]:
+            print(f"    {f['license_number']}  {f['licensee_name']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff two roster snapshots')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--events', help='Write status transitions here (JSONL)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.new):
+        print(f'[FATAL] Snapshot not found: {args.new}')
+        sys.exit(1)
+
+    diff = diff_snapshot(read_snapshot(args.old), read_snapshot(args.new))
+    print_diff(diff, 'DIFF')
+    if args.events:
+        write_events(args.events, diff['events'])
+        print(f"  Events written: {args.events}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+KairoLogic Safe Harbor — Full Kit Build
+Renders the five kit PDFs and the Evidence Ledger XLSX concurrently
+
+Each document renders in its own worker process (the generators are
+CPU-bound reportlab/openpyxl code), so the whole kit takes about as long as
+the slowest single document. The shared style module is imported once in
+the parent before the pool starts. PDFs are shrunk with
+scripts/pdf_optimize.py after rendering (--no-optimize to skip).
+
+Usage:
+    npm run build-kit -- --out-dir /mnt/user-data/outputs
+    python scripts/safe-harbor/build_kit.py [--out-dir DIR] [--docs roadmap,ledger] [--practice practice.json]
+
+Requires:
+  pip install reportlab openpyxl
+  pip install pikepdf   # optional: PDF size optimization
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_optimize import optimize_file  # noqa: E402
+
+# key → (generator module, output file)
+KIT = {
+    'policy': ('generate_policy_pdf', 'SB1188_Data_Sovereignty_Policy_Pack.pdf'),
+    'impl-guide': ('generate_impl_guide', 'Safe_Harbor_Implementation_Guide.pdf'),
+    'ai-kit': ('generate_ai_kit', 'AI_Disclosure_Kit.pdf'),
+    'staff-guide': ('generate_staff_guide', 'Staff_Training_Guide.pdf'),
+    'roadmap': ('generate_roadmap', 'Compliance_Roadmap.pdf'),
+    'ledger': ('generate_evidence_ledger', 'Evidence_Ledger.xlsx'),
+}
+
+# Generators that take a practice dict (cover / signature personalization,
+# DR-04 vendor prefill in the ledger)
+PERSONALIZED = {'policy', 'impl-guide', 'ai-kit', 'staff-guide', 'roadmap', 'ledger'}
+
+DEFAULT_OUT_DIR = '/mnt/user-data/outputs'
+
+
+def build_document(key, out_dir, practice=None, optimize=True):
+    """Worker job: render one document. Returns (key, path, bytes, ms)."""
+    start = time.perf_counter()
+    module_name, filename = KIT[key]
+    module = importlib.import_module(module_name)
+    path = os.path.join(out_dir, filename)
+    if practice and key in PERSONALIZED:
+        module.render(path, practice)
+    else:
+        module.render(path)
+    if optimize and path.endswith('.pdf'):
+        optimize_file(path)
+    return key, path, os.path.getsize(path), (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the full Safe Harbor kit in parallel')
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR)
+    parser.add_argument('--docs', default=','.join(KIT), help=f"Comma-separated subset of: {', '.join(KIT)}")
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per document)')
+    parser.add_argument('--practice', help='JSON file with {name, npi, findings} to personalize the kit')
+    parser.add_argument('--no-optimize', action='store_true', help='Write PDFs as rendered (skip pdf_optimize)')
+    args = parser.parse_args()
+
+    keys = [k.strip() for k in args.docs.split(',') if k.strip()]
+    unknown = [k for k in keys if k not in KIT]
+    if unknown:
+        print(f"[FATAL] Unknown documents: {', '.join(unknown)}. Valid: {', '.join(KIT)}")
+        sys.exit(1)
+    practice = None
+    if args.practice:
+        with open(args.practice, 'r', encoding='utf-8') as f:
+            practice = json.load(f)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    # Forked workers inherit the imported reportlab and shared styles
+    import kit_style  # noqa: F401
+
+    start = time.time()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers or len(keys)) as pool:
+        futures = {pool.submit(build_document, k, args.out_dir, practice, not args.no_optimize): k for k in keys}
+        for fut in as_completed(futures):
+            try:
+                key, path, size, ms = fut.result()
+            except Exception as e:
+                failed += 1
+                print(f'  [ERROR] {futures[fut]}: {type(e).__name__}: {e}')
+                continue
+            print(f'  {key:<12} {ms:>7.0f}ms  {size / 1024:>6.0f} KB  {path}')
+
+    print(f'Kit built: {len(keys) - failed}/{len(keys)} documents in {(time.time() - start) * 1000:.0f}ms')
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
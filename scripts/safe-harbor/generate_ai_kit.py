@@ -16,90 +16,20 @@ from reportlab.platypus import (
 )
 import os
 
-# ═══ COLORS ═══
-NAVY = HexColor('#0B1E3D')
-NAVY_LIGHT = HexColor('#1A3A5F')
-GOLD = HexColor('#D4A574')
-GOLD_DARK = HexColor('#B88F5F')
-ORANGE = HexColor('#FF6B35')
-WHITE = HexColor('#FFFFFF')
-GRAY_50 = HexColor('#F9FAFB')
-GRAY_100 = HexColor('#F3F4F6')
-GRAY_200 = HexColor('#E5E7EB')
-GRAY_400 = HexColor('#9CA3AF')
-GRAY_500 = HexColor('#6B7280')
-GRAY_700 = HexColor('#374151')
-GRAY_900 = HexColor('#111827')
-RED_50 = HexColor('#FEF2F2')
-RED_600 = HexColor('#DC2626')
-RED_700 = HexColor('#B91C1C')
-GREEN_50 = HexColor('#F0FDF4')
-GREEN_600 = HexColor('#059669')
-GREEN_700 = HexColor('#047857')
-BLUE_50 = HexColor('#EFF6FF')
-BLUE_600 = HexColor('#2563EB')
-BLUE_700 = HexColor('#1D4ED8')
-AMBER_50 = HexColor('#FFFBEB')
-AMBER_600 = HexColor('#D97706')
-PURPLE_50 = HexColor('#FAF5FF')
-PURPLE_600 = HexColor('#9333EA')
+from kit_style import (
+    NAVY, NAVY_LIGHT, GOLD, WHITE, GRAY_50, GRAY_100, GRAY_200, GRAY_400, GRAY_500,
+    GRAY_700, GRAY_900, RED_50, RED_600, RED_700, GREEN_50, GREEN_600, BLUE_50, BLUE_600,
+    AMBER_50, AMBER_600, PURPLE_50, PURPLE_600, STYLES, SECTION_NUM, page_chrome,
+    styled_box
+)
 
 # ═══ STYLES ═══
-S = {}
-S['title'] = ParagraphStyle('Title', fontName='Helvetica-Bold', fontSize=22, leading=28, textColor=NAVY, spaceAfter=6)
-S['h1'] = ParagraphStyle('H1', fontName='Helvetica-Bold', fontSize=14, leading=20, textColor=NAVY, spaceBefore=20, spaceAfter=10)
-S['h2'] = ParagraphStyle('H2', fontName='Helvetica-Bold', fontSize=11, leading=16, textColor=NAVY_LIGHT, spaceBefore=14, spaceAfter=6)
-S['h3'] = ParagraphStyle('H3', fontName='Helvetica-Bold', fontSize=10, leading=14, textColor=NAVY, spaceBefore=10, spaceAfter=4)
-S['body'] = ParagraphStyle('Body', fontName='Helvetica', fontSize=10, leading=15, textColor=GRAY_700, spaceAfter=8, alignment=TA_JUSTIFY)
-S['body_bold'] = ParagraphStyle('BodyBold', fontName='Helvetica-Bold', fontSize=10, leading=15, textColor=GRAY_900, spaceAfter=8, alignment=TA_JUSTIFY)
-S['bullet'] = ParagraphStyle('Bullet', fontName='Helvetica', fontSize=10, leading=15, textColor=GRAY_700, spaceAfter=4, leftIndent=24, bulletIndent=12)
-S['sub_bullet'] = ParagraphStyle('SubBullet', fontName='Helvetica', fontSize=9.5, leading=14, textColor=GRAY_700, spaceAfter=3, leftIndent=42, bulletIndent=30)
-S['small'] = ParagraphStyle('Small', fontName='Helvetica', fontSize=8.5, leading=12, textColor=GRAY_500, spaceAfter=4)
-S['asset_num'] = ParagraphStyle('AssetNum', fontName='Helvetica-Bold', fontSize=9, leading=12, textColor=GOLD_DARK, spaceAfter=2)
-S['sig_label'] = ParagraphStyle('SigLabel', fontName='Helvetica', fontSize=9, leading=13, textColor=GRAY_500, spaceAfter=2)
-S['toc_item'] = ParagraphStyle('TOCItem', fontName='Helvetica', fontSize=10, leading=18, textColor=NAVY, spaceAfter=2)
-
-
-def header_footer(canvas_obj, doc):
-    canvas_obj.saveState()
-    w, h = letter
-    canvas_obj.setFillColor(NAVY)
-    canvas_obj.rect(0, h - 42, w, 42, fill=True, stroke=False)
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.rect(0, h - 44, w, 2, fill=True, stroke=False)
-    canvas_obj.setFillColor(WHITE)
-    canvas_obj.setFont('Helvetica-Bold', 8)
-    canvas_obj.drawString(0.75 * inch, h - 28, 'KAIROLOGIC')
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.drawString(1.72 * inch, h - 28, '|  AI DISCLOSURE KIT')
-    canvas_obj.setFillColor(HexColor('#8899AA'))
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.drawRightString(w - 0.75 * inch, h - 28, 'HB 149 + SB 1188  |  STATUTORY CONTENT & ASSETS')
-    canvas_obj.setFillColor(GRAY_200)
-    canvas_obj.rect(0, 0, w, 36, fill=True, stroke=False)
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.rect(0, 36, w, 1.5, fill=True, stroke=False)
-    canvas_obj.setFillColor(GRAY_500)
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.drawString(0.75 * inch, 14, 'KairoLogic  |  AI Transparency Disclosure Kit  |  kairologic.com')
-    canvas_obj.drawRightString(w - 0.75 * inch, 14, f'Page {doc.page}')
-    canvas_obj.restoreState()
-
-
-def styled_box(text, bg_color, border_color, text_color=None, font='Helvetica', font_size=9.5):
-    tc = text_color or GRAY_700
-    content = Paragraph(text, ParagraphStyle('Box', fontName=font, fontSize=font_size, leading=font_size + 4, textColor=tc, alignment=TA_JUSTIFY))
-    t = Table([[content]], colWidths=[5.8 * inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), bg_color),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('BOX', (0, 0), (-1, -1), 1.5, border_color),
-    ]))
-    return t
+S = dict(STYLES)
+S['asset_num'] = SECTION_NUM
+
+
+header_footer = page_chrome('AI DISCLOSURE KIT', 'HB 149 + SB 1188  |  STATUTORY CONTENT & ASSETS',
+    'KairoLogic  |  AI Transparency Disclosure Kit  |  kairologic.com')
 
 
 def copy_ready_box(label, text, bg=GRAY_50, border=GRAY_400):
@@ -131,7 +61,7 @@ def asset_header(num, title):
     ]
 
 
-def build_cover():
+def build_cover(practice=None):
     elements = []
     elements.append(Spacer(1, 1.0 * inch))
 
@@ -195,6 +125,9 @@ def build_cover():
         ['Classification:', 'Client Deliverable \u2014 Safe Harbor\u2122 Bundle'],
         ['Customization:', 'Replace all [Practice Name] placeholders with your legal entity name'],
     ]
+    if practice:
+        npi = f"  |  NPI {practice['npi']}" if practice.get('npi') else ''
+        meta.insert(0, ['Prepared For:', practice['name'] + npi])
     mt = Table(meta, colWidths=[1.6 * inch, 4.0 * inch])
     mt.setStyle(TableStyle([
         ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
@@ -264,7 +197,7 @@ def build_assets():
         'deployed disclosure as evidence. If you use WordPress, add a "Custom HTML" widget to your footer area. '
         'For Squarespace or Wix, use the site-wide footer injection setting. The KairoLogic Sentry engine will '
         'automatically detect this disclosure during its next scan cycle.',
-        HexColor('#FFF8F0'), GOLD, NAVY))
+        HexColor('#FFF8F0'), GOLD, NAVY, leading=13.5))
     elements.append(Spacer(1, 6))
 
     # Compact version
@@ -344,7 +277,7 @@ def build_assets():
         'a large patient base, consider including the form in a mass mailing or patient portal notification '
         'with a request to sign and return at next visit. Document your distribution method and date for '
         'compliance records.',
-        HexColor('#FFF8F0'), GOLD, NAVY))
+        HexColor('#FFF8F0'), GOLD, NAVY, leading=13.5))
 
     elements.append(PageBreak())
 
@@ -470,7 +403,7 @@ def build_assets():
         'If a question exceeds the scope of these scripts, the correct response is: "That\'s a great question. '
         'Let me connect you with our [Compliance Officer/Practice Manager] who can give you the most accurate '
         'information." Document all AI-related patient inquiries in a log for compliance records.',
-        HexColor('#FFF8F0'), GOLD, NAVY))
+        HexColor('#FFF8F0'), GOLD, NAVY, leading=13.5))
 
     # ═══ ASSET 5: STAFF GUIDELINES ═══
     elements.extend(asset_header('5', 'Staff AI Usage Guidelines'))
@@ -544,7 +477,7 @@ def build_assets():
         '<b>HIPAA REMINDER:</b> Never acknowledge that the reviewer is a patient, reference specific treatments, '
         'or disclose any health information in a public response. The template above is designed to address '
         'the concern without confirming or denying a patient relationship.',
-        RED_50, RED_600, RED_700))
+        RED_50, RED_600, RED_700, leading=13.5))
 
     # ═══ ASSET 7: WAITING ROOM SIGNAGE ═══
     elements.extend(asset_header('7', 'Waiting Room &amp; Patient-Facing Signage'))
@@ -647,7 +580,7 @@ def build_assets():
         'Forensic Evidence Ledger folder as: [VendorName]-AI-Verification-[Date].pdf. Log the vendor\'s '
         'response, the date received, and the respondent\'s name in your Evidence Ledger spreadsheet. '
         'This documentation is your strongest Safe Harbor evidence.',
-        HexColor('#FFF8F0'), GOLD, NAVY))
+        HexColor('#FFF8F0'), GOLD, NAVY, leading=13.5))
 
     elements.append(PageBreak())
 
@@ -706,11 +639,10 @@ def build_assets():
     return elements
 
 
-def main():
-    output_path = '/mnt/user-data/outputs/AI_Disclosure_Kit.pdf'
-
-    doc = SimpleDocTemplate(
-        output_path,
+def make_doc(output):
+    """Page template for the AI Disclosure Kit (full renders and kit pieces)."""
+    return SimpleDocTemplate(
+        output,
         pagesize=letter,
         topMargin=0.85 * inch,
         bottomMargin=0.7 * inch,
@@ -721,11 +653,27 @@ def main():
         subject='HB 149 + SB 1188 AI Transparency Compliance Kit',
     )
 
+
+# Story order. 'practice' sections take the practice dict (None = generic)
+SECTIONS = [
+    (build_cover, 'practice'),
+    (build_assets, 'static'),
+]
+
+
+def render(output, practice=None):
+    """Build the AI Disclosure Kit into output (a path or a binary file object),
+    personalized for practice ({name, npi, ...}) when given."""
     story = []
-    story.extend(build_cover())
-    story.extend(build_assets())
+    for builder, kind in SECTIONS:
+        story.extend(builder(practice) if kind == 'practice' else builder())
+    make_doc(output).build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+
+
+def main():
+    output_path = '/mnt/user-data/outputs/AI_Disclosure_Kit.pdf'
 
-    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+    render(output_path)
     print(f'PDF generated: {output_path}')
     print(f'File size: {os.path.getsize(output_path) / 1024:.0f} KB')
 
@@ -1,31 +1,30 @@
 import sys
 #!/usr/bin/env python3
-"""KairoLogic Safe Harbor Evidence Ledger - Professional XLSX"""
+"""
+KairoLogic Safe Harbor Evidence Ledger - Professional XLSX
+
+Written with openpyxl's write-only (streaming) workbook: rows go straight
+to the sheet XML as they are appended, and every cell refers to one of the
+ledger's named styles instead of carrying its own Font/Fill/Border, so
+memory stays flat however many ledgers a process builds.
+
+Personalized ledgers (render(output, practice)) carry the practice name and
+have the Digital Supply Chain tab prefilled from the practice's DR-04 scan
+finding: every third-party endpoint becomes a vendor row to verify.
+"""
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
-from openpyxl.comments import Comment
+import json
 import subprocess
 
-NAVY = '0B1E3D'
-NAVY_LIGHT = '1A3A5F'
-GOLD = 'D4A574'
-GOLD_DARK = 'B88F5F'
-WHITE = 'FFFFFF'
-GRAY_50 = 'F9FAFB'
-GRAY_100 = 'F3F4F6'
-GRAY_200 = 'E5E7EB'
-GRAY_500 = '6B7280'
-GRAY_700 = '374151'
-RED_50 = 'FEF2F2'
-RED_600 = 'DC2626'
-GREEN_50 = 'F0FDF4'
-GREEN_600 = '059669'
-AMBER_50 = 'FFFBEB'
-AMBER_600 = 'D97706'
-BLUE_50 = 'EFF6FF'
+from kit_brand import (
+    NAVY, NAVY_LIGHT, GOLD, GOLD_DARK, WHITE, GRAY_50, GRAY_200, GRAY_500, GRAY_700,
+    RED_50, RED_600, GREEN_50, GREEN_600, AMBER_50, AMBER_600, BLUE_50
+)
 
 thin_border = Border(
     left=Side(style='thin', color=GRAY_200),
@@ -60,64 +59,227 @@ blue_fill = PatternFill('solid', fgColor=BLUE_50)
 
 example_font = Font(name='Arial', size=10, italic=True, color=GRAY_500)
 
-
-def style_header_row(ws, row, cols):
-    for c in range(1, cols + 1):
-        cell = ws.cell(row=row, column=c)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_align
-        cell.border = header_border
-
-
-def style_data_row(ws, row, cols, is_example=False, is_alt=False):
-    for c in range(1, cols + 1):
-        cell = ws.cell(row=row, column=c)
-        cell.font = example_font if is_example else body_font
-        cell.fill = alt_fill if is_alt else white_fill
-        cell.alignment = body_align
-        cell.border = thin_border
-
-
-def add_title_block(ws, title, subtitle, start_row=1):
-    ws.cell(row=start_row, column=1, value=title).font = title_font
-    ws.cell(row=start_row + 1, column=1, value=subtitle).font = subtitle_font
+# Tabs 1-4: title block (3 rows), blank, instructions, blank, then the header
+HEADER_ROW = 7
+
+
+# ═══ NAMED STYLES ═══
+def _named(name, font=None, fill=None, alignment=None, border=None):
+    style = NamedStyle(name=name)
+    if font:
+        style.font = font
+    if fill:
+        style.fill = fill
+    if alignment:
+        style.alignment = alignment
+    if border:
+        style.border = border
+    return style
+
+
+def ledger_styles():
+    """Every cell style the ledger uses, as NamedStyles (fresh per workbook)."""
+    def bold(color):
+        return Font(name='Arial', size=10, bold=True, color=color)
+
+    def plain(color):
+        return Font(name='Arial', size=10, color=color)
+
+    styles = [
+        _named('kl_title', font=title_font),
+        _named('kl_subtitle', font=subtitle_font),
+        _named('kl_section', font=section_font),
+        _named('kl_note', font=Font(name='Arial', size=9, italic=True, color=GRAY_500)),
+        _named('kl_gold_bar', fill=gold_fill, border=Border(bottom=Side(style='thin', color=GOLD_DARK))),
+        _named('kl_header', font=header_font, fill=header_fill, alignment=header_align, border=header_border),
+        # Summary labels / values
+        _named('kl_label', font=plain(GRAY_700)),
+        _named('kl_label_muted', font=plain(GRAY_500)),
+        _named('kl_label_ok', font=plain(GREEN_600)),
+        _named('kl_label_pending', font=plain(AMBER_600)),
+        _named('kl_label_alert', font=plain(RED_600)),
+        _named('kl_value', font=bold(NAVY)),
+        _named('kl_value_plain', font=plain(NAVY)),
+        _named('kl_value_ok', font=bold(GREEN_600)),
+        _named('kl_value_pending', font=bold(AMBER_600)),
+        _named('kl_value_alert', font=bold(RED_600)),
+        # Status cells replace the row fill
+        _named('kl_status_ok', font=bold(GREEN_600), fill=green_fill, alignment=body_align, border=thin_border),
+        _named('kl_status_pending', font=bold(AMBER_600), fill=amber_fill, alignment=body_align, border=thin_border),
+        _named('kl_status_alert', font=bold(RED_600), fill=red_fill, alignment=body_align, border=thin_border),
+        # Instructions tab
+        _named('kl_doc_title', font=Font(name='Arial', size=16, bold=True, color=NAVY)),
+        _named('kl_doc_subtitle', font=Font(name='Arial', size=12, color=GRAY_500)),
+        _named('kl_gold_rule', fill=gold_fill),
+        _named('kl_topic', font=Font(name='Arial', size=11, bold=True, color=NAVY)),
+        _named('kl_topic_body', font=plain(GRAY_700), alignment=Alignment(wrap_text=True, vertical='top')),
+    ]
+    # Data rows: body / example text on white or striped fill, plus the
+    # risk-tier and "all clear" variants of each
+    for base, font in (('kl_body', body_font), ('kl_example', example_font)):
+        styles.append(_named(f'{base}_clear', font=font, fill=green_fill, alignment=body_align, border=thin_border))
+        for suffix, fill in (('', white_fill), ('_alt', alt_fill)):
+            styles.append(_named(f'{base}{suffix}', font=font, fill=fill, alignment=body_align, border=thin_border))
+    for suffix, fill in (('', white_fill), ('_alt', alt_fill)):
+        styles.append(_named(f'kl_tier_critical{suffix}', font=bold(RED_600), fill=fill, alignment=body_align, border=thin_border))
+        styles.append(_named(f'kl_tier_high{suffix}', font=bold(AMBER_600), fill=fill, alignment=body_align, border=thin_border))
+    return styles
+
+
+def data_style(is_example=False, is_alt=False):
+    return ('kl_example' if is_example else 'kl_body') + ('_alt' if is_alt else '')
+
+
+def status_style(value):
+    value = str(value or '')
+    if 'SOVEREIGN' in value or 'RESOLVED' in value:
+        return 'kl_status_ok'
+    if 'PENDING' in value or 'UNDER REVIEW' in value:
+        return 'kl_status_pending'
+    if 'NON-COMPLIANT' in value or 'OPEN' in value:
+        return 'kl_status_alert'
+    return None
+
+
+def tier_style(value, is_alt=False):
+    value = str(value or '')
+    suffix = '_alt' if is_alt else ''
+    if 'CRITICAL' in value:
+        return f'kl_tier_critical{suffix}'
+    if 'HIGH' in value:
+        return f'kl_tier_high{suffix}'
+    return None
+
+
+# ═══ STREAMING SHEET ═══
+class LedgerSheet:
+    """A write-only sheet and the number of the next row to append.
+
+    Column widths, tab color, freeze panes and row heights are written
+    ahead of the rows, so they are set here or passed to append().
+    """
+
+    def __init__(self, wb, title, tab_color, widths, freeze=None):
+        self.ws = wb.create_sheet(title)
+        self.ws.sheet_properties.tabColor = tab_color
+        for c, w in enumerate(widths, 1):
+            self.ws.column_dimensions[get_column_letter(c)].width = w
+        if freeze:
+            self.ws.freeze_panes = freeze
+        self.row = 1
+
+    def cell(self, value=None, style=None):
+        c = WriteOnlyCell(self.ws, value=value)
+        if style:
+            c.style = style
+        return c
+
+    def append(self, cells=(), height=None):
+        """Append one row of cells (or plain values). Returns its row number."""
+        if height:
+            self.ws.row_dimensions[self.row].height = height
+        self.ws.append(list(cells))
+        self.row += 1
+        return self.row - 1
+
+    def validate(self, formula, ref, **kwargs):
+        dv = DataValidation(type='list', formula1=formula, allow_blank=True, **kwargs)
+        self.ws.data_validations.append(dv)
+        dv.add(ref)
+        return dv
+
+
+def add_title_block(sheet, title, subtitle, note, note_cols):
+    sheet.append([sheet.cell(title, 'kl_title')])
+    sheet.append([sheet.cell(subtitle, 'kl_subtitle')])
     # Gold accent bar
-    for c in range(1, 12):
-        ws.cell(row=start_row + 2, column=c).fill = PatternFill('solid', fgColor=GOLD)
-        ws.cell(row=start_row + 2, column=c).border = Border(bottom=Side(style='thin', color=GOLD_DARK))
-    ws.row_dimensions[start_row + 2].height = 3
-    return start_row + 3
-
-
-def build_tab1_vendor_inventory(wb):
-    ws = wb.active
-    ws.title = 'Digital Supply Chain'
-    ws.sheet_properties.tabColor = NAVY
-
-    r = add_title_block(ws,
-        'DIGITAL SUPPLY CHAIN INVENTORY',
-        'SB 1188 Vendor Due Diligence Register  |  [Practice Name]  |  Effective: February 2026')
-
-    # Instructions
-    r += 1
-    ws.cell(row=r, column=1, value='INSTRUCTIONS: Document every vendor that accesses, stores, processes, or transmits patient data (PHI/PII). Update quarterly. Rows in italics are examples \u2014 replace with your actual vendors.').font = Font(name='Arial', size=9, italic=True, color=GRAY_500)
-    ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=11)
-    r += 2
-
+    sheet.append([sheet.cell(None, 'kl_gold_bar') for _ in range(11)], height=3)
+    sheet.append()
+    note_row = sheet.append([sheet.cell(note, 'kl_note')])
+    sheet.ws.merged_cells.add(f'A{note_row}:{get_column_letter(note_cols)}{note_row}')
+    sheet.append()
+
+
+def add_header_row(sheet, headers):
+    return sheet.append([sheet.cell(h, 'kl_header') for h in headers])
+
+
+def add_data_row(sheet, values, is_example=False, is_alt=False, overrides=None):
+    """One data row; overrides maps a 1-based column to a named style."""
+    base = data_style(is_example, is_alt)
+    overrides = overrides or {}
+    return sheet.append([sheet.cell(v, overrides.get(c) or base) for c, v in enumerate(values, 1)])
+
+
+def add_blank_rows(sheet, count, cols, first_number):
+    for i in range(count):
+        base = data_style(is_alt=(i % 2 == 1))
+        sheet.append([sheet.cell(str(first_number + i), base)] + [sheet.cell(None, base) for _ in range(cols - 1)])
+
+
+# ═══ SCAN PREFILL ═══
+def supply_chain_rows(practice):
+    """Digital Supply Chain rows for the third-party endpoints in a practice's
+    DR-04 finding, most severe first.
+
+    Reads both DR-04 evidence shapes: the site scanner's foreignPHI /
+    foreignStatic / checked lists and dr04_recrawl's non_us list. Only the
+    foreign endpoints were geolocated by the scan; 'checked' also holds
+    domains whose lookup failed or that were skipped as known US services,
+    so those rows are left Unverified for the practice to complete.
+    """
+    finding = next((f for f in practice.get('findings') or [] if f.get('id') == 'DR-04'), None)
+    if not finding:
+        return []
+    ev = finding.get('evidence') or {}
+    scanned = practice.get('scanned_at') or ''
+
+    vendors = {}
+
+    def add(domain, service, tier, location, status, verified=True):
+        if domain and domain not in vendors:
+            if verified:
+                proof = [scanned, 'DNS/IP Geolocation Audit', 'KairoLogic Sentry Scan']
+            else:
+                proof = ['', '', '']
+            vendors[domain] = [domain, service, tier, 'Pending Review', location, ''] + proof + [status]
+
+    for ep in ev.get('foreignPHI') or []:
+        add(ep.get('domain'), 'Form handler / API endpoint', 'CRITICAL', ep.get('country') or 'Non-US', 'NON-COMPLIANT')
+    for ep in ev.get('non_us') or []:
+        add(ep.get('domain'), 'Third-party website resource', 'HIGH', ep.get('country') or 'Non-US', 'UNDER REVIEW')
+    for ep in ev.get('foreignStatic') or []:
+        add(ep.get('domain'), 'Static asset (CSS/images/fonts)', 'MODERATE', ep.get('country') or 'Non-US', 'UNDER REVIEW')
+    for domain in ev.get('checked') or []:
+        add(domain, 'Third-party website resource', 'LOW', 'Unverified', 'PENDING', verified=False)
+
+    return [[str(i)] + row for i, row in enumerate(vendors.values(), 1)]
+
+
+# ═══ TABS ═══
+def build_tab1_vendor_inventory(wb, practice_name, vendor_rows=None):
     headers = [
         '#', 'Vendor Name', 'Service Provided', 'Risk Tier',
         'PHI Access?', 'Server Location', 'Cloud Region',
         'Verification Date', 'Proof Type', 'Verified By', 'Status'
     ]
     widths = [5, 22, 24, 14, 12, 20, 16, 16, 18, 16, 16]
+    sheet = LedgerSheet(wb, 'Digital Supply Chain', NAVY, widths, freeze=f'A{HEADER_ROW + 1}')
+
+    if vendor_rows:
+        note = ('INSTRUCTIONS: Rows were prefilled from your latest KairoLogic scan \u2014 one per third-party '
+                'endpoint your website loads. Confirm each vendor, fill in location and proof for rows marked '
+                'Unverified, add every other vendor that accesses, stores, processes, or transmits patient data '
+                '(PHI/PII), and update quarterly.')
+    else:
+        note = ('INSTRUCTIONS: Document every vendor that accesses, stores, processes, or transmits patient data '
+                '(PHI/PII). Update quarterly. Rows in italics are examples \u2014 replace with your actual vendors.')
+    add_title_block(sheet,
+        'DIGITAL SUPPLY CHAIN INVENTORY',
+        f'SB 1188 Vendor Due Diligence Register  |  {practice_name}  |  Effective: February 2026',
+        note, len(headers))
 
-    header_row = r
-    for c, (h, w) in enumerate(zip(headers, widths), 1):
-        ws.cell(row=r, column=c, value=h)
-        ws.column_dimensions[get_column_letter(c)].width = w
-    style_header_row(ws, r, len(headers))
-    r += 1
+    header_row = add_header_row(sheet, headers)
 
     # Example data
     examples = [
@@ -132,105 +294,67 @@ def build_tab1_vendor_inventory(wb):
         ['9', '[New Vendor]', '[Service]', '[Tier]', '[Yes/No]', '[Location]', '[Region]', '', '', '', 'PENDING'],
         ['10', '', '', '', '', '', '', '', '', '', ''],
     ]
+    rows, example_count = (vendor_rows, 0) if vendor_rows else (examples, 8)
 
-    for i, row_data in enumerate(examples):
-        for c, val in enumerate(row_data, 1):
-            ws.cell(row=r, column=c, value=val)
-        is_example = i < 8
-        style_data_row(ws, r, len(headers), is_example=(i < 8), is_alt=(i % 2 == 1))
-
-        # Color the Status column
-        status_cell = ws.cell(row=r, column=11)
-        if 'SOVEREIGN' in str(status_cell.value):
-            status_cell.fill = green_fill
-            status_cell.font = Font(name='Arial', size=10, bold=True, color=GREEN_600)
-        elif 'PENDING' in str(status_cell.value or ''):
-            status_cell.fill = amber_fill
-            status_cell.font = Font(name='Arial', size=10, bold=True, color=AMBER_600)
-
-        # Color Risk Tier
-        tier_cell = ws.cell(row=r, column=4)
-        tier_val = str(tier_cell.value or '')
-        if 'CRITICAL' in tier_val:
-            tier_cell.font = Font(name='Arial', size=10, bold=True, color=RED_600)
-        elif 'HIGH' in tier_val:
-            tier_cell.font = Font(name='Arial', size=10, bold=True, color=AMBER_600)
-
-        r += 1
+    for i, row_data in enumerate(rows):
+        is_alt = i % 2 == 1
+        # Color the Status and Risk Tier columns
+        overrides = {11: status_style(row_data[10]), 4: tier_style(row_data[3], is_alt)}
+        add_data_row(sheet, row_data, is_example=(i < example_count), is_alt=is_alt, overrides=overrides)
+    r = sheet.row
 
     # Add 20 more blank rows
-    for i in range(20):
-        row_num = r + i
-        ws.cell(row=row_num, column=1, value=str(11 + i))
-        for c in range(1, len(headers) + 1):
-            style_data_row(ws, row_num, len(headers), is_alt=(i % 2 == 1))
+    add_blank_rows(sheet, 20, len(headers), len(rows) + 1)
 
     # Data validations
-    dv_phi = DataValidation(type='list', formula1='"Yes,No (PII only),No,Pending Review"', allow_blank=True)
-    dv_phi.error = 'Select from list'
-    dv_phi.prompt = 'Does this vendor access PHI?'
-    ws.add_data_validation(dv_phi)
-    dv_phi.add(f'E{header_row+1}:E{r+20}')
-
-    dv_tier = DataValidation(type='list', formula1='"CRITICAL,HIGH,MODERATE,LOW"', allow_blank=True)
-    ws.add_data_validation(dv_tier)
-    dv_tier.add(f'D{header_row+1}:D{r+20}')
-
-    dv_status = DataValidation(type='list', formula1='"SOVEREIGN,PENDING,UNVERIFIED,NON-COMPLIANT,UNDER REVIEW"', allow_blank=True)
-    ws.add_data_validation(dv_status)
-    dv_status.add(f'K{header_row+1}:K{r+20}')
-
-    dv_proof = DataValidation(type='list', formula1='"SOC 2 Type II Report,SOC 2 Type I Report,Vendor Certificate,BAA + Server Letter,DPA + Residency Cert,DNS/IP Geolocation Audit,Email Confirmation,TOS Review,NPI Audit,Contract Review,Pending"', allow_blank=True)
-    ws.add_data_validation(dv_proof)
-    dv_proof.add(f'I{header_row+1}:I{r+20}')
+    sheet.validate('"Yes,No (PII only),No,Pending Review"', f'E{header_row+1}:E{r+20}',
+                   error='Select from list', prompt='Does this vendor access PHI?')
+    sheet.validate('"CRITICAL,HIGH,MODERATE,LOW"', f'D{header_row+1}:D{r+20}')
+    sheet.validate('"SOVEREIGN,PENDING,UNVERIFIED,NON-COMPLIANT,UNDER REVIEW"', f'K{header_row+1}:K{r+20}')
+    sheet.validate('"SOC 2 Type II Report,SOC 2 Type I Report,Vendor Certificate,BAA + Server Letter,DPA + Residency Cert,DNS/IP Geolocation Audit,Email Confirmation,TOS Review,NPI Audit,Contract Review,Pending"', f'I{header_row+1}:I{r+20}')
 
     # Summary section
-    sr = r + 22
-    ws.cell(row=sr, column=1, value='LEDGER SUMMARY').font = section_font
-    ws.cell(row=sr + 1, column=1, value='Total Vendors Inventoried:').font = Font(name='Arial', size=10, color=GRAY_700)
-    ws.cell(row=sr + 1, column=3, value=f'=COUNTA(B{header_row+1}:B{r+19})-COUNTBLANK(B{header_row+1}:B{r+19})').font = Font(name='Arial', size=10, bold=True, color=NAVY)
-    ws.cell(row=sr + 2, column=1, value='Sovereign (Verified):').font = Font(name='Arial', size=10, color=GREEN_600)
-    ws.cell(row=sr + 2, column=3, value=f'=COUNTIF(K{header_row+1}:K{r+19},"SOVEREIGN")').font = Font(name='Arial', size=10, bold=True, color=GREEN_600)
-    ws.cell(row=sr + 3, column=1, value='Pending Verification:').font = Font(name='Arial', size=10, color=AMBER_600)
-    ws.cell(row=sr + 3, column=3, value=f'=COUNTIF(K{header_row+1}:K{r+19},"PENDING")').font = Font(name='Arial', size=10, bold=True, color=AMBER_600)
-    ws.cell(row=sr + 4, column=1, value='Non-Compliant / Unverified:').font = Font(name='Arial', size=10, color=RED_600)
-    ws.cell(row=sr + 4, column=3, value=f'=COUNTIF(K{header_row+1}:K{r+19},"NON-COMPLIANT")+COUNTIF(K{header_row+1}:K{r+19},"UNVERIFIED")').font = Font(name='Arial', size=10, bold=True, color=RED_600)
-    ws.cell(row=sr + 6, column=1, value='Last Updated:').font = Font(name='Arial', size=10, color=GRAY_500)
-    ws.cell(row=sr + 6, column=3, value='[Date]').font = Font(name='Arial', size=10, color=NAVY)
-    ws.cell(row=sr + 7, column=1, value='Updated By:').font = Font(name='Arial', size=10, color=GRAY_500)
-    ws.cell(row=sr + 7, column=3, value='[Name / Title]').font = Font(name='Arial', size=10, color=NAVY)
-
-    # Freeze panes
-    ws.freeze_panes = f'A{header_row + 1}'
-    ws.auto_filter.ref = f'A{header_row}:K{r+19}'
-
-
-def build_tab2_residency_signals(wb):
-    ws = wb.create_sheet('Technical Residency Signals')
-    ws.sheet_properties.tabColor = NAVY_LIGHT
-
-    r = add_title_block(ws,
-        'TECHNICAL RESIDENCY SIGNALS',
-        'IP Whitelist & Infrastructure Verification Register  |  [Practice Name]')
+    sheet.append()
+    sheet.append()
+    vendors = f'B{header_row+1}:B{r+19}'
+    status = f'K{header_row+1}:K{r+19}'
+    summary = [
+        ('Total Vendors Inventoried:', 'kl_label', f'=COUNTA({vendors})-COUNTBLANK({vendors})', 'kl_value'),
+        ('Sovereign (Verified):', 'kl_label_ok', f'=COUNTIF({status},"SOVEREIGN")', 'kl_value_ok'),
+        ('Pending Verification:', 'kl_label_pending', f'=COUNTIF({status},"PENDING")', 'kl_value_pending'),
+        ('Non-Compliant / Unverified:', 'kl_label_alert',
+         f'=COUNTIF({status},"NON-COMPLIANT")+COUNTIF({status},"UNVERIFIED")', 'kl_value_alert'),
+        None,
+        ('Last Updated:', 'kl_label_muted', '[Date]', 'kl_value_plain'),
+        ('Updated By:', 'kl_label_muted', '[Name / Title]', 'kl_value_plain'),
+    ]
+    sheet.append([sheet.cell('LEDGER SUMMARY', 'kl_section')])
+    for line in summary:
+        if line is None:
+            sheet.append()
+            continue
+        label, label_style, value, value_style = line
+        sheet.append([sheet.cell(label, label_style), None, sheet.cell(value, value_style)])
 
-    r += 1
-    ws.cell(row=r, column=1, value='INSTRUCTIONS: Track all network endpoints, devices, and remote access points. Verify that no data routes through foreign proxies, VPNs, or offshore IT support. Update quarterly or upon any infrastructure change.').font = Font(name='Arial', size=9, italic=True, color=GRAY_500)
-    ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=10)
-    r += 2
+    sheet.ws.auto_filter.ref = f'A{header_row}:K{r+19}'
 
+
+def build_tab2_residency_signals(wb, practice_name):
     headers = [
         '#', 'Device / System', 'Primary IP Address', 'Authorized Region',
         'IT Provider', 'Connection Type', 'Last Verified', 'Verified By',
         'Foreign Routing Detected?', 'Status'
     ]
     widths = [5, 24, 20, 18, 20, 16, 16, 16, 22, 16]
+    sheet = LedgerSheet(wb, 'Technical Residency Signals', NAVY_LIGHT, widths, freeze=f'A{HEADER_ROW + 1}')
+
+    add_title_block(sheet,
+        'TECHNICAL RESIDENCY SIGNALS',
+        f'IP Whitelist & Infrastructure Verification Register  |  {practice_name}',
+        'INSTRUCTIONS: Track all network endpoints, devices, and remote access points. Verify that no data routes through foreign proxies, VPNs, or offshore IT support. Update quarterly or upon any infrastructure change.',
+        len(headers))
 
-    header_row = r
-    for c, (h, w) in enumerate(zip(headers, widths), 1):
-        ws.cell(row=r, column=c, value=h)
-        ws.column_dimensions[get_column_letter(c)].width = w
-    style_header_row(ws, r, len(headers))
-    r += 1
+    header_row = add_header_row(sheet, headers)
 
     examples = [
         ['1', 'Main Office Router', '192.168.x.x (Static)', 'Austin, TX', 'Spectrum Business', 'Fiber / Static IP', '02/01/2026', 'IT Admin', 'No', 'SOVEREIGN'],
@@ -244,66 +368,39 @@ def build_tab2_residency_signals(wb):
     ]
 
     for i, row_data in enumerate(examples):
-        for c, val in enumerate(row_data, 1):
-            ws.cell(row=r, column=c, value=val)
-        style_data_row(ws, r, len(headers), is_example=(i < 7), is_alt=(i % 2 == 1))
-
-        status_cell = ws.cell(row=r, column=10)
-        if 'SOVEREIGN' in str(status_cell.value or ''):
-            status_cell.fill = green_fill
-            status_cell.font = Font(name='Arial', size=10, bold=True, color=GREEN_600)
-
-        foreign_cell = ws.cell(row=r, column=9)
-        if str(foreign_cell.value or '') == 'No':
-            foreign_cell.fill = green_fill
-
-        r += 1
+        is_example = i < 7
+        overrides = {10: status_style(row_data[9]) if 'SOVEREIGN' in row_data[9] else None}
+        if row_data[8] == 'No':
+            overrides[9] = 'kl_example_clear' if is_example else 'kl_body_clear'
+        add_data_row(sheet, row_data, is_example=is_example, is_alt=(i % 2 == 1), overrides=overrides)
+    r = sheet.row
 
     # 15 more blank rows
-    for i in range(15):
-        ws.cell(row=r + i, column=1, value=str(9 + i))
-        for c in range(1, len(headers) + 1):
-            style_data_row(ws, r + i, len(headers), is_alt=(i % 2 == 1))
+    add_blank_rows(sheet, 15, len(headers), 9)
 
     # Validations
-    dv_foreign = DataValidation(type='list', formula1='"No,Yes - Remediated,Yes - Under Investigation,Unknown"', allow_blank=True)
-    ws.add_data_validation(dv_foreign)
-    dv_foreign.add(f'I{header_row+1}:I{r+15}')
+    sheet.validate('"No,Yes - Remediated,Yes - Under Investigation,Unknown"', f'I{header_row+1}:I{r+15}')
+    sheet.validate('"SOVEREIGN,PENDING,FLAGGED,NON-COMPLIANT"', f'J{header_row+1}:J{r+15}')
 
-    dv_status = DataValidation(type='list', formula1='"SOVEREIGN,PENDING,FLAGGED,NON-COMPLIANT"', allow_blank=True)
-    ws.add_data_validation(dv_status)
-    dv_status.add(f'J{header_row+1}:J{r+15}')
+    sheet.ws.auto_filter.ref = f'A{header_row}:J{r+14}'
 
-    ws.freeze_panes = f'A{header_row + 1}'
-    ws.auto_filter.ref = f'A{header_row}:J{r+14}'
-
-
-def build_tab3_regulatory_log(wb):
-    ws = wb.create_sheet('Regulatory & Cure Notice Log')
-    ws.sheet_properties.tabColor = GOLD_DARK
-
-    r = add_title_block(ws,
-        'REGULATORY & CURE NOTICE LOG',
-        'Active Defense Register  |  [Practice Name]  |  SB 1188 / HB 149 Compliance')
-
-    r += 1
-    ws.cell(row=r, column=1, value='INSTRUCTIONS: Document ALL regulatory inquiries, audit requests, patient complaints related to data sovereignty, and Cure Notices received. This log is your primary evidence of "Active Defense" and Reasonable Care. If it isn\'t in the ledger, it didn\'t happen.').font = Font(name='Arial', size=9, italic=True, color=GRAY_500)
-    ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=10)
-    r += 2
 
+def build_tab3_regulatory_log(wb, practice_name):
     headers = [
         '#', 'Date Received', 'Agency / Entity', 'Contact Person',
         'Issue Type', 'Issue Description', 'Resolution Action',
         'Evidence Attached?', 'Date Resolved', 'Status'
     ]
     widths = [5, 16, 22, 18, 18, 30, 30, 16, 16, 16]
+    sheet = LedgerSheet(wb, 'Regulatory & Cure Notice Log', GOLD_DARK, widths, freeze=f'A{HEADER_ROW + 1}')
+
+    add_title_block(sheet,
+        'REGULATORY & CURE NOTICE LOG',
+        f'Active Defense Register  |  {practice_name}  |  SB 1188 / HB 149 Compliance',
+        'INSTRUCTIONS: Document ALL regulatory inquiries, audit requests, patient complaints related to data sovereignty, and Cure Notices received. This log is your primary evidence of "Active Defense" and Reasonable Care. If it isn\'t in the ledger, it didn\'t happen.',
+        len(headers))
 
-    header_row = r
-    for c, (h, w) in enumerate(zip(headers, widths), 1):
-        ws.cell(row=r, column=c, value=h)
-        ws.column_dimensions[get_column_letter(c)].width = w
-    style_header_row(ws, r, len(headers))
-    r += 1
+    header_row = add_header_row(sheet, headers)
 
     examples = [
         ['1', '02/08/2026', 'Texas DSHS', 'Inspector R. Gomez', 'AI Transparency Inquiry', 'Routine inquiry regarding AI chatbot on practice website; requested HB 149 disclosure documentation', 'Provided HB 149 AI Disclosure Kit, website screenshot showing footer notice, signed AI consent forms', 'Yes (3 docs)', '02/10/2026', 'RESOLVED'],
@@ -312,67 +409,35 @@ def build_tab3_regulatory_log(wb):
     ]
 
     for i, row_data in enumerate(examples):
-        for c, val in enumerate(row_data, 1):
-            ws.cell(row=r, column=c, value=val)
-        style_data_row(ws, r, len(headers), is_example=(i < 2), is_alt=(i % 2 == 1))
-
-        status_cell = ws.cell(row=r, column=10)
-        if 'RESOLVED' in str(status_cell.value or ''):
-            status_cell.fill = green_fill
-            status_cell.font = Font(name='Arial', size=10, bold=True, color=GREEN_600)
-        elif 'OPEN' in str(status_cell.value or ''):
-            status_cell.fill = red_fill
-            status_cell.font = Font(name='Arial', size=10, bold=True, color=RED_600)
-
-        r += 1
-
-    for i in range(20):
-        ws.cell(row=r + i, column=1, value=str(4 + i))
-        for c in range(1, len(headers) + 1):
-            style_data_row(ws, r + i, len(headers), is_alt=(i % 2 == 1))
-
-    dv_type = DataValidation(type='list', formula1='"AI Transparency Inquiry,Data Residency Inquiry,Cure Notice,State Audit,Patient Complaint,Vendor Non-Compliance,HIPAA Breach Report,Internal Incident,Other"', allow_blank=True)
-    ws.add_data_validation(dv_type)
-    dv_type.add(f'E{header_row+1}:E{r+20}')
-
-    dv_status = DataValidation(type='list', formula1='"RESOLVED,OPEN - In Progress,OPEN - Awaiting Response,ESCALATED,PENDING CURE"', allow_blank=True)
-    ws.add_data_validation(dv_status)
-    dv_status.add(f'J{header_row+1}:J{r+20}')
-
-    dv_evidence = DataValidation(type='list', formula1='"Yes (attached),Yes (on file),Pending,No,N/A"', allow_blank=True)
-    ws.add_data_validation(dv_evidence)
-    dv_evidence.add(f'H{header_row+1}:H{r+20}')
+        add_data_row(sheet, row_data, is_example=(i < 2), is_alt=(i % 2 == 1),
+                     overrides={10: status_style(row_data[9])})
+    r = sheet.row
 
-    ws.freeze_panes = f'A{header_row + 1}'
-    ws.auto_filter.ref = f'A{header_row}:J{r+19}'
+    add_blank_rows(sheet, 20, len(headers), 4)
 
+    sheet.validate('"AI Transparency Inquiry,Data Residency Inquiry,Cure Notice,State Audit,Patient Complaint,Vendor Non-Compliance,HIPAA Breach Report,Internal Incident,Other"', f'E{header_row+1}:E{r+20}')
+    sheet.validate('"RESOLVED,OPEN - In Progress,OPEN - Awaiting Response,ESCALATED,PENDING CURE"', f'J{header_row+1}:J{r+20}')
+    sheet.validate('"Yes (attached),Yes (on file),Pending,No,N/A"', f'H{header_row+1}:H{r+20}')
 
-def build_tab4_quarterly_audit(wb):
-    ws = wb.create_sheet('Quarterly Audit Trail')
-    ws.sheet_properties.tabColor = GREEN_600
+    sheet.ws.auto_filter.ref = f'A{header_row}:J{r+19}'
 
-    r = add_title_block(ws,
-        'QUARTERLY AUDIT TRAIL',
-        'Rolling Compliance Verification Record  |  [Practice Name]')
-
-    r += 1
-    ws.cell(row=r, column=1, value='INSTRUCTIONS: Complete one row per quarter. This trail demonstrates ongoing compliance diligence \u2014 the single strongest element of Safe Harbor defense. "If it isn\'t in the ledger, it didn\'t happen."').font = Font(name='Arial', size=9, italic=True, color=GRAY_500)
-    ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-    r += 2
 
+def build_tab4_quarterly_audit(wb, practice_name):
     headers = [
         'Quarter', 'Audit Date', 'Sentry Scan\nCompleted?',
         'Vendor Certs\nAll Current?', 'Employee Acks\nAll Current?',
         'Website Disclosure\nVerified?', 'Issues Found', 'Remediation Notes', 'Auditor'
     ]
     widths = [14, 14, 16, 16, 16, 18, 24, 30, 16]
+    sheet = LedgerSheet(wb, 'Quarterly Audit Trail', GREEN_600, widths, freeze=f'A{HEADER_ROW + 1}')
+
+    add_title_block(sheet,
+        'QUARTERLY AUDIT TRAIL',
+        f'Rolling Compliance Verification Record  |  {practice_name}',
+        'INSTRUCTIONS: Complete one row per quarter. This trail demonstrates ongoing compliance diligence \u2014 the single strongest element of Safe Harbor defense. "If it isn\'t in the ledger, it didn\'t happen."',
+        len(headers))
 
-    header_row = r
-    for c, (h, w) in enumerate(zip(headers, widths), 1):
-        ws.cell(row=r, column=c, value=h)
-        ws.column_dimensions[get_column_letter(c)].width = w
-    style_header_row(ws, r, len(headers))
-    r += 1
+    header_row = add_header_row(sheet, headers)
 
     quarters = [
         ['Q1 2026 (Jan-Mar)', '03/31/2026', 'Yes', 'Yes', 'Yes', 'Yes', 'None', 'Initial implementation complete. All vendors verified.', '[Name]'],
@@ -386,41 +451,24 @@ def build_tab4_quarterly_audit(wb):
     ]
 
     for i, row_data in enumerate(quarters):
-        for c, val in enumerate(row_data, 1):
-            ws.cell(row=r, column=c, value=val)
-        style_data_row(ws, r, len(headers), is_example=(i == 0), is_alt=(i % 2 == 1))
         # Highlight "Yes" cells
-        for c in [3, 4, 5, 6]:
-            cell = ws.cell(row=r, column=c)
-            if str(cell.value or '') == 'Yes':
-                cell.fill = green_fill
-                cell.font = Font(name='Arial', size=10, bold=True, color=GREEN_600)
-        r += 1
-
-    dv_yn = DataValidation(type='list', formula1='"Yes,No,Partial,N/A"', allow_blank=True)
-    ws.add_data_validation(dv_yn)
-    for col in ['C', 'D', 'E', 'F']:
-        dv_yn.add(f'{col}{header_row+1}:{col}{r}')
+        overrides = {c: 'kl_status_ok' for c in (3, 4, 5, 6) if row_data[c - 1] == 'Yes'}
+        add_data_row(sheet, row_data, is_example=(i == 0), is_alt=(i % 2 == 1), overrides=overrides)
+    r = sheet.row
 
-    ws.freeze_panes = f'A{header_row + 1}'
+    dv_yn = sheet.validate('"Yes,No,Partial,N/A"', f'C{header_row+1}:C{r}')
+    for col in ['D', 'E', 'F']:
+        dv_yn.add(f'{col}{header_row+1}:{col}{r}')
 
 
 def build_tab5_instructions(wb):
-    ws = wb.create_sheet('Instructions & Reference')
-    ws.sheet_properties.tabColor = GOLD
-
-    ws.column_dimensions['A'].width = 4
-    ws.column_dimensions['B'].width = 80
-
-    r = 2
-    ws.cell(row=r, column=2, value='SAFE HARBOR\u2122 EVIDENCE LEDGER').font = Font(name='Arial', size=16, bold=True, color=NAVY)
-    r += 1
-    ws.cell(row=r, column=2, value='Instructions & Quick Reference Guide').font = Font(name='Arial', size=12, color=GRAY_500)
-    r += 1
-    for c in range(1, 12):
-        ws.cell(row=r, column=c).fill = PatternFill('solid', fgColor=GOLD)
-    ws.row_dimensions[r].height = 3
-    r += 2
+    sheet = LedgerSheet(wb, 'Instructions & Reference', GOLD, [4, 80])
+
+    sheet.append()
+    sheet.append([None, sheet.cell('SAFE HARBOR\u2122 EVIDENCE LEDGER', 'kl_doc_title')])
+    sheet.append([None, sheet.cell('Instructions & Quick Reference Guide', 'kl_doc_subtitle')])
+    sheet.append([sheet.cell(None, 'kl_gold_rule') for _ in range(11)], height=3)
+    sheet.append()
 
     instructions = [
         ('WHAT IS THIS DOCUMENT?', 'This Evidence Ledger is the operational backbone of your Safe Harbor\u2122 compliance program. It documents every vendor, network endpoint, regulatory interaction, and quarterly audit \u2014 creating an irrefutable paper trail that proves "Reasonable Care" under Texas SB 1188.'),
@@ -438,37 +486,47 @@ def build_tab5_instructions(wb):
 
     for title, body in instructions:
         if title:
-            ws.cell(row=r, column=2, value=title).font = Font(name='Arial', size=11, bold=True, color=NAVY)
-            r += 1
+            sheet.append([None, sheet.cell(title, 'kl_topic')])
         if body:
-            ws.cell(row=r, column=2, value=body).font = Font(name='Arial', size=10, color=GRAY_700)
-            ws.cell(row=r, column=2).alignment = Alignment(wrap_text=True, vertical='top')
-            ws.row_dimensions[r].height = max(30, len(body) // 3)
-            r += 1
-        r += 1
+            sheet.append([None, sheet.cell(body, 'kl_topic_body')], height=max(30, len(body) // 3))
+        sheet.append()
+
+
+def render(output, practice=None):
+    """Build the Evidence Ledger into output (a path or a binary file object),
+    personalized and prefilled from practice ({name, findings, scanned_at})
+    when given."""
+    wb = Workbook(write_only=True)
+    for style in ledger_styles():
+        wb.add_named_style(style)
+
+    practice_name = (practice or {}).get('name') or '[Practice Name]'
+    build_tab1_vendor_inventory(wb, practice_name, supply_chain_rows(practice) if practice else None)
+    build_tab2_residency_signals(wb, practice_name)
+    build_tab3_regulatory_log(wb, practice_name)
+    build_tab4_quarterly_audit(wb, practice_name)
+    build_tab5_instructions(wb)
 
+    wb.save(output)
 
-def main():
-    wb = Workbook()
 
-    build_tab1_vendor_inventory(wb)
-    build_tab2_residency_signals(wb)
-    build_tab3_regulatory_log(wb)
-    build_tab4_quarterly_audit(wb)
-    build_tab5_instructions(wb)
+def main():
 
-    
     # Accept --output CLI arg
     output = None
+    practice = None
     for i, arg in enumerate(sys.argv):
         if arg == '--output' and i + 1 < len(sys.argv):
             output = sys.argv[i + 1]
             import os
             os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        if arg == '--practice' and i + 1 < len(sys.argv):
+            with open(sys.argv[i + 1], 'r', encoding='utf-8') as f:
+                practice = json.load(f)
     if not output:
         output = '/mnt/user-data/outputs/Evidence_Ledger.xlsx'
 
-    wb.save(output)
+    render(output, practice)
 
     # Recalculate formulas
     try:
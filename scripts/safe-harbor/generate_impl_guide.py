@@ -17,150 +17,29 @@ from reportlab.platypus import (
 from reportlab.lib import colors
 import os
 
-# ═══ COLORS ═══
-NAVY = HexColor('#0B1E3D')
-NAVY_LIGHT = HexColor('#1A3A5F')
-GOLD = HexColor('#D4A574')
-GOLD_DARK = HexColor('#B88F5F')
-ORANGE = HexColor('#FF6B35')
-WHITE = HexColor('#FFFFFF')
-GRAY_50 = HexColor('#F9FAFB')
-GRAY_100 = HexColor('#F3F4F6')
-GRAY_200 = HexColor('#E5E7EB')
-GRAY_400 = HexColor('#9CA3AF')
-GRAY_500 = HexColor('#6B7280')
-GRAY_700 = HexColor('#374151')
-GRAY_900 = HexColor('#111827')
-RED_50 = HexColor('#FEF2F2')
-RED_600 = HexColor('#DC2626')
-RED_700 = HexColor('#B91C1C')
-GREEN_50 = HexColor('#F0FDF4')
-GREEN_600 = HexColor('#059669')
-GREEN_700 = HexColor('#047857')
-BLUE_50 = HexColor('#EFF6FF')
-BLUE_600 = HexColor('#2563EB')
-AMBER_50 = HexColor('#FFFBEB')
-AMBER_600 = HexColor('#D97706')
+from kit_style import (
+    NAVY, NAVY_LIGHT, GOLD, GOLD_DARK, WHITE, GRAY_50, GRAY_100, GRAY_200, GRAY_400,
+    GRAY_500, GRAY_700, GRAY_900, RED_50, RED_600, RED_700, GREEN_50, GREEN_600,
+    GREEN_700, BLUE_50, BLUE_600, STYLES, SECTION_NUM, page_chrome, styled_box
+)
 
 # ═══ STYLES ═══
-S = {}
-
-S['title'] = ParagraphStyle('Title',
-    fontName='Helvetica-Bold', fontSize=22, leading=28,
-    textColor=NAVY, spaceAfter=6)
-
-S['h1'] = ParagraphStyle('H1',
-    fontName='Helvetica-Bold', fontSize=14, leading=20,
-    textColor=NAVY, spaceBefore=20, spaceAfter=10)
-
-S['h2'] = ParagraphStyle('H2',
-    fontName='Helvetica-Bold', fontSize=11, leading=16,
-    textColor=NAVY_LIGHT, spaceBefore=14, spaceAfter=6)
-
-S['h3'] = ParagraphStyle('H3',
-    fontName='Helvetica-Bold', fontSize=10, leading=14,
-    textColor=NAVY, spaceBefore=10, spaceAfter=4)
-
-S['body'] = ParagraphStyle('Body',
-    fontName='Helvetica', fontSize=10, leading=15,
-    textColor=GRAY_700, spaceAfter=8, alignment=TA_JUSTIFY)
-
-S['body_bold'] = ParagraphStyle('BodyBold',
-    fontName='Helvetica-Bold', fontSize=10, leading=15,
-    textColor=GRAY_900, spaceAfter=8, alignment=TA_JUSTIFY)
-
-S['bullet'] = ParagraphStyle('Bullet',
-    fontName='Helvetica', fontSize=10, leading=15,
-    textColor=GRAY_700, spaceAfter=4, leftIndent=24,
-    bulletIndent=12)
-
-S['sub_bullet'] = ParagraphStyle('SubBullet',
-    fontName='Helvetica', fontSize=9.5, leading=14,
-    textColor=GRAY_700, spaceAfter=3, leftIndent=42,
-    bulletIndent=30)
-
-S['step_num'] = ParagraphStyle('StepNum',
-    fontName='Helvetica-Bold', fontSize=9, leading=12,
-    textColor=GOLD_DARK, spaceAfter=2)
-
-S['phase_num'] = ParagraphStyle('PhaseNum',
-    fontName='Helvetica-Bold', fontSize=9, leading=12,
-    textColor=GOLD_DARK, spaceAfter=2)
-
-S['small'] = ParagraphStyle('Small',
-    fontName='Helvetica', fontSize=8.5, leading=12,
-    textColor=GRAY_500, spaceAfter=4)
-
+S = dict(STYLES)
+S['step_num'] = SECTION_NUM
+S['phase_num'] = SECTION_NUM
 S['code'] = ParagraphStyle('Code',
     fontName='Courier', fontSize=9, leading=13,
     textColor=NAVY, spaceAfter=4, leftIndent=12,
     backColor=GRAY_100)
 
-S['sig_label'] = ParagraphStyle('SigLabel',
-    fontName='Helvetica', fontSize=9, leading=13,
-    textColor=GRAY_500, spaceAfter=2)
-
-S['footer'] = ParagraphStyle('Footer',
-    fontName='Helvetica', fontSize=7.5, leading=10,
-    textColor=GRAY_500, alignment=TA_CENTER)
-
-S['toc_item'] = ParagraphStyle('TOCItem',
-    fontName='Helvetica', fontSize=10, leading=18,
-    textColor=NAVY, spaceAfter=2)
-
-
-def header_footer(canvas_obj, doc):
-    canvas_obj.saveState()
-    w, h = letter
-
-    # Header
-    canvas_obj.setFillColor(NAVY)
-    canvas_obj.rect(0, h - 42, w, 42, fill=True, stroke=False)
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.rect(0, h - 44, w, 2, fill=True, stroke=False)
-
-    canvas_obj.setFillColor(WHITE)
-    canvas_obj.setFont('Helvetica-Bold', 8)
-    canvas_obj.drawString(0.75 * inch, h - 28, 'KAIROLOGIC')
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.drawString(1.72 * inch, h - 28, '|  SAFE HARBOR\u2122 IMPLEMENTATION GUIDE')
-
-    canvas_obj.setFillColor(HexColor('#8899AA'))
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.drawRightString(w - 0.75 * inch, h - 28, 'SB 1188 + HB 149  |  CONFIDENTIAL')
-
-    # Footer
-    canvas_obj.setFillColor(GRAY_200)
-    canvas_obj.rect(0, 0, w, 36, fill=True, stroke=False)
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.rect(0, 36, w, 1.5, fill=True, stroke=False)
 
-    canvas_obj.setFillColor(GRAY_500)
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.drawString(0.75 * inch, 14,
-        'KairoLogic  |  Safe Harbor\u2122 Policy Bundle  |  kairologic.com')
-    canvas_obj.drawRightString(w - 0.75 * inch, 14, f'Page {doc.page}')
-
-    canvas_obj.restoreState()
+header_footer = page_chrome('SAFE HARBOR\u2122 IMPLEMENTATION GUIDE', 'SB 1188 + HB 149  |  CONFIDENTIAL',
+    'KairoLogic  |  Safe Harbor\u2122 Policy Bundle  |  kairologic.com')
 
 
 def callout_box(text, bg_color=GRAY_100, border_color=GRAY_200, text_color=GRAY_700, icon_prefix=''):
     """Create a styled callout box"""
-    content = Paragraph(
-        f'{icon_prefix}{text}',
-        ParagraphStyle('CB', fontName='Helvetica', fontSize=9.5, leading=14,
-                       textColor=text_color, alignment=TA_JUSTIFY))
-    t = Table([[content]], colWidths=[5.8 * inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), bg_color),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('BOX', (0, 0), (-1, -1), 1.5, border_color),
-    ]))
-    return t
+    return styled_box(f'{icon_prefix}{text}', bg_color, border_color, text_color, padding=10)
 
 
 def tip_box(title, text):
@@ -210,7 +89,7 @@ def phase_header(num, title, time_est):
     ]
 
 
-def build_cover():
+def build_cover(practice=None):
     elements = []
     elements.append(Spacer(1, 1.0 * inch))
 
@@ -266,6 +145,9 @@ def build_cover():
         ['Prerequisite:', 'KairoLogic Safe Harbor\u2122 Policy Bundle (purchased)'],
         ['Support:', 'support@kairologic.net  |  kairologic.com/support'],
     ]
+    if practice:
+        npi = f"  |  NPI {practice['npi']}" if practice.get('npi') else ''
+        meta.insert(0, ['Prepared For:', practice['name'] + npi])
     mt = Table(meta, colWidths=[1.6 * inch, 4.0 * inch])
     mt.setStyle(TableStyle([
         ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
@@ -934,11 +816,10 @@ def build_support():
     return elements
 
 
-def main():
-    output_path = '/mnt/user-data/outputs/Safe_Harbor_Implementation_Guide.pdf'
-
-    doc = SimpleDocTemplate(
-        output_path,
+def make_doc(output):
+    """Page template for the Implementation Guide (full renders and kit pieces)."""
+    return SimpleDocTemplate(
+        output,
         pagesize=letter,
         topMargin=0.85 * inch,
         bottomMargin=0.7 * inch,
@@ -949,15 +830,31 @@ def main():
         subject='SB 1188 + HB 149 Implementation Walkthrough',
     )
 
+
+# Story order. 'practice' sections take the practice dict (None = generic)
+SECTIONS = [
+    (build_cover, 'practice'),
+    (build_toc, 'static'),
+    (build_prereq, 'static'),
+    (build_phases, 'static'),
+    (build_completion_checklist, 'static'),
+    (build_support, 'static'),
+]
+
+
+def render(output, practice=None):
+    """Build the Implementation Guide into output (a path or a binary file object),
+    personalized for practice ({name, npi, ...}) when given."""
     story = []
-    story.extend(build_cover())
-    story.extend(build_toc())
-    story.extend(build_prereq())
-    story.extend(build_phases())
-    story.extend(build_completion_checklist())
-    story.extend(build_support())
-
-    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+    for builder, kind in SECTIONS:
+        story.extend(builder(practice) if kind == 'practice' else builder())
+    make_doc(output).build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+
+
+def main():
+    output_path = '/mnt/user-data/outputs/Safe_Harbor_Implementation_Guide.pdf'
+
+    render(output_path)
     print(f'PDF generated: {output_path}')
     print(f'File size: {os.path.getsize(output_path) / 1024:.0f} KB')
 
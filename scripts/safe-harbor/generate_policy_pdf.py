@@ -16,132 +16,45 @@ from reportlab.platypus import (
 )
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
+from xml.sax.saxutils import escape
 import os
 
-# ═══ COLORS ═══
-NAVY = HexColor('#0B1E3D')
-NAVY_LIGHT = HexColor('#1A3A5F')
-GOLD = HexColor('#D4A574')
-GOLD_DARK = HexColor('#B88F5F')
-ORANGE = HexColor('#FF6B35')
-WHITE = HexColor('#FFFFFF')
-GRAY_100 = HexColor('#F3F4F6')
-GRAY_200 = HexColor('#E5E7EB')
-GRAY_500 = HexColor('#6B7280')
-GRAY_700 = HexColor('#374151')
-GRAY_900 = HexColor('#111827')
-RED_600 = HexColor('#DC2626')
-GREEN_600 = HexColor('#059669')
+from kit_style import (
+    NAVY, NAVY_LIGHT, GOLD, WHITE, GRAY_100, GRAY_200, GRAY_500, GRAY_700, GRAY_900,
+    RED_600, STYLES, SECTION_NUM, page_chrome
+)
 
 # ═══ STYLES ═══
-styles = {}
-
-styles['title'] = ParagraphStyle('Title',
-    fontName='Helvetica-Bold', fontSize=22, leading=28,
-    textColor=NAVY, spaceAfter=6, alignment=TA_LEFT)
-
-styles['subtitle'] = ParagraphStyle('Subtitle',
-    fontName='Helvetica', fontSize=11, leading=15,
-    textColor=GRAY_500, spaceAfter=20, alignment=TA_LEFT)
+styles = dict(STYLES)
+styles['section_num'] = SECTION_NUM
 
+# The policy pack sets headings with more air than the other kit documents
 styles['h1'] = ParagraphStyle('H1',
     fontName='Helvetica-Bold', fontSize=14, leading=20,
     textColor=NAVY, spaceBefore=24, spaceAfter=10, alignment=TA_LEFT)
-
 styles['h2'] = ParagraphStyle('H2',
     fontName='Helvetica-Bold', fontSize=11, leading=16,
     textColor=NAVY_LIGHT, spaceBefore=18, spaceAfter=8, alignment=TA_LEFT)
-
-styles['body'] = ParagraphStyle('Body',
-    fontName='Helvetica', fontSize=10, leading=15,
-    textColor=GRAY_700, spaceAfter=8, alignment=TA_JUSTIFY)
-
-styles['body_bold'] = ParagraphStyle('BodyBold',
-    fontName='Helvetica-Bold', fontSize=10, leading=15,
-    textColor=GRAY_900, spaceAfter=8, alignment=TA_JUSTIFY)
-
-styles['bullet'] = ParagraphStyle('Bullet',
-    fontName='Helvetica', fontSize=10, leading=15,
-    textColor=GRAY_700, spaceAfter=4, leftIndent=24,
-    bulletIndent=12, bulletFontSize=10, alignment=TA_LEFT)
-
 styles['sub_bullet'] = ParagraphStyle('SubBullet',
     fontName='Helvetica', fontSize=9.5, leading=14,
     textColor=GRAY_700, spaceAfter=3, leftIndent=42,
     bulletIndent=30, bulletFontSize=9, alignment=TA_LEFT)
-
+styles['subtitle'] = ParagraphStyle('Subtitle',
+    fontName='Helvetica', fontSize=11, leading=15,
+    textColor=GRAY_500, spaceAfter=20, alignment=TA_LEFT)
 styles['callout'] = ParagraphStyle('Callout',
     fontName='Helvetica-Oblique', fontSize=9.5, leading=14,
     textColor=NAVY, spaceAfter=6, leftIndent=12, alignment=TA_LEFT)
-
-styles['footer'] = ParagraphStyle('Footer',
-    fontName='Helvetica', fontSize=7.5, leading=10,
-    textColor=GRAY_500, alignment=TA_CENTER)
-
-styles['section_num'] = ParagraphStyle('SectionNum',
-    fontName='Helvetica-Bold', fontSize=9, leading=12,
-    textColor=GOLD_DARK, spaceAfter=2, alignment=TA_LEFT)
-
-styles['sig_label'] = ParagraphStyle('SigLabel',
-    fontName='Helvetica', fontSize=9, leading=13,
-    textColor=GRAY_500, spaceAfter=2, alignment=TA_LEFT)
-
 styles['sig_line'] = ParagraphStyle('SigLine',
     fontName='Helvetica', fontSize=10, leading=14,
     textColor=GRAY_700, spaceAfter=16, alignment=TA_LEFT)
 
-styles['small'] = ParagraphStyle('Small',
-    fontName='Helvetica', fontSize=8.5, leading=12,
-    textColor=GRAY_500, spaceAfter=4, alignment=TA_LEFT)
-
-styles['toc_item'] = ParagraphStyle('TOCItem',
-    fontName='Helvetica', fontSize=10, leading=18,
-    textColor=NAVY, spaceAfter=2, alignment=TA_LEFT)
 
+header_footer = page_chrome('DATA SOVEREIGNTY POLICY PACK', 'SB 1188 COMPLIANCE  |  CONFIDENTIAL',
+    'KairoLogic  |  Texas Sovereignty Compliance Platform  |  kairologic.com')
 
-def header_footer(canvas_obj, doc):
-    """Draw header and footer on each page"""
-    canvas_obj.saveState()
-    w, h = letter
-    page_num = doc.page
 
-    # Header bar
-    canvas_obj.setFillColor(NAVY)
-    canvas_obj.rect(0, h - 42, w, 42, fill=True, stroke=False)
-
-    # Gold accent line
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.rect(0, h - 44, w, 2, fill=True, stroke=False)
-
-    # Header text
-    canvas_obj.setFillColor(WHITE)
-    canvas_obj.setFont('Helvetica-Bold', 8)
-    canvas_obj.drawString(0.75 * inch, h - 28, 'KAIROLOGIC')
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.drawString(1.72 * inch, h - 28, '|  DATA SOVEREIGNTY POLICY PACK')
-
-    canvas_obj.setFillColor(HexColor('#8899AA'))
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.drawRightString(w - 0.75 * inch, h - 28, 'SB 1188 COMPLIANCE  |  CONFIDENTIAL')
-
-    # Footer
-    canvas_obj.setFillColor(GRAY_200)
-    canvas_obj.rect(0, 0, w, 36, fill=True, stroke=False)
-
-    canvas_obj.setFillColor(GOLD)
-    canvas_obj.rect(0, 36, w, 1.5, fill=True, stroke=False)
-
-    canvas_obj.setFillColor(GRAY_500)
-    canvas_obj.setFont('Helvetica', 7)
-    canvas_obj.drawString(0.75 * inch, 14,
-        'KairoLogic  |  Texas Sovereignty Compliance Platform  |  kairologic.com')
-    canvas_obj.drawRightString(w - 0.75 * inch, 14, f'Page {page_num}')
-
-    canvas_obj.restoreState()
-
-
-def build_cover_page():
+def build_cover_page(practice=None):
     """Build cover page elements"""
     elements = []
 
@@ -189,6 +102,9 @@ def build_cover_page():
         ['Review Cycle:', 'Quarterly (Next Review: May 2026)'],
         ['Prepared By:', 'KairoLogic Compliance Division'],
     ]
+    if practice:
+        npi = f"  |  NPI {practice['npi']}" if practice.get('npi') else ''
+        meta.insert(0, ['Prepared For:', practice['name'] + npi])
     meta_table = Table(meta, colWidths=[1.6 * inch, 4.0 * inch])
     meta_table.setStyle(TableStyle([
         ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
@@ -651,16 +567,17 @@ def build_policy_body():
     return elements
 
 
-def build_signature_page():
+def build_signature_page(practice=None):
     """Build the execution/signature page"""
     elements = []
     elements.append(Paragraph('POLICY EXECUTION', styles['h1']))
     elements.append(HRFlowable(width='100%', thickness=0.75, color=GOLD, spaceAfter=16))
 
+    adopter = f"<b>{escape(practice['name'])}</b>" if practice else 'the Practice'
     elements.append(Paragraph(
         'By signing below, the undersigned acknowledges that they have read, understand, and agree to enforce '
         'the Data Sovereignty &amp; Residency Policy as set forth in this document. This signature constitutes '
-        'binding adoption of the policy on behalf of the Practice.',
+        f'binding adoption of the policy on behalf of {adopter}.',
         styles['body']))
     elements.append(Spacer(1, 30))
 
@@ -838,11 +755,10 @@ def build_appendices():
     return elements
 
 
-def main():
-    output_path = '/mnt/user-data/outputs/SB1188_Data_Sovereignty_Policy_Pack.pdf'
-
-    doc = SimpleDocTemplate(
-        output_path,
+def make_doc(output):
+    """Page template for the Policy Pack (full renders and kit pieces)."""
+    return SimpleDocTemplate(
+        output,
         pagesize=letter,
         topMargin=0.85 * inch,
         bottomMargin=0.7 * inch,
@@ -853,14 +769,30 @@ def main():
         subject='Texas SB 1188 Data Sovereignty Policy Pack',
     )
 
+
+# Story order. 'practice' sections take the practice dict (None = generic)
+SECTIONS = [
+    (build_cover_page, 'practice'),
+    (build_toc, 'static'),
+    (build_policy_body, 'static'),
+    (build_signature_page, 'practice'),
+    (build_appendices, 'static'),
+]
+
+
+def render(output, practice=None):
+    """Build the Policy Pack into output (a path or a binary file object),
+    personalized for practice ({name, npi, ...}) when given."""
     story = []
-    story.extend(build_cover_page())
-    story.extend(build_toc())
-    story.extend(build_policy_body())
-    story.extend(build_signature_page())
-    story.extend(build_appendices())
+    for builder, kind in SECTIONS:
+        story.extend(builder(practice) if kind == 'practice' else builder())
+    make_doc(output).build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+
+
+def main():
+    output_path = '/mnt/user-data/outputs/SB1188_Data_Sovereignty_Policy_Pack.pdf'
 
-    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+    render(output_path)
     print(f'PDF generated: {output_path}')
     print(f'File size: {os.path.getsize(output_path) / 1024:.0f} KB')
 
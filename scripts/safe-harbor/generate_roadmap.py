@@ -18,44 +18,15 @@ from reportlab.platypus import (
 from reportlab.pdfgen import canvas
 import os
 
-# ═══ COLORS ═══
-NAVY = HexColor('#0B1E3D')
-NAVY_LIGHT = HexColor('#1A3A5F')
-GOLD = HexColor('#D4A574')
-GOLD_DARK = HexColor('#B88F5F')
-WHITE = HexColor('#FFFFFF')
-GRAY_50 = HexColor('#F9FAFB')
-GRAY_100 = HexColor('#F3F4F6')
-GRAY_200 = HexColor('#E5E7EB')
-GRAY_400 = HexColor('#9CA3AF')
-GRAY_500 = HexColor('#6B7280')
-GRAY_700 = HexColor('#374151')
-GRAY_900 = HexColor('#111827')
-RED_50 = HexColor('#FEF2F2')
-RED_600 = HexColor('#DC2626')
-RED_700 = HexColor('#B91C1C')
-GREEN_50 = HexColor('#F0FDF4')
-GREEN_600 = HexColor('#059669')
-GREEN_700 = HexColor('#047857')
-BLUE_50 = HexColor('#EFF6FF')
-BLUE_600 = HexColor('#2563EB')
-AMBER_50 = HexColor('#FFFBEB')
-AMBER_600 = HexColor('#D97706')
-AMBER_700 = HexColor('#B45309')
-ORANGE = HexColor('#FF6B35')
+from kit_style import (
+    NAVY, NAVY_LIGHT, GOLD, GOLD_DARK, WHITE, GRAY_50, GRAY_100, GRAY_200, GRAY_400,
+    GRAY_500, GRAY_700, GRAY_900, RED_600, GREEN_50, GREEN_600, GREEN_700, BLUE_600,
+    AMBER_50, AMBER_600, AMBER_700, STYLES, SECTION_NUM, page_chrome, styled_box
+)
 
 # ═══ STYLES ═══
-S = {}
-S['title'] = ParagraphStyle('Title', fontName='Helvetica-Bold', fontSize=22, leading=28, textColor=NAVY, spaceAfter=6)
-S['h1'] = ParagraphStyle('H1', fontName='Helvetica-Bold', fontSize=14, leading=20, textColor=NAVY, spaceBefore=20, spaceAfter=10)
-S['h2'] = ParagraphStyle('H2', fontName='Helvetica-Bold', fontSize=11, leading=16, textColor=NAVY_LIGHT, spaceBefore=14, spaceAfter=6)
-S['h3'] = ParagraphStyle('H3', fontName='Helvetica-Bold', fontSize=10, leading=14, textColor=NAVY, spaceBefore=10, spaceAfter=4)
-S['body'] = ParagraphStyle('Body', fontName='Helvetica', fontSize=10, leading=15, textColor=GRAY_700, spaceAfter=8, alignment=TA_JUSTIFY)
-S['body_bold'] = ParagraphStyle('BodyBold', fontName='Helvetica-Bold', fontSize=10, leading=15, textColor=GRAY_900, spaceAfter=8, alignment=TA_JUSTIFY)
-S['bullet'] = ParagraphStyle('Bullet', fontName='Helvetica', fontSize=10, leading=15, textColor=GRAY_700, spaceAfter=4, leftIndent=24, bulletIndent=12)
-S['phase_num'] = ParagraphStyle('PhaseNum', fontName='Helvetica-Bold', fontSize=9, leading=12, textColor=GOLD_DARK, spaceAfter=2)
-S['sig_label'] = ParagraphStyle('SigLabel', fontName='Helvetica', fontSize=9, leading=13, textColor=GRAY_500, spaceAfter=2)
-S['small'] = ParagraphStyle('Small', fontName='Helvetica', fontSize=8.5, leading=12, textColor=GRAY_500, spaceAfter=4)
+S = dict(STYLES)
+S['phase_num'] = SECTION_NUM
 
 # Cell styles for Paragraph-wrapped tables
 CS = ParagraphStyle('CS', fontName='Helvetica', fontSize=9, leading=13, textColor=GRAY_700)
@@ -65,45 +36,8 @@ CS_SM = ParagraphStyle('CSSM', fontName='Helvetica', fontSize=8, leading=11, tex
 CS_CHECK = ParagraphStyle('CSCHK', fontName='Courier-Bold', fontSize=11, leading=13, textColor=GRAY_400, alignment=TA_CENTER)
 
 
-def header_footer(c, doc):
-    c.saveState()
-    w, h = letter
-    c.setFillColor(NAVY)
-    c.rect(0, h - 42, w, 42, fill=True, stroke=False)
-    c.setFillColor(GOLD)
-    c.rect(0, h - 44, w, 2, fill=True, stroke=False)
-    c.setFillColor(WHITE)
-    c.setFont('Helvetica-Bold', 8)
-    c.drawString(0.75 * inch, h - 28, 'KAIROLOGIC')
-    c.setFont('Helvetica', 7)
-    c.setFillColor(GOLD)
-    c.drawString(1.72 * inch, h - 28, '|  30-DAY COMPLIANCE ROADMAP')
-    c.setFillColor(HexColor('#8899AA'))
-    c.setFont('Helvetica', 7)
-    c.drawRightString(w - 0.75 * inch, h - 28, 'SB 1188 + HB 149  |  CONFIDENTIAL')
-    c.setFillColor(GRAY_200)
-    c.rect(0, 0, w, 36, fill=True, stroke=False)
-    c.setFillColor(GOLD)
-    c.rect(0, 36, w, 1.5, fill=True, stroke=False)
-    c.setFillColor(GRAY_500)
-    c.setFont('Helvetica', 7)
-    c.drawString(0.75 * inch, 14, 'KairoLogic  |  30-Day Compliance Roadmap  |  kairologic.com')
-    c.drawRightString(w - 0.75 * inch, 14, f'Page {doc.page}')
-    c.restoreState()
-
-
-def styled_box(text, bg, border, tc=None):
-    content = Paragraph(text, ParagraphStyle('SB', fontName='Helvetica', fontSize=9.5, leading=14, textColor=tc or GRAY_700, alignment=TA_JUSTIFY))
-    t = Table([[content]], colWidths=[5.8 * inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), bg),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('BOX', (0, 0), (-1, -1), 1.5, border),
-    ]))
-    return t
+header_footer = page_chrome('30-DAY COMPLIANCE ROADMAP', 'SB 1188 + HB 149  |  CONFIDENTIAL',
+    'KairoLogic  |  30-Day Compliance Roadmap  |  kairologic.com')
 
 
 def phase_header(num, title, days, color):
@@ -160,7 +94,7 @@ def checklist_table(items, accent_color=NAVY):
     return t
 
 
-def build_cover():
+def build_cover(practice=None):
     e = []
     e.append(Spacer(1, 0.9 * inch))
 
@@ -252,6 +186,9 @@ def build_cover():
         ['Prerequisite:', 'KairoLogic Safe Harbor\u2122 Policy Bundle (purchased)'],
         ['Version:', '1.0 \u2014 February 2026'],
     ]
+    if practice:
+        npi = f"  |  NPI {practice['npi']}" if practice.get('npi') else ''
+        meta.insert(0, ['Prepared For:', practice['name'] + npi])
     mt = Table(meta, colWidths=[1.2 * inch, 4.4 * inch])
     mt.setStyle(TableStyle([
         ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
@@ -708,6 +645,33 @@ def build_maintenance():
     return e
 
 
+def make_doc(output):
+    """Page template for the Compliance Roadmap (full renders and kit pieces)."""
+    return SimpleDocTemplate(output, pagesize=letter,
+        topMargin=0.85*inch, bottomMargin=0.7*inch,
+        leftMargin=0.75*inch, rightMargin=0.75*inch,
+        title='30-Day Compliance Roadmap \u2014 Path to Sovereign Verification',
+        author='KairoLogic Compliance Division',
+        subject='SB 1188 + HB 149 30-Day Implementation Roadmap')
+
+
+# Story order. 'practice' sections take the practice dict (None = generic)
+SECTIONS = [
+    (build_cover, 'practice'),
+    (build_phase1, 'static'),
+    (build_maintenance, 'static'),
+]
+
+
+def render(output, practice=None):
+    """Build the Compliance Roadmap into output (a path or a binary file object),
+    personalized for practice ({name, npi, ...}) when given."""
+    story = []
+    for builder, kind in SECTIONS:
+        story.extend(builder(practice) if kind == 'practice' else builder())
+    make_doc(output).build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+
+
 def main():
     
     # Accept --output CLI arg
@@ -720,19 +684,7 @@ def main():
     if not output:
         output = '/mnt/user-data/outputs/Compliance_Roadmap.pdf'
 
-    doc = SimpleDocTemplate(output, pagesize=letter,
-        topMargin=0.85*inch, bottomMargin=0.7*inch,
-        leftMargin=0.75*inch, rightMargin=0.75*inch,
-        title='30-Day Compliance Roadmap \u2014 Path to Sovereign Verification',
-        author='KairoLogic Compliance Division',
-        subject='SB 1188 + HB 149 30-Day Implementation Roadmap')
-
-    story = []
-    story.extend(build_cover())
-    story.extend(build_phase1())
-    story.extend(build_maintenance())
-
-    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+    render(output)
     print(f'PDF generated: {output}')
     print(f'File size: {os.path.getsize(output) / 1024:.0f} KB')
 
@@ -0,0 +1,35 @@
+"""
+KairoLogic Safe Harbor — Brand Palette
+Hex colors shared by every kit document: the PDFs (via kit_style) and the
+Evidence Ledger XLSX. No dependencies, so the XLSX does not need reportlab.
+"""
+
+NAVY = '0B1E3D'
+NAVY_LIGHT = '1A3A5F'
+GOLD = 'D4A574'
+GOLD_DARK = 'B88F5F'
+ORANGE = 'FF6B35'
+WHITE = 'FFFFFF'
+GRAY_50 = 'F9FAFB'
+GRAY_100 = 'F3F4F6'
+GRAY_200 = 'E5E7EB'
+GRAY_400 = '9CA3AF'
+GRAY_500 = '6B7280'
+GRAY_700 = '374151'
+GRAY_900 = '111827'
+RED_50 = 'FEF2F2'
+RED_600 = 'DC2626'
+RED_700 = 'B91C1C'
+GREEN_50 = 'F0FDF4'
+GREEN_600 = '059669'
+GREEN_700 = '047857'
+BLUE_50 = 'EFF6FF'
+BLUE_600 = '2563EB'
+BLUE_700 = '1D4ED8'
+AMBER_50 = 'FFFBEB'
+AMBER_600 = 'D97706'
+AMBER_700 = 'B45309'
+PURPLE_50 = 'FAF5FF'
+PURPLE_600 = '9333EA'
+
+HEADER_MUTED = '8899AA'  # right-hand page header text
@@ -0,0 +1,131 @@
+"""
+KairoLogic Safe Harbor — Shared PDF Style
+Palette, base paragraph styles, page header/footer and boxes used by every
+kit PDF. Documents copy STYLES and add or override their own entries.
+"""
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.lib.colors import HexColor
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+import kit_brand as brand
+
+# ═══ COLORS ═══
+NAVY = HexColor(f'#{brand.NAVY}')
+NAVY_LIGHT = HexColor(f'#{brand.NAVY_LIGHT}')
+GOLD = HexColor(f'#{brand.GOLD}')
+GOLD_DARK = HexColor(f'#{brand.GOLD_DARK}')
+ORANGE = HexColor(f'#{brand.ORANGE}')
+WHITE = HexColor(f'#{brand.WHITE}')
+GRAY_50 = HexColor(f'#{brand.GRAY_50}')
+GRAY_100 = HexColor(f'#{brand.GRAY_100}')
+GRAY_200 = HexColor(f'#{brand.GRAY_200}')
+GRAY_400 = HexColor(f'#{brand.GRAY_400}')
+GRAY_500 = HexColor(f'#{brand.GRAY_500}')
+GRAY_700 = HexColor(f'#{brand.GRAY_700}')
+GRAY_900 = HexColor(f'#{brand.GRAY_900}')
+RED_50 = HexColor(f'#{brand.RED_50}')
+RED_600 = HexColor(f'#{brand.RED_600}')
+RED_700 = HexColor(f'#{brand.RED_700}')
+GREEN_50 = HexColor(f'#{brand.GREEN_50}')
+GREEN_600 = HexColor(f'#{brand.GREEN_600}')
+GREEN_700 = HexColor(f'#{brand.GREEN_700}')
+BLUE_50 = HexColor(f'#{brand.BLUE_50}')
+BLUE_600 = HexColor(f'#{brand.BLUE_600}')
+BLUE_700 = HexColor(f'#{brand.BLUE_700}')
+AMBER_50 = HexColor(f'#{brand.AMBER_50}')
+AMBER_600 = HexColor(f'#{brand.AMBER_600}')
+AMBER_700 = HexColor(f'#{brand.AMBER_700}')
+PURPLE_50 = HexColor(f'#{brand.PURPLE_50}')
+PURPLE_600 = HexColor(f'#{brand.PURPLE_600}')
+HEADER_MUTED = HexColor(f'#{brand.HEADER_MUTED}')
+
+# ═══ STYLES ═══
+STYLES = {}
+STYLES['title'] = ParagraphStyle('Title', fontName='Helvetica-Bold', fontSize=22, leading=28, textColor=NAVY, spaceAfter=6)
+STYLES['h1'] = ParagraphStyle('H1', fontName='Helvetica-Bold', fontSize=14, leading=20, textColor=NAVY, spaceBefore=20, spaceAfter=10)
+STYLES['h2'] = ParagraphStyle('H2', fontName='Helvetica-Bold', fontSize=11, leading=16, textColor=NAVY_LIGHT, spaceBefore=14, spaceAfter=6)
+STYLES['h3'] = ParagraphStyle('H3', fontName='Helvetica-Bold', fontSize=10, leading=14, textColor=NAVY, spaceBefore=10, spaceAfter=4)
+STYLES['body'] = ParagraphStyle('Body', fontName='Helvetica', fontSize=10, leading=15, textColor=GRAY_700, spaceAfter=8, alignment=TA_JUSTIFY)
+STYLES['body_bold'] = ParagraphStyle('BodyBold', fontName='Helvetica-Bold', fontSize=10, leading=15, textColor=GRAY_900, spaceAfter=8, alignment=TA_JUSTIFY)
+STYLES['bullet'] = ParagraphStyle('Bullet', fontName='Helvetica', fontSize=10, leading=15, textColor=GRAY_700, spaceAfter=4, leftIndent=24, bulletIndent=12)
+STYLES['sub_bullet'] = ParagraphStyle('SubBullet', fontName='Helvetica', fontSize=9.5, leading=14, textColor=GRAY_700, spaceAfter=3, leftIndent=42, bulletIndent=30)
+STYLES['small'] = ParagraphStyle('Small', fontName='Helvetica', fontSize=8.5, leading=12, textColor=GRAY_500, spaceAfter=4)
+STYLES['sig_label'] = ParagraphStyle('SigLabel', fontName='Helvetica', fontSize=9, leading=13, textColor=GRAY_500, spaceAfter=2)
+STYLES['toc_item'] = ParagraphStyle('TOCItem', fontName='Helvetica', fontSize=10, leading=18, textColor=NAVY, spaceAfter=2)
+STYLES['footer'] = ParagraphStyle('Footer', fontName='Helvetica', fontSize=7.5, leading=10, textColor=GRAY_500, alignment=TA_CENTER)
+
+# Gold kicker above section headings ("MODULE 3", "PHASE 2", "ASSET 1")
+SECTION_NUM = ParagraphStyle('SectionNum', fontName='Helvetica-Bold', fontSize=9, leading=12, textColor=GOLD_DARK, spaceAfter=2)
+
+
+# ═══ PAGE CHROME ═══
+CHROME_FORM = 'KitPageChrome'
+
+
+def page_chrome(header_title, header_right, footer_text):
+    """header_footer callback for a kit document: navy header bar with the
+    document title, gold rules, and a footer line with the page number.
+
+    Everything but the page number is drawn once per document as a form
+    XObject and referenced from each page, so it is not repeated in every
+    page's content stream.
+    """
+    def draw_chrome(c):
+        w, h = letter
+
+        # Header
+        c.setFillColor(NAVY)
+        c.rect(0, h - 42, w, 42, fill=True, stroke=False)
+        c.setFillColor(GOLD)
+        c.rect(0, h - 44, w, 2, fill=True, stroke=False)
+        c.setFillColor(WHITE)
+        c.setFont('Helvetica-Bold', 8)
+        c.drawString(0.75 * inch, h - 28, 'KAIROLOGIC')
+        c.setFont('Helvetica', 7)
+        c.setFillColor(GOLD)
+        c.drawString(1.72 * inch, h - 28, f'|  {header_title}')
+        c.setFillColor(HEADER_MUTED)
+        c.setFont('Helvetica', 7)
+        c.drawRightString(w - 0.75 * inch, h - 28, header_right)
+
+        # Footer
+        c.setFillColor(GRAY_200)
+        c.rect(0, 0, w, 36, fill=True, stroke=False)
+        c.setFillColor(GOLD)
+        c.rect(0, 36, w, 1.5, fill=True, stroke=False)
+        c.setFillColor(GRAY_500)
+        c.setFont('Helvetica', 7)
+        c.drawString(0.75 * inch, 14, footer_text)
+
+    def header_footer(c, doc):
+        c.saveState()
+        if not c.hasForm(CHROME_FORM):
+            c.beginForm(CHROME_FORM)
+            draw_chrome(c)
+            c.endForm()
+        c.doForm(CHROME_FORM)
+        c.setFillColor(GRAY_500)
+        c.setFont('Helvetica', 7)
+        c.drawRightString(letter[0] - 0.75 * inch, 14, f'Page {doc.page}')
+        c.restoreState()
+    return header_footer
+
+
+# ═══ BOXES ═══
+def styled_box(text, bg, border, tc=None, font='Helvetica', font_size=9.5, leading=14, padding=12):
+    """Full-width shaded box with a colored border around one paragraph."""
+    content = Paragraph(text, ParagraphStyle('Box', fontName=font, fontSize=font_size, leading=leading, textColor=tc or GRAY_700, alignment=TA_JUSTIFY))
+    t = Table([[content]], colWidths=[5.8 * inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), bg),
+        ('TOPPADDING', (0, 0), (-1, -1), padding),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+        ('LEFTPADDING', (0, 0), (-1, -1), 14),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 14),
+        ('BOX', (0, 0), (-1, -1), 1.5, border),
+    ]))
+    return t
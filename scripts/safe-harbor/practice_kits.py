@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+KairoLogic Safe Harbor — Per-Practice Kit Builder
+Personalized kits for every paying practice, nightly
+
+Each generator lists its story as SECTIONS; the few marked 'practice'
+(cover, signature/attestation) take a practice dict, the rest are generic.
+Instead of a full layout per practice, every document is laid out once:
+
+  1. Template pass (once): each run of static sections is rendered to PDF
+     with the correct page numbering, and the generic page count of every
+     personalized section is recorded.
+  2. Per practice (worker pool): only the personalized sections are laid
+     out, page-numbered to fit their slot, and spliced between the static
+     pages. A scan-findings appendix is appended to the Policy Pack and
+     Roadmap.
+
+If a personalized section comes out with a different page count than the
+generic one (e.g. a very long practice name), or a document cannot be split
+at page boundaries, that document is laid out in full for that practice.
+
+Input is JSONL, one practice per line:
+    {"name": "Austin Family Care, PLLC", "npi": "1234567890",
+     "findings": [{"name", "status", "severity", "category", "detail", "clause",
+                   "recommended_fix"}, ...],          # ComplianceFinding
+     "composite_score": 72, "risk_level": "Drift", "scanned_at": "2026-03-01"}
+
+The Evidence Ledger XLSX is written directly per practice (it streams in
+write-only mode); its Digital Supply Chain tab is prefilled from the DR-04
+finding's evidence.
+
+Every PDF goes through scripts/pdf_optimize.py before it is written; the
+page chrome that each spliced piece carries is shared again there.
+
+Output: <out-dir>/<npi>-<name-slug>/<document>.pdf|.xlsx
+
+Usage:
+    python scripts/safe-harbor/practice_kits.py --practices practices.jsonl --out-dir kits/ [--workers 4]
+
+Requires:
+  pip install reportlab pypdf
+  pip install pikepdf   # optional: PDF size optimization
+"""
+
+import argparse
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import HRFlowable, PageBreak, Paragraph, Spacer, Table, TableStyle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_optimize import optimize_pdf  # noqa: E402
+
+from kit_style import AMBER_600, BLUE_600, GOLD, GOLD_DARK, GRAY_200, GRAY_700, NAVY, RED_600, RED_700, WHITE
+
+# asset id → (generator module, output file, append findings appendix)
+KIT_PDFS = {
+    'sb1188-policy-pack': ('generate_policy_pdf', 'SB1188_Data_Sovereignty_Policy_Pack.pdf', True),
+    'implementation-guide': ('generate_impl_guide', 'Safe_Harbor_Implementation_Guide.pdf', False),
+    'ai-disclosure-kit': ('generate_ai_kit', 'AI_Disclosure_Kit.pdf', False),
+    'staff-training-guide': ('generate_staff_guide', 'Staff_Training_Guide.pdf', False),
+    'compliance-roadmap': ('generate_roadmap', 'Compliance_Roadmap.pdf', True),
+}
+
+# asset id → (generator module, output file); rendered whole, no splicing
+KIT_XLSX = {
+    'evidence-ledger': ('generate_evidence_ledger', 'Evidence_Ledger.xlsx'),
+}
+
+DEFAULT_WORKERS = os.cpu_count() or 4
+
+SEVERITY_ORDER = ['critical', 'high', 'medium', 'low', 'advisory', 'info']
+SEVERITY_COLORS = {
+    'critical': RED_700,
+    'high': RED_600,
+    'medium': AMBER_600,
+    'low': BLUE_600,
+}
+
+
+def _pdf_reader():
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        print('[FATAL] pypdf not installed. Run: pip install pypdf')
+        sys.exit(1)
+    return PdfReader, PdfWriter
+
+
+def practice_slug(practice):
+    name = re.sub(r'[^a-z0-9]+', '-', practice['name'].lower()).strip('-')[:60]
+    return f"{practice['npi']}-{name}" if practice.get('npi') else name
+
+
+# ── Piece rendering ──────────────────────────────────────
+
+class _PageOffset:
+    """Doc proxy whose .page continues the numbering of earlier pieces."""
+
+    def __init__(self, doc, offset):
+        self._doc = doc
+        self._offset = offset
+
+    @property
+    def page(self):
+        return self._doc.page + self._offset
+
+    def __getattr__(self, name):
+        return getattr(self._doc, name)
+
+
+def render_piece(module, story, offset):
+    """Lay out part of a document whose first page is page offset + 1."""
+    if story and isinstance(story[-1], PageBreak):
+        story = story[:-1]  # the piece boundary is already a page break
+    buf = BytesIO()
+
+    def on_page(canvas_obj, doc):
+        module.header_footer(canvas_obj, _PageOffset(doc, offset))
+
+    module.make_doc(buf).build(story, onFirstPage=on_page, onLaterPages=on_page)
+    return buf.getvalue()
+
+
+def page_count(pdf_bytes):
+    PdfReader, _ = _pdf_reader()
+    return len(PdfReader(BytesIO(pdf_bytes)).pages)
+
+
+def _section_story(module, indices, practice):
+    story = []
+    for i in indices:
+        builder, kind = module.SECTIONS[i]
+        story.extend(builder(practice) if kind == 'practice' else builder())
+    return story
+
+
+# ── Template pass ────────────────────────────────────────
+
+def build_template(doc_id):
+    """Lay out a document once, generically, split into static and practice pieces.
+
+    Returns a picklable dict: {'doc_id', 'splittable', 'total_pages', 'pieces':
+    [{'kind', 'sections', 'offset', 'pages', 'pdf' (static pieces only)}]}.
+    """
+    module = importlib.import_module(KIT_PDFS[doc_id][0])
+    groups = []
+    for i, (_, kind) in enumerate(module.SECTIONS):
+        if kind == 'static' and groups and groups[-1][0] == 'static':
+            groups[-1][1].append(i)
+        else:
+            groups.append(('static' if kind == 'static' else 'practice', [i]))
+
+    pieces = []
+    splittable = True
+    offset = 0
+    for n, (kind, indices) in enumerate(groups):
+        story = _section_story(module, indices, None)
+        # Splicing only works where the story breaks the page anyway
+        if n < len(groups) - 1 and not (story and isinstance(story[-1], PageBreak)):
+            splittable = False
+        pdf = render_piece(module, story, offset)
+        pages = page_count(pdf)
+        pieces.append({
+            'kind': kind,
+            'sections': indices,
+            'offset': offset,
+            'pages': pages,
+            'pdf': pdf if kind == 'static' else None,
+        })
+        offset += pages
+
+    return {'doc_id': doc_id, 'splittable': splittable, 'total_pages': offset, 'pieces': pieces}
+
+
+# ── Findings appendix ────────────────────────────────────
+
+def build_findings_appendix(practice):
+    """Appendix listing the practice's failing/warning scan checks."""
+    h_num = ParagraphStyle('FindNum', fontName='Helvetica-Bold', fontSize=9, leading=12,
+                           textColor=GOLD_DARK, spaceAfter=2)
+    h1 = ParagraphStyle('FindH1', fontName='Helvetica-Bold', fontSize=14, leading=20,
+                        textColor=NAVY, spaceBefore=6, spaceAfter=10)
+    body = ParagraphStyle('FindBody', fontName='Helvetica', fontSize=9.5, leading=14,
+                          textColor=GRAY_700, spaceAfter=6)
+    cell = ParagraphStyle('FindCell', fontName='Helvetica', fontSize=8, leading=11, textColor=GRAY_700)
+    cell_hdr = ParagraphStyle('FindHdr', fontName='Helvetica-Bold', fontSize=8, leading=11, textColor=WHITE)
+
+    findings = practice.get('findings') or []
+    open_items = [f for f in findings if f.get('status') in ('fail', 'warn', 'inconclusive')]
+    open_items.sort(key=lambda f: SEVERITY_ORDER.index(f.get('severity'))
+                    if f.get('severity') in SEVERITY_ORDER else len(SEVERITY_ORDER))
+
+    e = [Paragraph('APPENDIX — PRACTICE SCAN', h_num)]
+    e.append(Paragraph('Website Compliance Scan Findings', h1))
+    e.append(HRFlowable(width='100%', thickness=0.75, color=GOLD, spaceAfter=12))
+
+    summary = [f"<b>{escape(practice['name'])}</b>"]
+    if practice.get('npi'):
+        summary.append(f"NPI {escape(str(practice['npi']))}")
+    if practice.get('scanned_at'):
+        summary.append(f"scanned {escape(str(practice['scanned_at']))}")
+    e.append(Paragraph('  |  '.join(summary), body))
+    if practice.get('composite_score') is not None:
+        e.append(Paragraph(
+            f"Composite score: <b>{practice['composite_score']}</b>"
+            f"{'  (' + escape(str(practice['risk_level'])) + ')' if practice.get('risk_level') else ''}"
+            f"  —  {len(findings) - len(open_items)} of {len(findings)} checks passing", body))
+    e.append(Spacer(1, 8))
+
+    if not open_items:
+        e.append(Paragraph('No failing or warning checks in the most recent scan.', body))
+        return e
+
+    rows = [[Paragraph(h, cell_hdr) for h in ('Severity', 'Check', 'Status', 'Finding / Recommended Fix')]]
+    for f in open_items:
+        detail = escape(f.get('detail') or '')
+        if f.get('recommended_fix'):
+            detail += f"<br/><b>Fix:</b> {escape(f['recommended_fix'])}"
+        if f.get('clause'):
+            detail += f"<br/><i>{escape(f['clause'])}</i>"
+        rows.append([
+            Paragraph(escape((f.get('severity') or '').upper()), cell),
+            Paragraph(escape(f.get('name') or f.get('id') or ''), cell),
+            Paragraph(escape(f.get('status') or ''), cell),
+            Paragraph(detail, cell),
+        ])
+    table = Table(rows, colWidths=[0.8 * inch, 1.6 * inch, 0.7 * inch, 3.9 * inch], repeatRows=1)
+    style = [
+        ('BACKGROUND', (0, 0), (-1, 0), NAVY),
+        ('GRID', (0, 0), (-1, -1), 0.5, GRAY_200),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+    ]
+    for r, f in enumerate(open_items, 1):
+        color = SEVERITY_COLORS.get(f.get('severity'))
+        if color:
+            style.append(('LINEBEFORE', (0, r), (0, r), 3, color))
+    table.setStyle(TableStyle(style))
+    e.append(table)
+    return e
+
+
+# ── Per-practice assembly ────────────────────────────────
+
+_templates = {}
+_static_readers = {}
+
+
+def _init_worker(templates):
+    """Pool initializer: keep the template pieces parsed for every job."""
+    PdfReader, _ = _pdf_reader()
+    for doc_id, template in templates.items():
+        _templates[doc_id] = template
+        importlib.import_module(KIT_PDFS[doc_id][0])
+        for n, piece in enumerate(template['pieces']):
+            if piece['pdf'] is not None:
+                _static_readers[(doc_id, n)] = PdfReader(BytesIO(piece['pdf']))
+
+
+def build_practice_pdf(doc_id, practice):
+    """One personalized document. Returns (pdf_bytes, spliced)."""
+    PdfReader, PdfWriter = _pdf_reader()
+    module_name, _, with_findings = KIT_PDFS[doc_id]
+    module = importlib.import_module(module_name)
+    template = _templates[doc_id]
+
+    parts = []
+    spliced = template['splittable']
+    if spliced:
+        for n, piece in enumerate(template['pieces']):
+            if piece['kind'] == 'static':
+                parts.append(_static_readers[(doc_id, n)])
+                continue
+            pdf = render_piece(module, _section_story(module, piece['sections'], practice), piece['offset'])
+            reader = PdfReader(BytesIO(pdf))
+            if len(reader.pages) != piece['pages']:
+                spliced = False  # reflowed past its slot; lay out in full
+                break
+            parts.append(reader)
+    if not spliced:
+        buf = BytesIO()
+        module.render(buf, practice)
+        parts = [PdfReader(BytesIO(buf.getvalue()))]
+
+    writer = PdfWriter()
+    for reader in parts:
+        for page in reader.pages:
+            writer.add_page(page)
+    if with_findings:
+        appendix = render_piece(module, build_findings_appendix(practice), len(writer.pages))
+        for page in PdfReader(BytesIO(appendix)).pages:
+            writer.add_page(page)
+    if parts[0].metadata:
+        writer.add_metadata(dict(parts[0].metadata))
+
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue(), spliced
+
+
+def build_practice_kit(practice, out_dir, xlsx_ids=()):
+    """Worker job: write every kit document for one practice. Returns a result dict."""
+    start = time.perf_counter()
+    slug = practice_slug(practice)
+    kit_dir = os.path.join(out_dir, slug)
+    result = {'slug': slug, 'documents': 0, 'bytes': 0, 'full_layouts': 0, 'error': None}
+    try:
+        os.makedirs(kit_dir, exist_ok=True)
+        for doc_id in _templates:
+            pdf, spliced = build_practice_pdf(doc_id, practice)
+            pdf = optimize_pdf(pdf)
+            with open(os.path.join(kit_dir, KIT_PDFS[doc_id][1]), 'wb') as f:
+                f.write(pdf)
+            result['documents'] += 1
+            result['bytes'] += len(pdf)
+            result['full_layouts'] += not spliced
+        for doc_id in xlsx_ids:
+            module_name, filename = KIT_XLSX[doc_id]
+            path = os.path.join(kit_dir, filename)
+            importlib.import_module(module_name).render(path, practice)
+            result['documents'] += 1
+            result['bytes'] += os.path.getsize(path)
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def read_practices(path):
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        for line in f:
+            line = line.strip()
+            if line:
+                practice = json.loads(line)
+                if not practice.get('name'):
+                    print(f'  [WARN] Skipping practice without a name: {line[:80]}')
+                    continue
+                yield practice
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build personalized Safe Harbor kits for many practices')
+    parser.add_argument('--practices', required=True, help="JSONL, one practice per line ('-' for stdin)")
+    parser.add_argument('--out-dir', required=True)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--docs', default=','.join([*KIT_PDFS, *KIT_XLSX]),
+                        help=f"Comma-separated subset of: {', '.join([*KIT_PDFS, *KIT_XLSX])}")
+    args = parser.parse_args()
+
+    requested = [d.strip() for d in args.docs.split(',') if d.strip()]
+    unknown = [d for d in requested if d not in KIT_PDFS and d not in KIT_XLSX]
+    if unknown:
+        print(f"[FATAL] Unknown documents: {', '.join(unknown)}")
+        sys.exit(1)
+    doc_ids = [d for d in requested if d in KIT_PDFS]
+    xlsx_ids = [d for d in requested if d in KIT_XLSX]
+    _pdf_reader()
+
+    start = time.time()
+    templates = {}
+    for doc_id in doc_ids:
+        t0 = time.time()
+        templates[doc_id] = build_template(doc_id)
+        t = templates[doc_id]
+        static_pages = sum(p['pages'] for p in t['pieces'] if p['kind'] == 'static')
+        print(f"  Template {doc_id}: {t['total_pages']} pages ({static_pages} static) "
+              f"in {(time.time() - t0) * 1000:.0f}ms{'' if t['splittable'] else '  [full layout per practice]'}")
+
+    practices = list(read_practices(args.practices))
+    print(f'Building kits for {len(practices):,} practices with {args.workers} workers...')
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    built = failed = full_layouts = total_bytes = 0
+    job_ms = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(templates,)) as pool:
+        futures = [pool.submit(build_practice_kit, p, args.out_dir, xlsx_ids) for p in practices]
+        for fut in as_completed(futures):
+            r = fut.result()
+            if r['error']:
+                failed += 1
+                print(f"  [ERROR] {r['slug']}: {r['error']}")
+                continue
+            built += 1
+            full_layouts += r['full_layouts']
+            total_bytes += r['bytes']
+            job_ms.append(r['ms'])
+            if built % 100 == 0:
+                print(f'  {built:,} kits built')
+
+    elapsed = time.time() - start
+    job_ms.sort()
+    p50 = job_ms[len(job_ms) // 2] if job_ms else 0
+    print(f'Built {built:,} kits ({total_bytes / 1e6:.1f} MB) in {elapsed:.1f}s — '
+          f'p50 {p50:.0f}ms per kit, {full_layouts} full-layout fallbacks, {failed} failed')
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
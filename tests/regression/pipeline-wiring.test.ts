@@ -142,3 +142,14 @@ test.describe('Pipeline Wiring: AI Evaluator', () => {
     expect(src).toMatch(/parse_response/);
   });
 });
+
+test.describe('Pipeline Wiring: render server', () => {
+  for (const route of ['app/api/workflows/nppes-form/route.ts', 'app/api/admin/generate-asset/route.ts']) {
+    test(`${route} renders via render-client with spawn fallback`, () => {
+      const src = readSource(route);
+      expect(src).toMatch(/import.*renderDocument.*from.*render-client/);
+      expect(src).toMatch(/await renderDocument\(/);
+      expect(src).toMatch(/execAsync\(`python3/);
+    });
+  }
+});
@@ -0,0 +1,91 @@
+/**
+ * Python Script Regression Tests
+ *
+ * These tests run the pure-logic parts of the Python pipeline scripts
+ * (scripts/*.py) against inline fixtures and assert on their JSON output.
+ * They cover regressions that source-pattern checks can't catch.
+ *
+ * Requires python3 on PATH. No DB, network or API key.
+ */
+
+import { test, expect } from '@playwright/test';
+import { spawnSync } from 'child_process';
+import * as path from 'path';
+
+const SCRIPTS = path.resolve(__dirname, '../../scripts');
+
+/** Run a Python snippet with scripts/ importable; returns the JSON on its last output line. */
+function py(code: string, env: Record<string, string> = {}): any {
+  const res = spawnSync('python3', ['-c', code], {
+    cwd: SCRIPTS,
+    env: { ...process.env, PYTHONPATH: SCRIPTS, ...env },
+    encoding: 'utf-8',
+  });
+  if (res.status !== 0) throw new Error(`python3 exited ${res.status}: ${res.stderr}`);
+  const lines = res.stdout.trim().split('\n');
+  return JSON.parse(lines[lines.length - 1]);
+}
+
+test.describe('Python: foreign_routing.py', () => {
+  test('failing DR-04 without evidence.non_us yields no endpoints', () => {
+    const res = py(`
+import json
+from foreign_routing import parse_foreign_findings
+print(json.dumps(parse_foreign_findings(
+    {'sb1188_findings': [{'id': 'DR-04', 'status': 'fail', 'evidence': {'count': 2}}]})))
+`);
+    expect(res.dr04_foreign_endpoints).toEqual([]);
+    expect(res.source).toBeNull();
+    expect(res.finding_text).toBe('');
+  });
+
+  test('failing DR-04 with non_us lists each endpoint', () => {
+    const res = py(`
+import json
+from foreign_routing import parse_foreign_findings
+print(json.dumps(parse_foreign_findings({'sb1188_findings': [
+    {'id': 'DR-04', 'status': 'fail',
+     'evidence': {'non_us': [{'domain': 'cdn.example.de', 'country': 'DE'}, 'static.example.cloudfront.net']}}]})))
+`);
+    expect(res.dr04_foreign_endpoints).toEqual([{ domain: 'cdn.example.de', country: 'Germany' }]);
+    expect(res.source).toBe('dr04');
+  });
+});
+
+test.describe('Python: evaluator_node.py hunk cache', () => {
+  test('a finding fixed in another file clears on the next run', () => {
+    // Run 1 fails lib/a.ts for a missing test; run 2 adds the test in another
+    // file; run 3 repeats run 2. call_claude is stubbed: no API key needed.
+    const runs = py(String.raw`
+import json, tempfile
+import evaluator_node as ev
+
+A = ("diff --git a/lib/a.ts b/lib/a.ts\n--- a/lib/a.ts\n+++ b/lib/a.ts\n"
+     "@@ -1,3 +1,5 @@\n export function a(x) {\n+  if (x < 0) {\n+    return 0;\n+  }\n   return x;\n")
+T = ("diff --git a/tests/a.test.ts b/tests/a.test.ts\nnew file mode 100644\n--- /dev/null\n+++ b/tests/a.test.ts\n"
+     "@@ -0,0 +1,3 @@\n+test('negative', () => {\n+  expect(a(-1)).toBe(0);\n+});\n")
+sent = []
+
+def fake(diff_text, context_text, scope=''):
+    sent.append(diff_text)
+    if 'lib/a.ts' in diff_text and 'tests/a.test.ts' not in diff_text:
+        return ("STATUS: FAIL\nSEVERITY: MEDIUM\nSUMMARY: untested branch\n\nISSUES:\n"
+                "- [MEDIUM] lib/a.ts:3 - new branch has no test\n\n"
+                "TEST_COVERAGE: NEEDS_UPDATE\nDOC_COVERAGE: ADEQUATE\n\nREMEDIATION:\n- add a test\n")
+    return "STATUS: PASS\nSEVERITY: NONE\nSUMMARY: ok\n\nTEST_COVERAGE: ADEQUATE\nDOC_COVERAGE: ADEQUATE\n"
+
+ev.call_claude = fake
+cache = ev.HunkCache(tempfile.mkdtemp())
+runs = []
+for diff in (A, A + T, A + T):
+    sent.clear()
+    r = ev.evaluate(diff, '', cache)
+    runs.append({'status': r['status'], 'issues': r['issues'], 'test_coverage': r['test_coverage'],
+                 'calls': len(sent), 'resent_a': any('lib/a.ts' in d for d in sent)})
+print(json.dumps(runs))
+`, { EVALUATOR_CACHE_DIR: '' });
+    expect(runs[0]).toMatchObject({ status: 'FAIL', calls: 1 });
+    expect(runs[1]).toMatchObject({ status: 'PASS', issues: [], test_coverage: 'ADEQUATE', resent_a: true });
+    expect(runs[2]).toMatchObject({ status: 'PASS', calls: 0 });
+  });
+});